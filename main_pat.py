@@ -1,609 +1,4399 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import importlib
+import inspect
+import io
+import itertools
+import json
+import mmap
 import os
+import pathlib
+import queue
+import random
 import re
+import sqlite3
 import string
+import threading
+import time
+import tracemalloc
 from collections import Counter
 from datetime import datetime
-from IPython.core.display import HTML
 
-import nltk
 import numpy as np
-import openai
-import spacy
-import speech_recognition as sr
-from dotenv import load_dotenv
-from ftlangdetect import detect
-from googletrans import Translator
-from gtts import gTTS
-from llama_index import GPTSimpleVectorIndex, Document, SimpleDirectoryReader
-from summarizer import Summarizer
 from tabulate import tabulate
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, Callable, List, Dict, Tuple, Iterable, Iterator, NamedTuple, Optional, Union
+
+# As dependências pesadas são importadas apenas quando usadas; aqui, só para as anotações de tipo
+if TYPE_CHECKING:
+    import scipy.sparse
+    from googletrans import Translator
+    from summarizer import Summarizer
+
+
+class DocumentoCorpus(NamedTuple):
+    """
+    Um documento lido por Func.le_corpus.
+    """
+    caminho: str
+    tamanho: int
+    encoding: str
+    texto: str
+
+
+class ResultadoAnalise:
+    """
+    Os resultados de Func.teste. Pode ser desempacotado na mesma ordem da tupla retornada pelas versões anteriores.
+
+    As listas de palavras e de n-gramas (filtered_word, hapaxes, filtered_word_no_hap, output_tri e output_bi) não
+    são guardadas: elas são criadas a partir do CorpusCompacto da limpeza apenas quando acessadas e reaproveitadas
+    nos acessos seguintes.
+
+    lang_code, lang_code_short e lang_code_full se referem ao idioma predominante do corpus; idiomas associa cada
+    idioma detectado aos índices dos seus documentos, na ordem de Func.le_corpus.
+    """
+
+    _fields = ('texto', 'ent_list', 'lang_code', 'lang_code_short', 'lang_code_full', 'output_tri', 'data',
+               'output_bi', 'filtered_word', 'hapaxes', 'filtered_word_no_hap', 'palavras_ordenadas', 'omes',
+               'nucleo_central', 'zona_periferica_1', 'zona_periferica_2', 'zona_periferica_3')
+
+    def __init__(self, texto: str, ent_list: List[str], lang_code: str, lang_code_short: str, lang_code_full: str,
+                 corpus: 'CorpusCompacto', palavras_ordenadas: List[str], omes: Dict[str, float],
+                 nucleo_central: List[Tuple[str, float]], zona_periferica_1: List[Tuple[str, float]],
+                 zona_periferica_2: List[Tuple[str, float]], zona_periferica_3: List[Tuple[str, float]],
+                 idiomas: Optional[Dict[str, List[int]]] = None):
+        self.texto = texto
+        self.ent_list = ent_list
+        self.lang_code = lang_code
+        self.lang_code_short = lang_code_short
+        self.lang_code_full = lang_code_full
+        self.corpus = corpus
+        self.palavras_ordenadas = palavras_ordenadas
+        self.omes = omes
+        self.nucleo_central = nucleo_central
+        self.zona_periferica_1 = zona_periferica_1
+        self.zona_periferica_2 = zona_periferica_2
+        self.zona_periferica_3 = zona_periferica_3
+        self.idiomas = idiomas
+
+    @property
+    def data(self) -> List[list]:
+        return [["Núcleo Central", len(self.nucleo_central), "Zona Periférica 1", len(self.zona_periferica_1),
+                 "Zona Periférica 2", len(self.zona_periferica_2), "Zona Periférica 3", len(self.zona_periferica_3)]]
+
+    @functools.cached_property
+    def corpus_no_hap(self) -> 'CorpusCompacto':
+        return self.corpus.sem_hapaxes()
+
+    @functools.cached_property
+    def filtered_word(self) -> List[str]:
+        return self.corpus.palavras_filtradas()
+
+    @functools.cached_property
+    def hapaxes(self) -> List[str]:
+        return self.corpus.hapaxes()
+
+    @functools.cached_property
+    def filtered_word_no_hap(self) -> List[str]:
+        return self.corpus_no_hap.palavras_filtradas()
+
+    @functools.cached_property
+    def output_tri(self) -> List[Tuple[str, str, str]]:
+        return list(Func.ngramas(self.filtered_word, 3))
+
+    @functools.cached_property
+    def output_bi(self) -> List[Tuple[str, str]]:
+        return list(Func.ngramas(self.filtered_word, 2))
+
+    def conta_ngramas(self, n: int = 2, top_k: Optional[int] = None) -> List[Tuple[Tuple[str, ...], int]]:
+        """
+        Conta os n-gramas do corpus diretamente dos códigos do CorpusCompacto (veja Func.conta_ngramas), sem criar
+        as listas output_tri e output_bi.
+        """
+        return Func.conta_ngramas(self.corpus, n, top_k)
+
+    def __iter__(self):
+        return (getattr(self, campo) for campo in self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(getattr(self, campo) for campo in self._fields[i])
+        return getattr(self, self._fields[i])
+
+    def __eq__(self, outro):
+        if not isinstance(outro, (ResultadoAnalise, tuple)):
+            return NotImplemented
+        return tuple(self) == tuple(outro)
+
+    def __repr__(self) -> str:
+        return (f"ResultadoAnalise(lang_code={self.lang_code!r}, palavras={len(self.corpus.tokens)}, "
+                f"vocabulario={len(self.omes)}, data={self.data!r})")
+
+    def _asdict(self) -> Dict[str, object]:
+        return {campo: getattr(self, campo) for campo in self._fields}
+
+
+class ComparacaoGrupos(NamedTuple):
+    """
+    Os resultados de Func.compara_grupos.
+
+    As matrizes são indexadas pelas zonas ('nucleo_central', 'zona_periferica_1', 'zona_periferica_2' e
+    'zona_periferica_3'). pertinencia[zona][g, v] indica se a palavra vocabulario[v] está na zona do grupo g;
+    intersecoes[zona][g, h] é o número de palavras da zona em comum entre os grupos g e h, e jaccard[zona][g, h] é
+    esse número dividido pelo tamanho da união das zonas.
+    """
+    grupos: List[str]
+    resultados: List[ResultadoAnalise]
+    vocabulario: List[str]
+    pertinencia: Dict[str, np.ndarray]
+    intersecoes: Dict[str, np.ndarray]
+    jaccard: Dict[str, np.ndarray]
+
+
+class GrupoIdioma(NamedTuple):
+    """
+    Os documentos de um mesmo idioma processados por Func.processa_por_idioma.
+    """
+    idioma: str
+    indices: List[int]
+    corpus: 'CorpusCompacto'
+    entidades: List[Counter]
+    total_entidades: Counter
+
+
+class ResumoBert(NamedTuple):
+    """
+    Um resumo extrativo produzido por Func.bert_sumarizar_lote.
+    """
+    sentencas: List[str]
+    indices: List[int]
+    resumo: str
+
+
+class MedicaoEtapa(NamedTuple):
+    """
+    O tempo e a memória de uma etapa medida por Perfilador.
+    """
+    nome: str
+    inicio: float
+    segundos: float
+    segundos_cpu: float
+    pico_memoria: Optional[int]
+    memoria_processo: Optional[int]
+
+
+class ResultadoConsulta(NamedTuple):
+    """
+    O resultado de uma pergunta consultada por Func.consulta_lote.
+    """
+    pergunta: str
+    resposta: str
+    fontes: List[Tuple[str, Optional[float], str]]
+    segundos: float
+    do_cache: bool
+
+
+class CacheSQLite:
+    """
+    Cache persistente chave-valor guardado em um arquivo SQLite.
+
+    Os valores são serializados em JSON. Cada entrada tem uma validade opcional (ttl, em segundos) e o número de
+    entradas pode ser limitado; ao ultrapassar o limite, as entradas usadas há mais tempo são descartadas (LRU).
+    Os acertos e as falhas de cada instância são contados e podem ser consultados em estatisticas().
+    """
+
+    def __init__(self, caminho: str, ttl: Optional[float] = None, max_entradas: Optional[int] = None,
+                 relogio: Callable[[], float] = time.time):
+        """
+        Abre (ou cria) o cache.
+
+        Args:
+            caminho: O caminho do arquivo SQLite. As pastas que não existirem são criadas.
+            ttl: A validade de cada entrada em segundos; None para entradas sem validade.
+            max_entradas: O número máximo de entradas; None para não limitar.
+            relogio: A função que retorna o instante atual em segundos, usada na validade e na ordem de uso das
+                     entradas (padrão: time.time).
+        """
+        self.caminho = caminho
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self.relogio = relogio
+        self.acertos = 0
+        self.falhas = 0
+
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(pasta, exist_ok=True)
+
+        # A conexão é compartilhada entre threads e protegida por uma trava
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        with self._conexao:
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "chave TEXT PRIMARY KEY, valor TEXT NOT NULL, criado REAL NOT NULL, acessado REAL NOT NULL)")
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS cache_acessado ON cache (acessado)")
+
+    @staticmethod
+    def chave(*partes) -> str:
+        """
+        Gera uma chave de cache a partir do conteúdo das partes informadas.
+
+        Args:
+            *partes: Valores serializáveis em JSON (strings, números, listas, dicionários...).
+
+        Returns:
+            O hash SHA-256, em hexadecimal, da serialização canônica das partes.
+        """
+        conteudo = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def get(self, chave: str):
+        """
+        Retorna o valor guardado para uma chave.
+
+        Args:
+            chave: A chave procurada.
+
+        Returns:
+            O valor guardado ou None, se a chave não existir ou a entrada estiver vencida.
+        """
+        agora = self.relogio()
+        with self._trava, self._conexao:
+            linha = self._conexao.execute("SELECT valor, criado FROM cache WHERE chave = ?", (chave,)).fetchone()
+
+            # Descarta a entrada vencida
+            if linha is not None and self.ttl is not None and agora - linha[1] > self.ttl:
+                self._conexao.execute("DELETE FROM cache WHERE chave = ?", (chave,))
+                linha = None
+
+            if linha is None:
+                self.falhas += 1
+                return None
+
+            self.acertos += 1
+            self._conexao.execute("UPDATE cache SET acessado = ? WHERE chave = ?", (agora, chave))
+        return json.loads(linha[0])
+
+    def set(self, chave: str, valor) -> None:
+        """
+        Guarda um valor, substituindo o valor anterior da chave, e descarta as entradas excedentes.
+
+        Args:
+            chave: A chave do valor.
+            valor: O valor, serializável em JSON.
+        """
+        agora = self.relogio()
+        conteudo = json.dumps(valor, ensure_ascii=False)
+        with self._trava, self._conexao:
+            self._conexao.execute("INSERT OR REPLACE INTO cache (chave, valor, criado, acessado) VALUES (?, ?, ?, ?)",
+                                  (chave, conteudo, agora, agora))
+
+            if self.max_entradas is not None:
+                excedentes = self._conexao.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entradas
+                if excedentes > 0:
+                    self._conexao.execute(
+                        "DELETE FROM cache WHERE chave IN (SELECT chave FROM cache ORDER BY acessado LIMIT ?)",
+                        (excedentes,))
+
+    def limpa(self) -> None:
+        """
+        Remove todas as entradas do cache e zera as estatísticas.
+        """
+        with self._trava, self._conexao:
+            self._conexao.execute("DELETE FROM cache")
+        self.acertos = 0
+        self.falhas = 0
+
+    def estatisticas(self) -> Dict[str, float]:
+        """
+        Retorna as estatísticas de uso do cache desde que ele foi aberto.
+
+        Returns:
+            Um dicionário com o número de acertos, de falhas, a taxa de acertos e o número de entradas guardadas.
+        """
+        with self._trava:
+            entradas = self._conexao.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acertos': self.acertos / consultas if consultas else 0.0,
+            'entradas': entradas,
+        }
+
+    def close(self) -> None:
+        """
+        Fecha a conexão com o arquivo do cache.
+        """
+        with self._trava:
+            self._conexao.close()
+
+
+class LimitadorTokens:
+    """
+    Limitador assíncrono de tokens por minuto, no modelo de balde de fichas.
+
+    O balde começa cheio, com tokens_por_minuto fichas, e é reabastecido continuamente à mesma taxa. Cada chamada a
+    adquire() espera até que haja fichas suficientes para os tokens pedidos.
+    """
+
+    def __init__(self, tokens_por_minuto: float, relogio: Callable[[], float] = time.monotonic,
+                 dorme=asyncio.sleep):
+        """
+        Args:
+            tokens_por_minuto: O número máximo de tokens liberados por minuto.
+            relogio: A função que retorna o instante atual em segundos (padrão: time.monotonic).
+            dorme: A corrotina que espera o número de segundos informado (padrão: asyncio.sleep).
+        """
+        self.tokens_por_minuto = tokens_por_minuto
+        self.relogio = relogio
+        self.dorme = dorme
+        self._disponiveis = float(tokens_por_minuto)
+        self._ultimo = relogio()
+        self._trava = asyncio.Lock()
+
+    async def adquire(self, tokens: float) -> None:
+        """
+        Espera até que os tokens pedidos estejam disponíveis e os consome.
+
+        Args:
+            tokens: O número de tokens da chamada. Pedidos maiores que o limite por minuto são reduzidos ao limite,
+                    para que nunca esperem indefinidamente.
+        """
+        tokens = min(tokens, self.tokens_por_minuto)
+        async with self._trava:
+            while True:
+                # Reabastece o balde proporcionalmente ao tempo decorrido
+                agora = self.relogio()
+                self._disponiveis = min(self.tokens_por_minuto,
+                                        self._disponiveis + (agora - self._ultimo) * self.tokens_por_minuto / 60)
+                self._ultimo = agora
+
+                if self._disponiveis >= tokens:
+                    self._disponiveis -= tokens
+                    return
+                await self.dorme((tokens - self._disponiveis) * 60 / self.tokens_por_minuto)
+
+
+class IndiceBinario:
+    """
+    Índice vetorial salvo em formato binário compacto, para carregamento quase instantâneo.
+
+    Os arquivos de uma pasta de índice binário são:
+        embeddings.npy -- matriz float32 (nós x dimensões), mapeada do disco sem cópia (mmap);
+        textos.bin -- os textos dos nós em UTF-8, concatenados;
+        offsets.npy -- as posições de início de cada texto em textos.bin (mais a posição final);
+        metadados.json -- os ids dos nós e os ids dos documentos de origem.
+
+    Os textos só são decodificados quando acessados com texto(i).
+    """
+
+    ARQUIVO_EMBEDDINGS = 'embeddings.npy'
+    ARQUIVO_TEXTOS = 'textos.bin'
+    ARQUIVO_OFFSETS = 'offsets.npy'
+    ARQUIVO_METADADOS = 'metadados.json'
+
+    def __init__(self, pasta: str):
+        """
+        Abre um índice binário.
+
+        Args:
+            pasta: A pasta onde o índice foi salvo por IndiceBinario.salva.
+        """
+        self.pasta = pasta
+        self.embeddings = np.load(os.path.join(pasta, self.ARQUIVO_EMBEDDINGS), mmap_mode='r')
+        self._offsets = np.load(os.path.join(pasta, self.ARQUIVO_OFFSETS), mmap_mode='r')
+
+        caminho_textos = os.path.join(pasta, self.ARQUIVO_TEXTOS)
+        self._textos = np.memmap(caminho_textos, dtype=np.uint8, mode='r') \
+            if os.path.getsize(caminho_textos) else np.zeros(0, dtype=np.uint8)
+
+        with open(os.path.join(pasta, self.ARQUIVO_METADADOS), 'r', encoding='utf-8') as f:
+            metadados = json.load(f)
+        self.ids = metadados['ids']
+        self.doc_ids = metadados['doc_ids']
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def texto(self, i: int) -> str:
+        """
+        Retorna o texto do i-ésimo nó do índice.
+
+        Args:
+            i: A posição do nó.
+
+        Returns:
+            O texto do nó.
+        """
+        return self._textos[self._offsets[i]:self._offsets[i + 1]].tobytes().decode('utf-8')
+
+    @staticmethod
+    def salva(pasta: str, ids: List[str], doc_ids: List[str], embeddings, textos: Iterable[str]) -> None:
+        """
+        Salva um índice no formato binário.
+
+        Args:
+            pasta: A pasta de destino, criada se não existir.
+            ids: Os ids dos nós.
+            doc_ids: Os ids dos documentos de origem de cada nó.
+            embeddings: Os embeddings dos nós, em uma matriz ou lista de listas.
+            textos: Os textos dos nós.
+        """
+        os.makedirs(pasta, exist_ok=True)
+
+        # Cada arquivo é gravado em um temporário e depois renomeado, de modo que os índices já abertos continuam
+        # mapeando os arquivos antigos em vez de lerem arquivos truncados
+        def grava(nome, escreve):
+            caminho = os.path.join(pasta, nome)
+            with open(caminho + '.tmp', 'wb') as f:
+                escreve(f)
+            os.replace(caminho + '.tmp', caminho)
+
+        matriz = np.asarray(embeddings, dtype=np.float32)
+        if matriz.ndim != 2:
+            matriz = matriz.reshape(len(ids), -1) if len(ids) else np.zeros((0, 0), dtype=np.float32)
+        grava(IndiceBinario.ARQUIVO_EMBEDDINGS, lambda f: np.save(f, matriz))
+
+        # Grava os textos concatenados e as posições de cada um
+        offsets = [0]
+
+        def escreve_textos(f):
+            for texto in textos:
+                dados = texto.encode('utf-8')
+                f.write(dados)
+                offsets.append(offsets[-1] + len(dados))
+
+        grava(IndiceBinario.ARQUIVO_TEXTOS, escreve_textos)
+        grava(IndiceBinario.ARQUIVO_OFFSETS, lambda f: np.save(f, np.asarray(offsets, dtype=np.int64)))
+
+        metadados = {'versao': 1, 'ids': list(ids), 'doc_ids': list(doc_ids)}
+        grava(IndiceBinario.ARQUIVO_METADADOS,
+              lambda f: f.write(json.dumps(metadados, ensure_ascii=False).encode('utf-8')))
+
+    @staticmethod
+    def versao(pasta: str) -> Tuple[Tuple[str, int, int, int], ...]:
+        """
+        Identifica a versão dos arquivos de um índice binário salvo.
+
+        Args:
+            pasta: A pasta do índice.
+
+        Returns:
+            Uma tupla com o nome, o inode, a data de modificação (em nanossegundos) e o tamanho de cada arquivo,
+            que muda sempre que o índice é salvo novamente.
+        """
+        versao = []
+        for nome in (IndiceBinario.ARQUIVO_EMBEDDINGS, IndiceBinario.ARQUIVO_TEXTOS, IndiceBinario.ARQUIVO_OFFSETS,
+                     IndiceBinario.ARQUIVO_METADADOS):
+            estado = os.stat(os.path.join(pasta, nome))
+            versao.append((nome, estado.st_ino, estado.st_mtime_ns, estado.st_size))
+        return tuple(versao)
+
+
+class BuscaVetorial:
+    """
+    Busca local por similaridade de cosseno sobre uma matriz de embeddings, sem chamadas a APIs.
+
+    A busca exata multiplica, bloco a bloco, a matriz de embeddings pelas consultas normalizadas e mantém os k
+    melhores resultados de cada consulta. A matriz pode ser mapeada do disco (como em IndiceBinario.embeddings):
+    ela não é copiada nem normalizada; apenas as normas das linhas são guardadas. Para corpora grandes, pode ser
+    construído um índice IVF (k-means esférico), que restringe a busca às listas mais próximas da consulta.
+    """
+
+    def __init__(self, embeddings, tamanho_bloco: int = 65_536):
+        """
+        Args:
+            embeddings: A matriz de embeddings (nós x dimensões).
+            tamanho_bloco: O número de linhas da matriz processadas de cada vez.
+        """
+        self.embeddings = embeddings
+        self.tamanho_bloco = tamanho_bloco
+
+        # Normas das linhas, calculadas bloco a bloco; linhas nulas ficam com norma 1 e similaridade 0
+        self.normas = np.empty(len(embeddings), dtype=np.float32)
+        for inicio in range(0, len(embeddings), tamanho_bloco):
+            bloco = np.asarray(embeddings[inicio:inicio + tamanho_bloco], dtype=np.float32)
+            self.normas[inicio:inicio + len(bloco)] = np.linalg.norm(bloco, axis=1)
+        self.normas[self.normas == 0] = 1.0
+
+        self._centroides = None
+        self._listas = None
+        self._inicios_listas = None
+
+    @property
+    def ivf_construido(self) -> bool:
+        """
+        Indica se o índice IVF já foi construído por constroi_ivf().
+        """
+        return self._centroides is not None
+
+    @staticmethod
+    def _normaliza_consultas(consultas) -> np.ndarray:
+        """
+        Converte as consultas em uma matriz float32 com linhas de norma 1.
+        """
+        consultas = np.atleast_2d(np.asarray(consultas, dtype=np.float32))
+        normas = np.linalg.norm(consultas, axis=1, keepdims=True)
+        normas[normas == 0] = 1.0
+        return consultas / normas
+
+    @staticmethod
+    def _melhores(scores: np.ndarray, indices: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Seleciona, em cada linha, os k maiores scores, em ordem decrescente.
+
+        Args:
+            scores: Matriz (consultas x candidatos) de scores.
+            indices: Matriz de mesma forma com o índice de cada candidato.
+            k: O número de resultados por consulta.
+
+        Returns:
+            Uma tupla com as matrizes (consultas x k) de índices e de scores.
+        """
+        if scores.shape[1] > k:
+            parcial = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, parcial, axis=1)
+            indices = np.take_along_axis(indices, parcial, axis=1)
+        ordem = np.argsort(-scores, axis=1, kind='stable')
+        return np.take_along_axis(indices, ordem, axis=1), np.take_along_axis(scores, ordem, axis=1)
+
+    def busca(self, consultas, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca exata dos k nós mais similares a cada consulta.
+
+        Args:
+            consultas: Um embedding ou uma matriz (consultas x dimensões) de embeddings.
+            k: O número de resultados por consulta.
+
+        Returns:
+            Uma tupla com as matrizes (consultas x k) de índices dos nós e de similaridades de cosseno, da maior
+            para a menor.
+        """
+        consultas = self._normaliza_consultas(consultas)
+        k = min(k, len(self.embeddings))
+        melhores_indices = np.zeros((len(consultas), 0), dtype=np.int64)
+        melhores_scores = np.zeros((len(consultas), 0), dtype=np.float32)
+
+        for inicio in range(0, len(self.embeddings), self.tamanho_bloco):
+            bloco = np.asarray(self.embeddings[inicio:inicio + self.tamanho_bloco], dtype=np.float32)
+            scores = (consultas @ bloco.T) / self.normas[inicio:inicio + len(bloco)]
+            indices = np.broadcast_to(np.arange(inicio, inicio + len(bloco)), scores.shape)
+
+            # Junta os melhores do bloco com os melhores acumulados
+            indices, scores = self._melhores(scores, indices, k)
+            melhores_indices, melhores_scores = self._melhores(np.hstack([melhores_scores, scores]),
+                                                               np.hstack([melhores_indices, indices]), k)
+
+        return melhores_indices, melhores_scores
+
+    def constroi_ivf(self, n_listas: Optional[int] = None, iteracoes: int = 10, tamanho_amostra: Optional[int] = None,
+                     semente: int = 0) -> None:
+        """
+        Constrói um índice IVF: agrupa os nós com k-means esférico e guarda a lista de nós de cada grupo.
+
+        Args:
+            n_listas: O número de grupos (padrão: raiz quadrada do número de nós).
+            iteracoes: O número de iterações do k-means.
+            tamanho_amostra: O número de nós usados no treino dos centróides (padrão: 256 por grupo).
+            semente: A semente do gerador de números aleatórios.
+        """
+        gerador = np.random.default_rng(semente)
+        total = len(self.embeddings)
+        if total == 0:
+            # Índice vazio: nenhum grupo, e busca_ivf retorna apenas posições sem candidatos
+            dimensoes = self.embeddings.shape[1] if np.ndim(self.embeddings) == 2 else 0
+            self._centroides = np.zeros((0, dimensoes), dtype=np.float32)
+            self._listas = np.zeros(0, dtype=np.int64)
+            self._inicios_listas = np.zeros(1, dtype=np.int64)
+            return
+        n_listas = max(1, min(total, n_listas or int(np.sqrt(total))))
+        tamanho_amostra = min(total, tamanho_amostra or 256 * n_listas)
+
+        # Treina os centróides em uma amostra dos nós
+        amostra = np.sort(gerador.choice(total, size=tamanho_amostra, replace=False))
+        pontos = np.asarray(self.embeddings[amostra], dtype=np.float32) / self.normas[amostra, None]
+        centroides = pontos[gerador.choice(len(pontos), size=n_listas, replace=False)]
+        for _ in range(iteracoes):
+            grupos = np.argmax(pontos @ centroides.T, axis=1)
+            somas = np.zeros_like(centroides)
+            np.add.at(somas, grupos, pontos)
+            normas = np.linalg.norm(somas, axis=1, keepdims=True)
+
+            # Grupos vazios recebem um ponto aleatório da amostra
+            vazios = normas[:, 0] == 0
+            somas[vazios] = pontos[gerador.choice(len(pontos), size=int(vazios.sum()))]
+            normas[vazios] = 1.0
+            centroides = somas / normas
+
+        # Atribui todos os nós aos grupos, bloco a bloco
+        grupos = np.empty(total, dtype=np.int64)
+        for inicio in range(0, total, self.tamanho_bloco):
+            bloco = np.asarray(self.embeddings[inicio:inicio + self.tamanho_bloco], dtype=np.float32)
+            grupos[inicio:inicio + len(bloco)] = np.argmax(bloco @ centroides.T, axis=1)
+
+        self._centroides = centroides
+        self._listas = np.argsort(grupos, kind='stable')
+        self._inicios_listas = np.concatenate([[0], np.cumsum(np.bincount(grupos, minlength=n_listas))])
+
+    def busca_ivf(self, consultas, k: int = 5, n_sondas: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca aproximada dos k nós mais similares a cada consulta, apenas nos n_sondas grupos mais próximos.
+
+        Args:
+            consultas: Um embedding ou uma matriz (consultas x dimensões) de embeddings.
+            k: O número de resultados por consulta.
+            n_sondas: O número de grupos do IVF examinados por consulta.
+
+        Returns:
+            Uma tupla com as matrizes (consultas x k) de índices e de similaridades, como em busca(); as posições
+            sem candidatos suficientes ficam com índice -1 e similaridade -inf.
+        """
+        if not self.ivf_construido:
+            raise RuntimeError("O índice IVF ainda não foi construído; chame constroi_ivf() antes")
+
+        consultas = self._normaliza_consultas(consultas)
+        indices = np.full((len(consultas), k), -1, dtype=np.int64)
+        scores = np.full((len(consultas), k), -np.inf, dtype=np.float32)
+        if not len(self._centroides):
+            return indices, scores
+
+        n_sondas = min(n_sondas, len(self._centroides))
+        sondas = np.argsort(-(consultas @ self._centroides.T), axis=1)[:, :n_sondas]
+        for i, consulta in enumerate(consultas):
+            # Reúne os nós dos grupos sondados e calcula a similaridade apenas com eles
+            candidatos = np.sort(np.concatenate([self._listas[self._inicios_listas[g]:self._inicios_listas[g + 1]]
+                                                 for g in sondas[i]]))
+            if not len(candidatos):
+                continue
+            similaridades = (np.asarray(self.embeddings[candidatos], dtype=np.float32) @ consulta) / \
+                self.normas[candidatos]
+            melhores_indices, melhores_scores = self._melhores(similaridades[None, :], candidatos[None, :], k)
+            indices[i, :melhores_indices.shape[1]] = melhores_indices[0]
+            scores[i, :melhores_scores.shape[1]] = melhores_scores[0]
+
+        return indices, scores
+
+    def avalia(self, consultas, k: int = 10, n_sondas: Tuple[int, ...] = (1, 4, 16)) -> List[List]:
+        """
+        Compara a busca IVF com a busca exata: recall@k e latência média por consulta.
+
+        Args:
+            consultas: A matriz (consultas x dimensões) de embeddings de consulta.
+            k: O número de resultados por consulta.
+            n_sondas: Os valores de n_sondas avaliados na busca IVF.
+
+        Returns:
+            Uma lista de linhas [método, n_sondas, recall@k, milissegundos por consulta], também impressa em tabela.
+        """
+        consultas = np.atleast_2d(consultas)
+
+        inicio = time.perf_counter()
+        exatos, _ = self.busca(consultas, k)
+        linhas = [['exata', None, 1.0, (time.perf_counter() - inicio) * 1000 / len(consultas)]]
+
+        if self.ivf_construido:
+            for sondas in n_sondas:
+                inicio = time.perf_counter()
+                aproximados, _ = self.busca_ivf(consultas, k, sondas)
+                milissegundos = (time.perf_counter() - inicio) * 1000 / len(consultas)
+                recall = np.mean([len(np.intersect1d(a, e)) / len(e) for a, e in zip(aproximados, exatos)])
+                linhas.append(['ivf', sondas, float(recall), milissegundos])
+
+        print(tabulate(linhas, headers=["Método", "Sondas", f"Recall@{k}", "ms por consulta"]))
+        return linhas
+
+
+class PoolConexoes:
+    """
+    Pool simples de conexões DB-API, para reutilizar conexões entre execuções no mesmo processo.
+    """
+
+    def __init__(self, fabrica, tamanho: int = 4):
+        """
+        Args:
+            fabrica: Uma função sem argumentos que abre uma nova conexão.
+            tamanho: O número máximo de conexões ociosas mantidas no pool.
+        """
+        self._fabrica = fabrica
+        self._ociosas = queue.LifoQueue(maxsize=tamanho)
+
+    @contextlib.contextmanager
+    def conexao(self):
+        """
+        Empresta uma conexão do pool, abrindo uma nova se não houver conexão ociosa, e a devolve ao final.
+
+        Returns:
+            Um gerenciador de contexto que produz a conexão.
+        """
+        try:
+            conn = self._ociosas.get_nowait()
+        except queue.Empty:
+            conn = self._fabrica()
+
+        try:
+            yield conn
+        except BaseException:
+            # Uma conexão que falhou no meio do uso não volta ao pool
+            conn.close()
+            raise
+
+        try:
+            self._ociosas.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def fecha(self) -> None:
+        """
+        Fecha todas as conexões ociosas do pool.
+        """
+        while True:
+            try:
+                self._ociosas.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class CorpusCompacto:
+    """
+    Representação compacta de um corpus limpo: um vocabulário e os códigos inteiros das palavras de cada documento.
+
+    Os códigos de todos os documentos ficam num único vetor (tokens), e inicios[d]:inicios[d + 1] delimita o
+    documento d, como nos índices de uma matriz CSR. Os códigos são atribuídos na ordem da primeira ocorrência,
+    de modo que palavras[codigo] reproduz a ordem do vocabulário de um Counter sobre as mesmas palavras.
+
+    É criado uma única vez por Func.cleaner_compacto e consumido diretamente por Func.calcula_ome,
+    Func.analise_prototipica e Func.conta_ngramas, sem juntar e dividir strings entre as etapas.
+    """
+
+    def __init__(self, palavras: List[str], tokens: np.ndarray, inicios: np.ndarray):
+        """
+        Args:
+            palavras: O vocabulário, indexado pelo código de cada palavra.
+            tokens: Vetor com os códigos das palavras de todos os documentos, na ordem do corpus.
+            inicios: Vetor int64 com a posição do início de cada documento em tokens, mais a posição final.
+        """
+        self.palavras = palavras
+        self.tokens = tokens
+        self.inicios = inicios
+        self._vocabulario = None
+        self._matriz = None
+
+    @staticmethod
+    def constroi(documentos: Iterable[Iterable[str]]) -> 'CorpusCompacto':
+        """
+        Codifica as palavras de cada documento como inteiros.
+
+        Args:
+            documentos: Um iterável de documentos, cada um uma sequência de palavras já limpas.
+
+        Returns:
+            O CorpusCompacto dos documentos.
+        """
+        vocabulario = {}
+        partes = []
+        inicios = [0]
+        for palavras in documentos:
+            codigos = np.fromiter((vocabulario.setdefault(palavra, len(vocabulario)) for palavra in palavras),
+                                  dtype=np.int64)
+            partes.append(codigos)
+            inicios.append(inicios[-1] + len(codigos))
+
+        tokens = np.concatenate(partes) if partes else np.zeros(0, dtype=np.int64)
+        tipo = np.int32 if len(vocabulario) < 2 ** 31 else np.int64
+        corpus = CorpusCompacto(list(vocabulario), tokens.astype(tipo), np.asarray(inicios, dtype=np.int64))
+        corpus._vocabulario = vocabulario
+        return corpus
+
+    @staticmethod
+    def junta(partes: Iterable[Tuple['CorpusCompacto', List[int]]]) -> 'CorpusCompacto':
+        """
+        Junta os corpus de grupos de documentos (por exemplo, os grupos de idioma de Func.processa_por_idioma) num
+        único corpus, com os documentos na ordem original.
+
+        Os códigos de cada grupo são traduzidos para um vocabulário comum por vetores de mapeamento, sem decodificar
+        as palavras do corpus, e o resultado é o mesmo de CorpusCompacto.constroi sobre as palavras de todos os
+        documentos na ordem original.
+
+        Args:
+            partes: Pares (corpus, indices), em que o documento d do corpus é o documento indices[d] do resultado.
+                Os índices de todas as partes juntas devem ser 0, 1, ..., n - 1.
+
+        Returns:
+            O CorpusCompacto com todos os documentos.
+        """
+        origem = {}
+        mapas = []
+        for p, (corpus, indices) in enumerate(partes):
+            mapas.append((corpus, np.full(len(corpus.palavras), -1, dtype=np.int64)))
+            origem.update((i, (p, d)) for d, i in enumerate(indices))
+        if sorted(origem) != list(range(len(origem))):
+            raise ValueError("os índices das partes devem cobrir os documentos 0, 1, ..., n - 1")
+
+        vocabulario = {}
+        partes_tokens = []
+        inicios = [0]
+        for i in range(len(origem)):
+            p, d = origem[i]
+            corpus, mapa = mapas[p]
+            codigos = corpus.tokens[corpus.inicios[d]:corpus.inicios[d + 1]]
+
+            # Atribui códigos comuns às palavras ainda não vistas, na ordem da primeira ocorrência no documento
+            novos = codigos[mapa[codigos] < 0]
+            if len(novos):
+                unicos, posicoes = np.unique(novos, return_index=True)
+                for codigo in unicos[np.argsort(posicoes)].tolist():
+                    mapa[codigo] = vocabulario.setdefault(corpus.palavras[codigo], len(vocabulario))
+
+            partes_tokens.append(mapa[codigos])
+            inicios.append(inicios[-1] + len(codigos))
+
+        tokens = np.concatenate(partes_tokens) if partes_tokens else np.zeros(0, dtype=np.int64)
+        tipo = np.int32 if len(vocabulario) < 2 ** 31 else np.int64
+        corpus = CorpusCompacto(list(vocabulario), tokens.astype(tipo), np.asarray(inicios, dtype=np.int64))
+        corpus._vocabulario = vocabulario
+        return corpus
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            O número de documentos.
+        """
+        return len(self.inicios) - 1
+
+    def __getstate__(self):
+        # O vocabulário e a matriz são recriados sob demanda e não são gravados
+        return self.palavras, self.tokens, self.inicios
+
+    def __setstate__(self, estado):
+        self.__init__(*estado)
+
+    @property
+    def vocabulario(self) -> Dict[str, int]:
+        """
+        O dicionário palavra -> código.
+        """
+        if self._vocabulario is None:
+            self._vocabulario = {palavra: codigo for codigo, palavra in enumerate(self.palavras)}
+        return self._vocabulario
+
+    def documento(self, d: int) -> np.ndarray:
+        """
+        Retorna os códigos das palavras do documento d, sem cópia.
+        """
+        return self.tokens[self.inicios[d]:self.inicios[d + 1]]
+
+    @property
+    def documentos(self) -> List[np.ndarray]:
+        """
+        Os vetores de códigos de cada documento.
+        """
+        return [self.documento(d) for d in range(len(self))]
+
+    @property
+    def matriz(self) -> 'scipy.sparse.csr_matrix':
+        """
+        A matriz esparsa documentos x vocabulário com a frequência de cada palavra em cada documento.
+        """
+        if self._matriz is None:
+            import scipy.sparse
+
+            # A cópia impede que sum_duplicates reordene os próprios tokens do corpus
+            matriz = scipy.sparse.csr_matrix((np.ones(len(self.tokens), dtype=np.int64), self.tokens, self.inicios),
+                                             shape=(len(self), len(self.palavras)), copy=True)
+            matriz.sum_duplicates()
+            self._matriz = matriz
+        return self._matriz
+
+    @property
+    def frequencias(self) -> np.ndarray:
+        """
+        A frequência de cada palavra do vocabulário no corpus.
+        """
+        return np.bincount(self.tokens, minlength=len(self.palavras))
+
+    def palavras_filtradas(self) -> List[str]:
+        """
+        Retorna a lista de palavras do corpus, na ordem do texto, como a lista filtrada de Func.cleaner.
+        """
+        palavras = self.palavras
+        return [palavras[codigo] for codigo in self.tokens.tolist()]
+
+    def hapaxes(self) -> List[str]:
+        """
+        Retorna as palavras que ocorrem uma única vez, na ordem da primeira ocorrência.
+        """
+        return [self.palavras[codigo] for codigo in np.flatnonzero(self.frequencias == 1).tolist()]
+
+    def sem_hapaxes(self) -> 'CorpusCompacto':
+        """
+        Retorna o corpus sem as palavras que ocorrem uma única vez. O vocabulário e os códigos são mantidos.
+        """
+        mantidos = (self.frequencias > 1)[self.tokens]
+        inicios = np.concatenate([[0], np.cumsum(mantidos)])[self.inicios]
+        corpus = CorpusCompacto(self.palavras, self.tokens[mantidos], inicios)
+        corpus._vocabulario = self._vocabulario
+        return corpus
+
+    def ordens(self, por_respondente: bool = False) -> np.ndarray:
+        """
+        Calcula a ordem de evocação de cada palavra do corpus.
+
+        Args:
+            por_respondente: Se True, a ordem recomeça em 1 a cada documento; se False, é a posição no corpus.
+
+        Returns:
+            Um vetor int64 com a ordem de cada palavra, na ordem de tokens.
+        """
+        posicoes = np.arange(1, len(self.tokens) + 1, dtype=np.int64)
+        if por_respondente:
+            posicoes -= np.repeat(self.inicios[:-1], np.diff(self.inicios))
+        return posicoes
+
+
+class Perfilador:
+    """
+    Mede o tempo e a memória de etapas nomeadas, como as de PipelineAnalise.
+
+    Cada etapa é delimitada por um gerenciador de contexto (with perfilador.etapa('limpeza'): ...). São medidos o
+    tempo decorrido, o tempo de CPU do processo, o pico de memória alocada pelo Python (e pelo NumPy) durante a
+    etapa, com tracemalloc, e a memória máxima do processo ao final da etapa (ru_maxrss, quando o módulo resource
+    existir). Etapas podem ser aninhadas; o nome de uma etapa interna é prefixado pelo da externa ('a/b'), e o
+    pico da externa inclui o das internas.
+
+    tracemalloc deixa as alocações mais lentas; com memoria=False, apenas os tempos são medidos.
+    """
+
+    def __init__(self, memoria: bool = True):
+        """
+        Args:
+            memoria: Se True, mede o pico de memória das etapas com tracemalloc.
+        """
+        self.memoria = memoria
+        self.etapas: List[MedicaoEtapa] = []
+        self._pilha = []
+        self._iniciou_tracemalloc = False
+        self._origem = time.perf_counter()
+
+    @contextlib.contextmanager
+    def etapa(self, nome: str):
+        """
+        Mede uma etapa.
+
+        Args:
+            nome: O nome da etapa.
+
+        Returns:
+            Um gerenciador de contexto que mede o bloco executado dentro dele.
+        """
+        if self.memoria and not self._pilha and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+
+        # O pico acumulado até aqui pertence à etapa externa; o contador é zerado para medir a nova etapa
+        memoria_inicial = None
+        if self.memoria and tracemalloc.is_tracing():
+            memoria_inicial, pico = tracemalloc.get_traced_memory()
+            if self._pilha:
+                self._pilha[-1][1] = max(self._pilha[-1][1], pico)
+            tracemalloc.reset_peak()
+
+        nome_completo = '/'.join([quadro[0] for quadro in self._pilha] + [nome])
+        quadro = [nome, 0]
+        self._pilha.append(quadro)
+        inicio = time.perf_counter()
+        inicio_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            segundos_cpu = time.process_time() - inicio_cpu
+            self._pilha.pop()
+
+            pico_memoria = None
+            if memoria_inicial is not None:
+                pico = max(tracemalloc.get_traced_memory()[1], quadro[1])
+                pico_memoria = pico - memoria_inicial
+                if self._pilha:
+                    self._pilha[-1][1] = max(self._pilha[-1][1], pico)
+                tracemalloc.reset_peak()
+
+            if self._iniciou_tracemalloc and not self._pilha:
+                tracemalloc.stop()
+                self._iniciou_tracemalloc = False
+
+            self.etapas.append(MedicaoEtapa(nome_completo, inicio - self._origem, segundos, segundos_cpu,
+                                            pico_memoria, Perfilador._memoria_processo()))
+
+    @staticmethod
+    def _memoria_processo() -> Optional[int]:
+        """
+        Retorna a memória máxima usada pelo processo até agora, em bytes, ou None se o módulo resource não
+        existir (por exemplo, no Windows).
+        """
+        try:
+            import resource
+        except ImportError:
+            return None
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss é dado em kilobytes no Linux e em bytes no macOS
+        return maximo if os.uname().sysname == 'Darwin' else maximo * 1024
+
+    def relatorio(self, imprimir: bool = True) -> List[Dict]:
+        """
+        Retorna as medições das etapas, na ordem em que terminaram, e as imprime em tabela.
+
+        Args:
+            imprimir: Se False, a tabela não é impressa.
+
+        Returns:
+            Uma lista de dicionários com os campos de MedicaoEtapa.
+        """
+        linhas = [medicao._asdict() for medicao in self.etapas]
+        if imprimir:
+            tabela = [[m.nome, m.segundos, m.segundos_cpu,
+                       None if m.pico_memoria is None else m.pico_memoria / 2 ** 20,
+                       None if m.memoria_processo is None else m.memoria_processo / 2 ** 20] for m in self.etapas]
+            print(tabulate(tabela, headers=["Etapa", "Segundos", "Segundos de CPU", "Pico de memória (MB)",
+                                            "Memória do processo (MB)"], floatfmt=".3f"))
+        return linhas
+
+    def salva_trace(self, caminho: str) -> None:
+        """
+        Salva as medições num arquivo JSON no formato de trace do Chrome, que pode ser aberto em
+        chrome://tracing ou no Perfetto.
+
+        Args:
+            caminho: O caminho do arquivo JSON.
+        """
+        eventos = [{'name': m.nome, 'ph': 'X', 'ts': m.inicio * 1e6, 'dur': m.segundos * 1e6, 'pid': os.getpid(),
+                    'tid': 0, 'args': {'segundos_cpu': m.segundos_cpu, 'pico_memoria': m.pico_memoria,
+                                       'memoria_processo': m.memoria_processo}}
+                   for m in self.etapas]
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, arquivo, ensure_ascii=False, indent=1)
+
+
+class PipelineAnalise:
+    """
+    Executa a análise prototípica em etapas nomeadas, guardando em disco o artefato de cada etapa.
+
+    As etapas são, em ordem: corpus, idiomas, ome e zonas. A etapa idiomas detecta o idioma de cada documento e,
+    com Func.processa_por_idioma, extrai as entidades e limpa cada documento com o modelo do Spacy e as stopwords
+    do seu idioma. A chave de cada etapa é o hash da chave da etapa anterior com os parâmetros da própria etapa, e
+    a chave da primeira é o hash dos documentos do corpus. Assim, só as etapas a jusante de uma mudança são
+    recalculadas: trocar 'hap' por 'no_hap' reaproveita o reconhecimento de entidades e a limpeza, e alterar um
+    arquivo do corpus recalcula tudo.
+
+    Os artefatos ficam em <pasta>/<etapa>/<chave>.npz. Com um Perfilador, o tempo e a memória de cada etapa
+    são medidos, incluindo, dentro da etapa idiomas, a detecção dos idiomas (idiomas/deteccao), o carregamento
+    dos modelos do Spacy (idiomas/modelo_spacy), a limpeza (idiomas/limpeza) e o reconhecimento de entidades
+    (idiomas/entidades).
+    """
+
+    ETAPAS = ('corpus', 'idiomas', 'ome', 'zonas')
+
+    # Versão do formato dos artefatos, que entra na chave das etapas: mudar o formato invalida os artefatos antigos
+    VERSAO_ARTEFATOS = 1
+
+    def __init__(self, pasta: Optional[str] = None, usar_cache: bool = True,
+                 perfilador: Optional[Perfilador] = None):
+        """
+        Args:
+            pasta: A pasta dos artefatos. Se None, é a subpasta pipeline da pasta de cache (veja Func.cache_resumos).
+            usar_cache: Se False, todas as etapas são recalculadas e nenhum artefato é lido ou gravado.
+            perfilador: Se informado, mede o tempo e a memória de cada etapa.
+        """
+        self.pasta = pasta if pasta is not None else os.path.join(Func._pasta_cache(), 'pipeline')
+        self.usar_cache = usar_cache
+        self.perfilador = perfilador
+        # Nome -> True se a etapa foi recalculada na última execução, False se veio do disco
+        self.executadas = {}
+
+    def _caminho(self, etapa: str, chave: str) -> str:
+        return os.path.join(self.pasta, etapa, f'{chave}.npz')
+
+    def _mede(self, nome: str):
+        return self.perfilador.etapa(nome) if self.perfilador is not None else contextlib.nullcontext()
+
+    def etapa(self, nome: str, chave: str, funcao):
+        """
+        Retorna o artefato de uma etapa, lendo-o do disco se já tiver sido calculado para a mesma chave.
+
+        Args:
+            nome: O nome da etapa.
+            chave: A chave da etapa.
+            funcao: Uma função sem argumentos que calcula o artefato.
+
+        Returns:
+            O artefato da etapa.
+        """
+        with self._mede(nome):
+            return self._executa_etapa(nome, chave, funcao)
+
+    def _executa_etapa(self, nome: str, chave: str, funcao):
+        caminho = self._caminho(nome, chave)
+        if self.usar_cache:
+            try:
+                artefato = PipelineAnalise._le_artefato(caminho)
+                self.executadas[nome] = False
+                return artefato
+            except Exception:
+                # Um artefato ausente, corrompido ou de outro formato é tratado como se não existisse
+                pass
+
+        artefato = funcao()
+        self.executadas[nome] = True
+        if self.usar_cache:
+            # Grava num arquivo temporário e renomeia, para que uma execução interrompida não deixe artefato parcial
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f'{caminho}.{os.getpid()}.tmp'
+            PipelineAnalise._grava_artefato(temporario, artefato)
+            os.replace(temporario, caminho)
+        return artefato
+
+    @staticmethod
+    def _grava_artefato(caminho: str, artefato) -> None:
+        """
+        Grava um artefato como dados simples: os vetores NumPy num arquivo .npz e, no mesmo arquivo, a estrutura
+        que os reúne em JSON. Nenhum objeto é gravado com pickle, de modo que o artefato pode ser lido tanto com
+        "import main_pat" quanto pelo script executado diretamente, em que as classes pertencem a __main__.
+        """
+        vetores = {}
+        estrutura = {'versao': PipelineAnalise.VERSAO_ARTEFATOS,
+                     'artefato': PipelineAnalise._codifica(artefato, vetores)}
+        with open(caminho, 'wb') as arquivo:
+            np.savez(arquivo, estrutura=np.array(json.dumps(estrutura, ensure_ascii=False)), **vetores)
+
+    @staticmethod
+    def _le_artefato(caminho: str):
+        """
+        Lê um artefato gravado por PipelineAnalise._grava_artefato.
+
+        Raises:
+            ValueError: Se o artefato tiver sido gravado em outra versão do formato.
+        """
+        with np.load(caminho, allow_pickle=False) as dados:
+            estrutura = json.loads(str(dados['estrutura']))
+            if estrutura.get('versao') != PipelineAnalise.VERSAO_ARTEFATOS:
+                raise ValueError(f"versão de artefato desconhecida: {estrutura.get('versao')}")
+            return PipelineAnalise._decodifica(estrutura['artefato'], dados)
+
+    @staticmethod
+    def _codifica(valor, vetores: Dict[str, np.ndarray]):
+        """
+        Converte um artefato numa estrutura JSON, guardando os vetores NumPy em vetores. Strings, números, None e
+        listas são gravados diretamente; os demais tipos são marcados por um dicionário de uma única chave.
+        """
+        if valor is None or isinstance(valor, (str, bool, int, float)):
+            return valor
+        if isinstance(valor, list):
+            return [PipelineAnalise._codifica(item, vetores) for item in valor]
+        if isinstance(valor, tuple):
+            return {'tupla': [PipelineAnalise._codifica(item, vetores) for item in valor]}
+        if isinstance(valor, dict):
+            return {'dicionario': [[PipelineAnalise._codifica(chave, vetores), PipelineAnalise._codifica(item, vetores)]
+                                   for chave, item in valor.items()]}
+        if isinstance(valor, np.generic):
+            return {'escalar': [valor.item(), valor.dtype.str]}
+        if isinstance(valor, np.ndarray):
+            nome = f'v{len(vetores)}'
+            vetores[nome] = valor
+            return {'vetor': nome}
+        if isinstance(valor, CorpusCompacto):
+            return {'corpus': [PipelineAnalise._codifica(parte, vetores)
+                               for parte in (valor.palavras, valor.tokens, valor.inicios)]}
+        raise TypeError(f"tipo de artefato não suportado: {type(valor).__name__}")
+
+    @staticmethod
+    def _decodifica(valor, vetores):
+        """
+        Reconstrói um artefato codificado por PipelineAnalise._codifica.
+        """
+        if isinstance(valor, list):
+            return [PipelineAnalise._decodifica(item, vetores) for item in valor]
+        if not isinstance(valor, dict):
+            return valor
+
+        (tipo, conteudo), = valor.items()
+        if tipo == 'tupla':
+            return tuple(PipelineAnalise._decodifica(item, vetores) for item in conteudo)
+        if tipo == 'dicionario':
+            return {PipelineAnalise._decodifica(chave, vetores): PipelineAnalise._decodifica(item, vetores)
+                    for chave, item in conteudo}
+        if tipo == 'escalar':
+            return np.dtype(conteudo[1]).type(conteudo[0])
+        if tipo == 'vetor':
+            return vetores[conteudo]
+        if tipo == 'corpus':
+            return CorpusCompacto(*(PipelineAnalise._decodifica(parte, vetores) for parte in conteudo))
+        raise ValueError(f"tipo de artefato desconhecido: {tipo}")
+
+    @staticmethod
+    def chave(*partes) -> str:
+        """
+        Calcula a chave de uma etapa a partir da chave anterior e dos parâmetros.
+
+        Returns:
+            Um hash hexadecimal curto.
+        """
+        return CacheSQLite.chave(*partes)[:32]
+
+    def executa(self, path_folder: str, hap_or_no_hap: str) -> ResultadoAnalise:
+        """
+        Executa todas as etapas da análise prototípica no corpus especificado.
+
+        Args:
+            path_folder: O caminho da pasta que contém o corpus.
+            hap_or_no_hap: 'hap' para calcular a OME com as palavras hapax, 'no_hap' para calcular sem elas.
+
+        Returns:
+            Um ResultadoAnalise.
+
+        Raises:
+            ValueError: Se hap_or_no_hap não for 'hap' ou 'no_hap', ou se a pasta não tiver documentos.
+        """
+        if hap_or_no_hap not in ('hap', 'no_hap'):
+            raise ValueError("hap_or_no_hap precisa ser 'hap' ou 'no_hap'")
+        self.executadas = {}
+
+        # Lê os documentos da pasta; o texto completo é o de Func.import_text_from_folder
+        with self._mede('corpus'):
+            documentos = [documento.texto for documento in Func.le_corpus(f"{path_folder}")]
+            texto = '\n'.join(documentos)
+            self.executadas['corpus'] = True
+            resumo = hashlib.sha256()
+            for documento in documentos:
+                dados = documento.encode('utf-8', 'surrogatepass')
+                resumo.update(len(dados).to_bytes(8, 'little'))
+                resumo.update(dados)
+            chave = self.chave('corpus', resumo.hexdigest())
+
+        # Detecta o idioma de cada documento, extrai as entidades e limpa cada documento com os recursos do seu
+        # idioma, medindo à parte a detecção, o carregamento dos modelos do Spacy, a limpeza e as entidades
+        def idiomas():
+            with self._mede('deteccao'):
+                grupos = Func.agrupa_por_idioma(documentos)
+            with self._mede('modelo_spacy'):
+                for idioma in grupos:
+                    Func.pipeline_spacy(idioma)
+            processados = Func.processa_por_idioma(documentos, grupos=grupos, perfilador=self.perfilador)
+
+            entidades = [None] * len(documentos)
+            for grupo in processados.values():
+                for i, contagem in zip(grupo.indices, grupo.entidades):
+                    entidades[i] = contagem
+            ent_list = [list(entidade) for entidade in dict.fromkeys(
+                entidade for contagem in entidades for entidade in contagem)]
+
+            corpus = CorpusCompacto.junta((grupo.corpus, grupo.indices) for grupo in processados.values())
+            return grupos, ent_list, corpus
+
+        chave = self.chave('idiomas', chave, PipelineAnalise.VERSAO_ARTEFATOS)
+        grupos, ent_list, corpus = self.etapa('idiomas', chave, idiomas)
+        if not grupos:
+            raise ValueError(f"A pasta {path_folder} não contém documentos.")
+        lang_code = Func._idioma_predominante(grupos, documentos)
+        lang_code_short, lang_code_full = Func.recursos_idioma(lang_code)
+
+        # Calcula a OME das palavras filtradas de acordo com o parâmetro hap_or_no_hap
+        chave = self.chave('ome', chave, hap_or_no_hap)
+        palavras_ordenadas, omes = self.etapa(
+            'ome', chave, lambda: Func.calcula_ome(corpus if hap_or_no_hap == 'hap' else corpus.sem_hapaxes()))
+
+        # Realiza a análise prototípica das palavras filtradas
+        chave = self.chave('zonas', chave)
+        zonas = self.etapa('zonas', chave, lambda: Func.analise_prototipica(palavras_ordenadas, omes))
+
+        return ResultadoAnalise(texto, ent_list, lang_code, lang_code_short, lang_code_full, corpus,
+                                palavras_ordenadas, omes, *zonas, idiomas=grupos)
 
 
 class Func:
-    def __init__(self):
+    # Idiomas com modelo do Spacy: código ISO -> (nome do idioma no NLTK, nome do modelo do Spacy)
+    _IDIOMAS = {
+        'en': ('english', 'en_core_web_sm'),
+        'pt': ('portuguese', 'pt_core_news_sm'),
+    }
+
+    # Componentes do Spacy que não são usados no reconhecimento de entidades
+    _COMPONENTES_DESATIVADOS = ('parser', 'lemmatizer', 'tagger', 'morphologizer', 'attribute_ruler', 'senter')
+
+    # Caracteres especiais removidos por Func.cleaner
+    _CARACTERES_ESPECIAIS = string.punctuation + '`”\'\'``). .). .: .) ]: [: :] :[ ©\'–// /\'- ! ? ., . “'
+
+    # Expressões regulares compiladas uma única vez
+    _REGEX_NUMEROS = re.compile('[0-9]')
+    _REGEX_ESPACO = re.compile(r'\s')
+    _REGEX_LINHA = re.compile(r'\n')
+    _REGEX_FRASES = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+
+    # Pipelines do Spacy já carregados no processo, por código ISO do idioma
+    _pipelines_spacy = {}
+    _trava_spacy = threading.Lock()
+
+    # Cache persistente das respostas da API do ChatGPT (veja Func.cache_resumos)
+    _cache_resumos = None
+
+    # Cache persistente das respostas de Func.consulta_lote (veja Func.cache_consultas)
+    _cache_consultas = None
+
+    # Cache persistente das transcrições de Func.transcreve_lote (veja Func.cache_transcricoes)
+    _cache_transcricoes = None
+
+    # Cliente do Google Tradutor compartilhado e cache persistente das traduções (veja Func.traduz_lote)
+    _tradutor = None
+    _cache_traducoes = None
+
+    # Sumarizadores BERT já carregados, por modelo (veja Func.sumarizador_bert)
+    _sumarizadores_bert = {}
+    _trava_bert = threading.Lock()
+
+    # Pools de conexões MySQL de Func.criar_indice_sql, por (host, usuário, banco)
+    _pools_sql = {}
+
+    # Índices binários e buscas vetoriais já abertos, por diretório, com a versão dos arquivos (veja Func.busca_local)
+    _buscas_locais = {}
+
+    # Idiomas já detectados, pelo hash do trecho analisado (veja Func.detecta_idioma)
+    _idiomas_detectados = {}
+    _MAX_IDIOMAS_DETECTADOS = 100_000
+
+    def __init__(self, limpa_tela: bool = False):
+        """
+        Inicializa a classe Func.
+
+        Args:
+            limpa_tela: Se True, limpa a tela do terminal.
+        """
+        if limpa_tela:
+            os.system('cls' if os.name == 'nt' else 'clear')
+
+    @staticmethod
+    def api_loader():
+        """
+        Carrega a chave de API do OpenAI a partir do arquivo .env.
+
+        Argumentos:
+        None
+
+        Retorna:
+        str: chave de API do OpenAI
+        """
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        openai_api_key = os.getenv('OPENAI_API_KEY')
+        return openai_api_key
+
+    @staticmethod
+    def import_text_from_folder(folder_path):
+        """
+        Esta função recebe um caminho de pasta como entrada e retorna uma única string contendo todo o texto dos
+        arquivos txt encontrados nessa pasta.
+    
+        Argumentos:
+        folder_path -- O caminho da pasta que contém os arquivos txt a serem importados
+    
+        Retorna:
+        text -- A única string contendo todo o texto dos arquivos txt encontrados na pasta especificada por folder_path
+    
+        Raises:
+        FileNotFoundError -- Se a pasta especificada por folder_path não existir
+    
+        Esta função percorre todos os arquivos txt encontrados na pasta especificada por folder_path, lê o conteúdo
+        de cada um deles e adiciona seu texto a uma única string, separando os arquivos por uma quebra de linha. A
+        string contendo todo o texto é então retornada pela função. Para corpora grandes, prefira Func.le_corpus,
+        que lê um documento de cada vez.
+    
+        Se a pasta especificada por folder_path não existir, a função levanta a exceção FileNotFoundError.
+        """
+        # Combina o texto de todos os arquivos em uma única string, sem colar a última palavra de um arquivo
+        # à primeira do seguinte
+        text = '\n'.join(documento.texto for documento in Func.le_corpus(folder_path))
+        return text
+
+    @staticmethod
+    def le_corpus(folder_path: str, padrao: str = '*.txt', recursivo: bool = False,
+                  encodings: Tuple[str, ...] = ('utf-8', 'latin-1'),
+                  limite_mmap: Optional[int] = 64 * 1024 * 1024) -> Iterator[DocumentoCorpus]:
+        """
+        Lê os arquivos de texto de uma pasta, um documento de cada vez.
+
+        Argumentos:
+        folder_path -- O caminho da pasta que contém os arquivos a serem lidos
+        padrao -- O padrão glob dos arquivos a serem lidos (padrão: '*.txt')
+        recursivo -- Se True, também percorre as subpastas
+        encodings -- As codificações tentadas, em ordem, na decodificação de cada arquivo
+        limite_mmap -- Arquivos a partir deste tamanho, em bytes, são lidos por mapeamento em memória (mmap);
+                       None desativa o mapeamento
+
+        Retorna:
+        Um gerador de DocumentoCorpus, em ordem alfabética de caminho, com o caminho, o tamanho em bytes, a
+        codificação usada e o texto de cada arquivo.
+
+        Raises:
+        FileNotFoundError -- Se a pasta especificada por folder_path não existir
+
+        Como os documentos são produzidos um a um, Func.cleaner e Func.calcula_ome podem consumir o corpus em fluxo,
+        sem que o corpus inteiro precise ser mantido em uma única string.
+        """
+        # Verifica se a pasta existe
+        if not os.path.exists(folder_path):
+            raise FileNotFoundError(f"A pasta {folder_path} não existe.")
+
+        # Percorre os arquivos que atendem ao padrão, na pasta ou também nas subpastas
+        pasta = pathlib.Path(folder_path)
+        caminhos = pasta.rglob(padrao) if recursivo else pasta.glob(padrao)
+
+        for caminho in sorted(caminho for caminho in caminhos if caminho.is_file()):
+            tamanho = caminho.stat().st_size
+            usar_mmap = limite_mmap is not None and tamanho >= limite_mmap
+            texto, encoding = Func._le_documento(caminho, tamanho, encodings, usar_mmap)
+            yield DocumentoCorpus(str(caminho), tamanho, encoding, texto)
+
+    @staticmethod
+    def _le_documento(caminho: pathlib.Path, tamanho: int, encodings: Tuple[str, ...],
+                      usar_mmap: bool) -> Tuple[str, str]:
+        """
+        Lê e decodifica um arquivo, tentando cada codificação em ordem.
+
+        Argumentos:
+        caminho -- O caminho do arquivo
+        tamanho -- O tamanho do arquivo em bytes
+        encodings -- As codificações a serem tentadas
+        usar_mmap -- Se True, decodifica diretamente a partir de um mapeamento do arquivo em memória
+
+        Retorna:
+        Uma tupla com o texto decodificado e a codificação usada.
+
+        Raises:
+        UnicodeDecodeError -- Se nenhuma das codificações conseguir decodificar o arquivo
+        """
+        with open(caminho, 'rb') as arquivo:
+            if usar_mmap and tamanho > 0:
+                dados = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                dados = arquivo.read()
+
+            try:
+                erro = None
+                for encoding in encodings:
+                    try:
+                        return str(dados, encoding), encoding
+                    except UnicodeDecodeError as e:
+                        erro = e
+                raise erro
+            finally:
+                if isinstance(dados, mmap.mmap):
+                    dados.close()
+
+    @staticmethod
+    def criar_indice_sql(host, user, password, database_sql, tabela, path_index='indice', tamanho_lote=500,
+                         lotes_por_salvamento=10, conexao=None):
+        """
+        Cria ou atualiza um índice de pesquisa usando os dados de uma tabela específica em um banco de dados SQL.
+
+        Argumentos:
+        host (str): endereço do servidor de banco de dados
+        user (str): nome de usuário do banco de dados
+        password (str): senha do usuário do banco de dados
+        database_sql (str): nome do banco de dados a ser conectado
+        tabela (str): nome da tabela que contém os dados a serem indexados, com as colunas id_sql e texto
+        path_index (str): diretório onde o índice (index.json) e a marca de progresso (marca_sql.json) são salvos
+        tamanho_lote (int): número de linhas lidas e enviadas ao índice de cada vez
+        lotes_por_salvamento (int): a cada quantos lotes o índice e a marca de progresso são salvos
+        conexao: uma conexão DB-API já aberta (por exemplo, sqlite3) a ser usada no lugar da conexão MySQL; ela
+                 não é fechada pela função
+
+        Retorna:
+        GPTSimpleVectorIndex: o índice atualizado, ou None se a tabela não tiver linhas novas e ainda não houver
+        índice
+
+        As linhas são lidas em lotes com fetchmany, por um cursor do lado do servidor no MySQL, em ordem de id_sql, e
+        os documentos de cada lote são enviados juntos ao índice, para que seus embeddings sejam calculados em lote.
+        O maior id_sql já indexado é guardado em marca_sql.json; as execuções seguintes continuam a partir dele e
+        indexam apenas as linhas novas. As conexões MySQL ficam em um PoolConexoes e são reutilizadas entre
+        execuções no mesmo processo.
+        """
+        # O nome da tabela não pode ser passado como parâmetro da consulta, então é validado
+        if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?', tabela):
+            raise ValueError(f"Nome de tabela inválido: {tabela}")
+
+        # Carrega o índice e a marca de progresso existentes
+        caminho_marca = os.path.join(path_index, 'marca_sql.json')
+        marcas = {}
+        index = None
+        if os.path.exists(os.path.join(path_index, 'index.json')) and os.path.exists(caminho_marca):
+            index = Func.loader(path_index)
+            with open(caminho_marca, 'r', encoding='utf-8') as f:
+                marcas = json.load(f)
+        marca = marcas.get(tabela)
+
+        if conexao is None:
+            # Conectar ao banco de dados, reutilizando as conexões do pool
+            pool = Func._pools_sql.get((host, user, database_sql))
+            if pool is None:
+                import pymysql
+                pool = Func._pools_sql[(host, user, database_sql)] = PoolConexoes(
+                    lambda: pymysql.connect(host=host, user=user, password=password, database=database_sql))
+            with pool.conexao() as conn:
+                return Func._indexa_tabela(conn, tabela, marca, index, path_index, tamanho_lote,
+                                           lotes_por_salvamento)
+
+        return Func._indexa_tabela(conexao, tabela, marca, index, path_index, tamanho_lote, lotes_por_salvamento)
+
+    @staticmethod
+    def _indexa_tabela(conn, tabela, marca, index, path_index, tamanho_lote, lotes_por_salvamento):
+        """
+        Lê as linhas de uma tabela com id_sql maior que a marca e as adiciona ao índice, lote a lote.
+
+        Argumentos:
+        conn: a conexão DB-API
+        tabela (str): o nome, já validado, da tabela
+        marca: o maior id_sql já indexado, ou None
+        index: o índice existente, ou None
+        path_index (str): diretório onde o índice e a marca de progresso são salvos
+        tamanho_lote (int): número de linhas por lote
+        lotes_por_salvamento (int): a cada quantos lotes o índice e a marca são salvos
+
+        Retorna:
+        O índice atualizado, ou None se não houver índice nem linhas novas.
+        """
+        from llama_index import GPTSimpleVectorIndex, Document
+
+        # Descobre o estilo de parâmetro do driver (por exemplo, ? no sqlite3 e %s no pymysql)
+        driver = importlib.import_module(type(conn).__module__.split('.')[0])
+        estilo = getattr(driver, 'paramstyle', 'qmark')
+        marcador = {'qmark': '?', 'numeric': ':1', 'named': ':marca'}.get(estilo, '%s')
+
+        # Usa um cursor do lado do servidor no MySQL, para que a tabela não seja carregada inteira na memória
+        cursores = getattr(driver, 'cursors', None)
+        cursor = conn.cursor(cursores.SSCursor) if hasattr(cursores, 'SSCursor') else conn.cursor()
+
+        try:
+            # Selecionar os dados a serem indexados, a partir da marca de progresso
+            consulta = f"SELECT id_sql, texto FROM {tabela}"
+            if marca is None:
+                cursor.execute(f"{consulta} ORDER BY id_sql")
+            else:
+                parametros = {'marca': marca} if estilo == 'named' else (marca,)
+                cursor.execute(f"{consulta} WHERE id_sql > {marcador} ORDER BY id_sql", parametros)
+
+            lotes = 0
+            while True:
+                linhas = cursor.fetchmany(tamanho_lote)
+                if not linhas:
+                    break
+
+                # Criar os documentos do lote e adicioná-los juntos ao índice
+                documentos = [Document(texto or '', doc_id=str(id_sql)) for id_sql, texto in linhas]
+                if index is None:
+                    index = GPTSimpleVectorIndex.from_documents(documentos)
+                else:
+                    Func._insere_lote(index, documentos)
+                marca = linhas[-1][0]
+
+                # Salvar o índice e a marca de progresso periodicamente
+                lotes += 1
+                if lotes % lotes_por_salvamento == 0:
+                    Func._salva_indice_sql(index, path_index, tabela, marca)
+
+            if lotes % lotes_por_salvamento:
+                Func._salva_indice_sql(index, path_index, tabela, marca)
+
+        finally:
+            # Fechar o cursor e encerrar a transação de leitura
+            cursor.close()
+            conn.rollback()
+
+        return index
+
+    @staticmethod
+    def _salva_indice_sql(index, path_index, tabela, marca):
+        """
+        Salva o índice e, em seguida, a marca de progresso da tabela em marca_sql.json.
+
+        Argumentos:
+        index: o índice a ser salvo
+        path_index (str): o diretório do índice
+        tabela (str): o nome da tabela
+        marca: o maior id_sql indexado
+        """
+        os.makedirs(path_index, exist_ok=True)
+        Func.saver(index, path_index)
+
+        caminho_marca = os.path.join(path_index, 'marca_sql.json')
+        marcas = {}
+        if os.path.exists(caminho_marca):
+            with open(caminho_marca, 'r', encoding='utf-8') as f:
+                marcas = json.load(f)
+        marcas[tabela] = marca
+
+        temporario = caminho_marca + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(marcas, f, ensure_ascii=False, default=str)
+        os.replace(temporario, caminho_marca)
+
+    @staticmethod
+    def _insere_lote(index, documentos):
+        """
+        Insere vários documentos em um índice do Llama de uma só vez, para que os embeddings de todos os seus nós
+        sejam calculados em lote.
+
+        Argumentos:
+        index: o índice do Llama
+        documentos (list): os Documents a serem inseridos
+        """
+        nos = index.service_context.node_parser.get_nodes_from_documents(documentos)
+        index.insert_nodes(nos)
+
+    @staticmethod
+    def llama_index_texts(path_folder):
+        """
+        Esta função indexa documentos de texto contidos em um diretório usando a biblioteca Llama Index.
+    
+        Argumentos:
+        path_folder (str): Caminho absoluto ou relativo do diretório contendo os documentos a serem indexados.
+    
+        Retorna:
+        GPTSimpleVectorIndex: Um índice Llama que contém os documentos indexados.
+    
+        Esta função começa carregando os documentos de texto do diretório especificado por meio da função 
+        SimpleDirectoryReader(). O caminho do diretório é fornecido pelo argumento path_folder. A função retorna uma 
+        lista de objetos Document que contêm os documentos de texto a serem indexados. Em seguida, a função cria um 
+        objeto GPTSimpleVectorIndex, que é um índice Llama para documentos de texto. O objeto index é inicializado 
+        com a lista de documentos de texto passada como argumento e o tamanho máximo de fragmento permitido. Por fim, 
+        a função retorna o objeto index, que contém os documentos de texto indexados.
+        """
+        from llama_index import GPTSimpleVectorIndex, SimpleDirectoryReader
+
+        # Carregando documentos a partir de um diretório
+        documents = SimpleDirectoryReader(path_folder).load_data()
+
+        # Criando um índice Llama com os documentos carregados
+        index = GPTSimpleVectorIndex.from_documents(documents)
+
+        # Retornando o índice
+        return index
+
+    @staticmethod
+    def add_to_index(index, file_path):
+        """
+        Esta função adiciona um documento de texto contido em um arquivo ao índice Llama existente.
+        
+        Argumentos:
+        index -- O índice Llama atual.
+        file_path -- Caminho absoluto ou relativo do arquivo contendo o documento a ser adicionado ao índice.
+        
+        Retorna:
+        index -- O índice Llama atualizado com o novo documento de texto adicionado.
+        
+        Esta função carrega o documento de texto do arquivo especificado e o adiciona ao índice Llama existente.
+        O índice é atualizado com o novo documento de texto adicionado e a função retorna o índice atualizado.
+        """
+        from llama_index import Document
+
+        # Carregando documento a partir do arquivo, identificado pelo seu caminho
+        with open(file_path, 'r') as f:
+            text = f.read()
+        doc = Document(text, doc_id=file_path)
+
+        # Adicionando documento ao índice Llama existente
+        index.insert(doc)
+
+        # Retornando o índice atualizado
+        return index
+
+    @staticmethod
+    def indexa_incremental(path_folder: str, path_index: str, padrao: str = '*.txt',
+                           recursivo: bool = True) -> Tuple[object, Dict[str, List[str]]]:
+        """
+        Atualiza o índice Llama de uma pasta reindexando apenas os arquivos novos ou alterados.
+
+        Argumentos:
+        path_folder (str): Caminho do diretório contendo os documentos a serem indexados.
+        path_index (str): Caminho do diretório onde ficam o index.json e o manifesto.json do índice.
+        padrao (str): O padrão glob dos arquivos a serem indexados (padrão: '*.txt').
+        recursivo (bool): Se True, também percorre as subpastas (padrão: True).
+
+        Retorna:
+        tuple: Uma tupla contendo o índice atualizado (GPTSimpleVectorIndex) e um dicionário com as listas de
+        documentos 'novos', 'alterados', 'removidos' e 'inalterados'.
+
+        O manifesto.json, salvo ao lado do index.json, associa o caminho de cada arquivo (relativo a path_folder, e
+        usado como doc_id no índice) ao hash SHA-256 de seu conteúdo. A cada execução, apenas os arquivos cujo hash
+        mudou, ou que não estavam no manifesto, são enviados ao índice, e os documentos dos arquivos removidos ou
+        alterados são apagados do índice. Assim, o número de chamadas à API de embeddings é proporcional ao que
+        mudou no corpus, e não ao tamanho do corpus.
+        """
+        from llama_index import GPTSimpleVectorIndex, Document
+
+        caminho_manifesto = os.path.join(path_index, 'manifesto.json')
+        caminho_indice = os.path.join(path_index, 'index.json')
+
+        # Carrega o índice e o manifesto existentes. Um índice sem manifesto (criado, por exemplo, por
+        # Func.llama_index_texts) não tem doc_ids conhecidos e é recriado
+        index = None
+        manifesto = {}
+        if os.path.exists(caminho_indice) and os.path.exists(caminho_manifesto):
+            index = Func.loader(path_index)
+            with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+                manifesto = json.load(f)
+
+        # Compara o hash atual de cada arquivo com o do manifesto
+        hashes = {}
+        documentos = []
+        for documento in Func.le_corpus(path_folder, padrao=padrao, recursivo=recursivo):
+            doc_id = os.path.relpath(documento.caminho, path_folder)
+            hashes[doc_id] = hashlib.sha256(documento.texto.encode('utf-8')).hexdigest()
+            if manifesto.get(doc_id) != hashes[doc_id]:
+                documentos.append(Document(documento.texto, doc_id=doc_id))
+
+        alteracoes = {
+            'novos': [doc.doc_id for doc in documentos if doc.doc_id not in manifesto],
+            'alterados': [doc.doc_id for doc in documentos if doc.doc_id in manifesto],
+            'removidos': [doc_id for doc_id in manifesto if doc_id not in hashes],
+            'inalterados': [doc_id for doc_id in hashes if manifesto.get(doc_id) == hashes[doc_id]],
+        }
+
+        if index is None:
+            # Primeira execução: cria o índice com todos os documentos
+            index = GPTSimpleVectorIndex.from_documents(documentos)
+        else:
+            # Apaga os documentos removidos e as versões antigas dos alterados, e insere os novos e alterados
+            for doc_id in alteracoes['removidos'] + alteracoes['alterados']:
+                index.delete(doc_id)
+            Func._insere_lote(index, documentos)
+
+        # Salva o índice e, em seguida, o manifesto, de forma atômica
+        os.makedirs(path_index, exist_ok=True)
+        Func.saver(index, path_index)
+        temporario = caminho_manifesto + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(hashes, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(temporario, caminho_manifesto)
+
+        return index, alteracoes
+
+    @staticmethod
+    def saver(index, path_folder, formato='json'):
+        """
+        Salva o índice do Llama em disco como um arquivo json ou no formato binário de IndiceBinario.
+    
+        Args:
+            index: O índice do Llama a ser salvo.
+            path_folder: O caminho para o diretório onde o índice será salvo.
+            formato: 'json' salva o index.json do Llama; 'binario' salva os embeddings em um arquivo .npy de
+                float32 e os textos e metadados em arquivos compactos (veja IndiceBinario).
+    
+        Returns:
+            Nada. A função salva o índice do Llama no formato escolhido.
+        """
+        if formato == 'binario':
+            # Extrai os vetores e textos do índice e os salva no formato binário
+            IndiceBinario.salva(path_folder, *Func._extrai_vetores(index.save_to_dict()))
+        elif formato == 'json':
+            # Salva o índice em um arquivo json
+            index.save_to_disk(f'{path_folder}/index.json')
+        else:
+            raise ValueError("formato precisa ser 'json' ou 'binario'")
+
+    @staticmethod
+    def loader(path_folder, formato='json'):
+        """
+        Carrega o índice do Llama a partir de um arquivo json em disco, ou o índice binário salvo por
+        Func.saver(index, path_folder, formato='binario').
+    
+        Args:
+            path_folder: O caminho para o diretório onde o índice está salvo.
+            formato: 'json' ou 'binario'.
+    
+        Returns:
+            O índice do Llama carregado a partir do arquivo json ou, no formato binário, um IndiceBinario, cujos
+            embeddings são mapeados do disco sem cópia e cujos textos são lidos apenas quando acessados.
+        """
+        if formato == 'binario':
+            return IndiceBinario(path_folder)
+        if formato != 'json':
+            raise ValueError("formato precisa ser 'json' ou 'binario'")
+
+        # Carrega o índice a partir de um arquivo json
+        from llama_index import GPTSimpleVectorIndex
+        index = GPTSimpleVectorIndex.load_from_disk(f'{path_folder}/index.json')
+        return index
+
+    @staticmethod
+    def converte_indice_json(path_folder, path_destino=None):
+        """
+        Converte o index.json de um índice do Llama para o formato binário de IndiceBinario.
+    
+        Args:
+            path_folder: O caminho para o diretório onde o arquivo index.json está salvo.
+            path_destino: O diretório onde o índice binário será salvo (padrão: o próprio path_folder).
+    
+        Returns:
+            O IndiceBinario convertido.
+        """
+        path_destino = path_destino or path_folder
+
+        # Lê o json uma única vez e salva os vetores e textos no formato binário
+        with open(f'{path_folder}/index.json', 'r') as f:
+            dicionario = json.load(f)
+        IndiceBinario.salva(path_destino, *Func._extrai_vetores(dicionario))
+        return IndiceBinario(path_destino)
+
+    @staticmethod
+    def _extrai_vetores(dicionario: dict) -> Tuple[List[str], List[str], List[List[float]], List[str]]:
+        """
+        Extrai os embeddings e os textos dos nós de um índice vetorial do Llama serializado em dicionário.
+
+        São aceitos o formato do SimpleVectorStore (embeddings em vector_store e nós no docstore) e o formato
+        anterior, em que embeddings e nós ficam no próprio index_struct.
+
+        Args:
+            dicionario: O dicionário do índice, como em index.save_to_dict() ou no index.json.
+
+        Returns:
+            Uma tupla com os ids dos nós, os ids dos documentos de origem, os embeddings e os textos dos nós.
+        """
+        estrutura = dicionario.get('index_struct', {}).get('__data__', {})
+        dados_vetores = dicionario.get('vector_store', {}).get('__data__', {}).get('simple_vector_store_data_dict')
+
+        if dados_vetores is not None:
+            # Formato do SimpleVectorStore: os textos dos nós ficam no docstore
+            embeddings = dados_vetores['embedding_dict']
+            doc_ids = dados_vetores.get('text_id_to_doc_id', {})
+            nos = dicionario.get('docstore', {}).get('docs', {})
+            ids = list(embeddings)
+            textos = [nos.get(id_no, {}).get('text') or '' for id_no in ids]
+            origens = [doc_ids.get(id_no) or nos.get(id_no, {}).get('ref_doc_id') or '' for id_no in ids]
+        else:
+            # Formato anterior: nós e embeddings ficam no index_struct
+            embeddings = estrutura.get('embeddings_dict', {})
+            nos = {str(no.get('doc_id')): no for no in estrutura.get('nodes_dict', {}).values()}
+            ids = list(embeddings)
+            textos = [nos.get(id_no, {}).get('text') or '' for id_no in ids]
+            origens = [nos.get(id_no, {}).get('ref_doc_id') or '' for id_no in ids]
+
+        return ids, origens, [embeddings[id_no] for id_no in ids], textos
+
+    @staticmethod
+    def busca_local(path_folder: str, perguntas, k: int = 5, embedder=None,
+                    n_sondas: Optional[int] = None) -> List[List[Tuple[str, float, str]]]:
+        """
+        Busca, sem chamadas a APIs, os trechos do corpus de referência mais similares a cada pergunta.
+
+        Args:
+            path_folder: O diretório do índice binário (veja Func.saver com formato='binario').
+            perguntas: Uma matriz (perguntas x dimensões) de embeddings já calculados, ou uma lista de perguntas
+                em texto, que são convertidas em embeddings por embedder.
+            k: O número de trechos retornados por pergunta.
+            embedder: Uma função que recebe uma lista de textos e retorna a matriz de seus embeddings, calculados
+                localmente com o mesmo modelo usado no índice. Obrigatória se as perguntas forem textos.
+            n_sondas: Se informado, usa a busca aproximada IVF examinando n_sondas grupos; senão, a busca exata.
+
+        Returns:
+            Para cada pergunta, uma lista de tuplas (id do documento, similaridade, texto do trecho), da mais
+            similar para a menos similar.
+        """
+        # Reutiliza a busca de cada diretório de índice durante o processo, enquanto os arquivos não forem regravados
+        versao = IndiceBinario.versao(path_folder)
+        busca = Func._buscas_locais.get(path_folder)
+        if busca is None or busca[0] != versao:
+            indice = Func.loader(path_folder, formato='binario')
+            busca = Func._buscas_locais[path_folder] = (versao, indice, BuscaVetorial(indice.embeddings))
+        _, indice, busca = busca
+
+        # Converte as perguntas em texto em embeddings
+        if len(perguntas) and isinstance(perguntas[0], str):
+            if embedder is None:
+                raise ValueError("embedder é obrigatório quando as perguntas são textos")
+            perguntas = embedder(list(perguntas))
+
+        if n_sondas is None:
+            indices, scores = busca.busca(perguntas, k)
+        else:
+            if not busca.ivf_construido:
+                busca.constroi_ivf()
+            indices, scores = busca.busca_ivf(perguntas, k, n_sondas)
+
+        return [[(indice.doc_ids[i], float(score), indice.texto(i)) for i, score in zip(linha_i, linha_s) if i >= 0]
+                for linha_i, linha_s in zip(indices.tolist(), scores.tolist())]
+
+    @staticmethod
+    def response(index, question):
+        """
+        Consulta o índice do Llama com uma pergunta e exibe a resposta.
+    
+        Args:
+            index: O índice do Llama.
+            question: A pergunta a ser consultada.
+    
+        Returns:
+            A resposta do Llama, com o texto da resposta e os nós de origem. Para avaliar muitas perguntas, use
+            Func.consulta_lote.
+        """
+        # Consulta o índice com a pergunta e armazena a resposta
+        response = index.query(f'{question}')
+
+        # Exibe a resposta
+        print(response)
+        return response
+
+    @staticmethod
+    def consulta_lote(index, perguntas: List[str], max_workers: int = 8, usar_cache: Optional[bool] = None,
+                      versao_indice: Optional[str] = None, **kwargs) -> List['ResultadoConsulta']:
+        """
+        Consulta o índice do Llama com várias perguntas em paralelo e retorna resultados estruturados.
+
+        As perguntas distintas são enviadas por um pool de no máximo max_workers threads. Cada resultado guarda a
+        resposta, os nós de origem com seus scores e o tempo da consulta. As respostas ficam em
+        Func.cache_consultas(), indexadas pela pergunta, pelos parâmetros da consulta e pela versão do índice, de
+        modo que repetir a avaliação de um questionário sobre o mesmo índice não gera novas chamadas à API.
+
+        Args:
+            index: O índice do Llama.
+            perguntas: As perguntas a serem consultadas.
+            max_workers: O número máximo de consultas simultâneas.
+            usar_cache: Se True, consulta e atualiza o cache de respostas. Se None, o cache é usado exatamente
+                quando versao_indice é informada.
+            versao_indice: Um identificador da versão do índice, obrigatório com usar_cache=True. Para um índice
+                salvo em disco, use Func.versao_indice(path_index).
+            **kwargs: Parâmetros adicionais repassados a index.query (por exemplo, similarity_top_k).
+
+        Returns:
+            Uma lista de ResultadoConsulta, na ordem das perguntas.
+
+        Raises:
+            ValueError: Se usar_cache for True e versao_indice não for informada.
+        """
+        if usar_cache is None:
+            usar_cache = versao_indice is not None
+        if usar_cache and versao_indice is None:
+            raise ValueError("versao_indice é obrigatória com usar_cache=True (veja Func.versao_indice)")
+
+        def consulta(pergunta):
+            chave = CacheSQLite.chave('consulta', versao_indice, pergunta, kwargs)
+            if usar_cache:
+                guardado = Func.cache_consultas().get(chave)
+                if guardado is not None:
+                    guardado['fontes'] = [tuple(fonte) for fonte in guardado['fontes']]
+                    return ResultadoConsulta(**dict(guardado, do_cache=True))
+
+            # Consulta o índice e mede o tempo da consulta
+            inicio = time.perf_counter()
+            response = index.query(f'{pergunta}', **kwargs)
+            segundos = time.perf_counter() - inicio
+
+            resultado = ResultadoConsulta(pergunta, str(response.response or ''), Func._fontes(response), segundos,
+                                          False)
+            if usar_cache:
+                Func.cache_consultas().set(chave, resultado._asdict())
+            return resultado
+
+        # Perguntas repetidas no lote são consultadas uma única vez
+        unicas = list(dict.fromkeys(perguntas))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            resultados = dict(zip(unicas, executor.map(consulta, unicas)))
+        return [resultados[pergunta] for pergunta in perguntas]
+
+    @staticmethod
+    def versao_indice(path_index: str) -> str:
+        """
+        Identifica a versão de um índice salvo em disco, para uso como versao_indice em Func.consulta_lote.
+
+        Args:
+            path_index: O diretório do índice.
+
+        Returns:
+            O hash SHA-256 do manifesto.json mantido por Func.indexa_incremental ou, se o índice não tiver
+            manifesto, o hash do index.json, lido em blocos do disco.
+        """
+        caminho = os.path.join(path_index, 'manifesto.json')
+        if not os.path.exists(caminho):
+            caminho = os.path.join(path_index, 'index.json')
+
+        with open(caminho, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest() \
+                if hasattr(hashlib, 'file_digest') else hashlib.sha256(f.read()).hexdigest()
+
+    @staticmethod
+    def _fontes(response) -> List[Tuple[str, Optional[float], str]]:
+        """
+        Extrai os nós de origem de uma resposta do Llama.
+
+        Args:
+            response: A resposta de index.query.
+
+        Returns:
+            Uma lista de tuplas (id do documento, score, texto do nó).
+        """
+        fontes = []
+        for fonte in getattr(response, 'source_nodes', None) or []:
+            # NodeWithScore (node, score) ou, nas versões anteriores, SourceNode (source_text, doc_id, similarity)
+            no = getattr(fonte, 'node', None)
+            if no is not None:
+                doc_id = getattr(no, 'ref_doc_id', None) or getattr(no, 'doc_id', None)
+                texto = getattr(no, 'text', None)
+                score = getattr(fonte, 'score', None)
+            else:
+                doc_id = getattr(fonte, 'doc_id', None)
+                texto = getattr(fonte, 'source_text', None)
+                score = getattr(fonte, 'similarity', None)
+            fontes.append((str(doc_id or ''), float(score) if score is not None else None, texto or ''))
+        return fontes
+
+    @staticmethod
+    def cache_consultas() -> 'CacheSQLite':
+        """
+        Retorna o cache persistente das respostas de Func.consulta_lote, criando-o na primeira chamada.
+
+        O cache fica no arquivo consultas.sqlite da pasta de cache (veja Func.cache_resumos), sem validade, pois a
+        versão do índice já faz parte da chave, e com no máximo 100 mil respostas.
+
+        Returns:
+            O CacheSQLite das consultas.
+        """
+        if Func._cache_consultas is None:
+            Func._cache_consultas = CacheSQLite(os.path.join(Func._pasta_cache(), 'consultas.sqlite'),
+                                                max_entradas=100_000)
+        return Func._cache_consultas
+
+    @staticmethod
+    def summarize_text_simple(text, usar_cache=True):
+        """
+        Função que usa a API gratuita do ChatGPT para resumir um texto.
+    
+        Args:
+        text (str): O texto a ser resumido.
+        usar_cache (bool): Se True, reutiliza a resposta guardada em Func.cache_resumos() para o mesmo prompt e
+        os mesmos parâmetros, em vez de chamar a API novamente (padrão: True).
+    
+        Returns:
+        O resumo do texto, gerado pela API do ChatGPT.
+        """
+        # Configura o modelo e o prompt de entrada para a API
+        model_engine = "text-davinci-002"
+        prompt = f"Please summarize the following text:\n\n{text}\n\nSummary:"
+
+        # Gera a saída usando a API do ChatGPT, ou o cache
+        response = Func._completion(
+            usar_cache,
+            engine=model_engine,
+            prompt=prompt,
+            max_tokens=1024,
+            n=1,
+            stop=None,
+            temperature=0.5,
+        )
+
+        # Extrai o resumo da resposta da API
+        summary = response.choices[0].text.strip()
+
+        return summary
+
+    @staticmethod
+    def summarize_text_full(text, engine="text-davinci-002", prompt_prefix="Please summarize the following text:\n\n", prompt_suffix="\n\nSummary:", max_tokens=1024, n=1, stop=None, temperature=0.5, usar_cache=True):
+        """
+        Função que usa a API gratuita do ChatGPT para resumir um texto.
+    
+        Args:
+        text (str): O texto a ser resumido.
+        engine (str): O mecanismo do modelo a ser usado na API do ChatGPT (padrão: "text-davinci-002").
+        prompt_prefix (str): O prefixo do prompt de entrada para a API (padrão: "Please summarize the following text:\n\n").
+        prompt_suffix (str): O sufixo do prompt de entrada para a API (padrão: "\n\nSummary:").
+        max_tokens (int): O número máximo de tokens permitidos na resposta (padrão: 1024).
+        n (int): O número de respostas a serem geradas pela API (padrão: 1).
+        stop (str or List[str]): Uma string ou lista de strings que indica onde parar a geração da resposta (padrão: None).
+        temperature (float): Controla a aleatoriedade da geração de texto pela API (padrão: 0.5).
+        usar_cache (bool): Se True, reutiliza a resposta guardada em Func.cache_resumos() para o mesmo prompt e
+        os mesmos parâmetros, em vez de chamar a API novamente (padrão: True).
+    
+        Returns:
+        O resumo do texto, gerado pela API do ChatGPT.
+        """
+    
+        # Monta o prompt de entrada para a API, com o texto fornecido
+        prompt = f"{prompt_prefix}{text}{prompt_suffix}"
+    
+        # Gera a saída usando a API do ChatGPT, ou o cache
+        response = Func._completion(
+            usar_cache,
+            engine=engine,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            n=n,
+            stop=stop,
+            temperature=temperature,
+        )
+    
+        # Extrai o resumo da resposta da API
+        summary = response.choices[0].text.strip()
+    
+        return summary, response
+
+    @staticmethod
+    def _completion(usar_cache: bool, **parametros):
+        """
+        Chama openai.Completion.create, consultando antes o cache persistente de respostas.
+
+        A chave do cache é o hash do prompt, do mecanismo e de todos os demais parâmetros da chamada, de modo que
+        qualquer alteração em um deles gera uma nova chamada à API.
+
+        Args:
+            usar_cache: Se False, chama a API sem consultar nem atualizar o cache.
+            **parametros: Os parâmetros repassados a openai.Completion.create.
+
+        Returns:
+            A resposta da API (OpenAIObject), lida do cache ou recebida da API.
+        """
+        import openai
+
+        if not usar_cache:
+            return openai.Completion.create(**parametros)
+
+        response = Func._resposta_em_cache(parametros)
+        if response is None:
+            response = openai.Completion.create(**parametros)
+            Func._guarda_resposta(parametros, response)
+        return response
+
+    @staticmethod
+    def _resposta_em_cache(parametros: dict):
+        """
+        Procura no cache de respostas a resposta de uma chamada a openai.Completion.create.
+
+        Args:
+            parametros: Os parâmetros da chamada.
+
+        Returns:
+            A resposta guardada (OpenAIObject) ou None, se não houver resposta válida no cache.
+        """
+        import openai
+
+        resposta = Func.cache_resumos().get(CacheSQLite.chave('completion', parametros))
+        return openai.util.convert_to_openai_object(resposta) if resposta is not None else None
+
+    @staticmethod
+    def _guarda_resposta(parametros: dict, response) -> None:
+        """
+        Guarda no cache de respostas a resposta de uma chamada a openai.Completion.create.
+
+        Args:
+            parametros: Os parâmetros da chamada.
+            response: A resposta recebida da API.
+        """
+        Func.cache_resumos().set(CacheSQLite.chave('completion', parametros), response.to_dict_recursive())
+
+    @staticmethod
+    def summarize_texts(textos: List[str], **kwargs) -> List[Tuple[str, object]]:
+        """
+        Resume vários textos com chamadas concorrentes à API do ChatGPT. Versão síncrona de
+        Func.summarize_texts_async; em ambientes que já têm um laço de eventos em execução (como o Jupyter), use
+        diretamente `await Func.summarize_texts_async(...)`.
+
+        Args:
+            textos: Os textos a serem resumidos.
+            **kwargs: Os parâmetros de Func.summarize_texts_async.
+
+        Returns:
+            Uma lista de tuplas (resumo, resposta da API), na ordem dos textos.
+        """
+        return asyncio.run(Func.summarize_texts_async(textos, **kwargs))
+
+    @staticmethod
+    async def summarize_texts_async(textos: List[str], engine="text-davinci-002",
+                                    prompt_prefix="Please summarize the following text:\n\n",
+                                    prompt_suffix="\n\nSummary:", max_tokens=1024, n=1, stop=None, temperature=0.5,
+                                    concorrencia: int = 8, tokens_por_minuto: Optional[int] = 90_000,
+                                    tentativas: int = 6, espera_inicial: float = 1.0, usar_cache: bool = True,
+                                    retorna_excecoes: bool = False) -> List[Tuple[str, object]]:
+        """
+        Resume vários textos com chamadas assíncronas e concorrentes à API do ChatGPT.
+
+        No máximo `concorrencia` chamadas ficam em andamento ao mesmo tempo e o total de tokens enviados por minuto
+        (prompt mais max_tokens) é limitado por um LimitadorTokens. As chamadas que falharem com erro 429 ou 5xx,
+        tempo esgotado ou falha de conexão são repetidas com espera exponencial. As respostas já presentes em
+        Func.cache_resumos() não geram chamadas.
+
+        Args:
+            textos: Os textos a serem resumidos.
+            engine, prompt_prefix, prompt_suffix, max_tokens, n, stop, temperature: Como em Func.summarize_text_full.
+            concorrencia: O número máximo de chamadas simultâneas.
+            tokens_por_minuto: O limite de tokens por minuto; None para não limitar.
+            tentativas: O número máximo de tentativas de cada chamada.
+            espera_inicial: A espera, em segundos, antes da segunda tentativa; dobra a cada nova tentativa.
+            usar_cache: Se True, consulta e atualiza o cache de respostas.
+            retorna_excecoes: Se True, o erro de um texto é colocado na posição dele na lista de resultados em vez
+                              de interromper o lote.
+
+        Returns:
+            Uma lista de tuplas (resumo, resposta da API), na ordem dos textos.
+        """
+        semaforo = asyncio.Semaphore(concorrencia)
+        limitador = LimitadorTokens(tokens_por_minuto) if tokens_por_minuto else None
+
+        async def resume(texto):
+            parametros = dict(engine=engine, prompt=f"{prompt_prefix}{texto}{prompt_suffix}", max_tokens=max_tokens,
+                              n=n, stop=stop, temperature=temperature)
+
+            response = Func._resposta_em_cache(parametros) if usar_cache else None
+            if response is None:
+                async with semaforo:
+                    if limitador is not None:
+                        await limitador.adquire(Func.conta_tokens(parametros['prompt'], engine) + max_tokens * n)
+                    response = await Func._acompletion_com_retentativas(parametros, tentativas, espera_inicial)
+                if usar_cache:
+                    Func._guarda_resposta(parametros, response)
+
+            return response.choices[0].text.strip(), response
+
+        # gather mantém os resultados na ordem dos textos
+        return await asyncio.gather(*(resume(texto) for texto in textos), return_exceptions=retorna_excecoes)
+
+    @staticmethod
+    def summarize_text_hierarquico(text: str, **kwargs) -> str:
+        """
+        Resume um texto maior que o contexto do modelo em etapas de mapeamento e redução. Versão síncrona de
+        Func.summarize_text_hierarquico_async; em ambientes que já têm um laço de eventos em execução (como o
+        Jupyter), use diretamente `await Func.summarize_text_hierarquico_async(...)`.
+
+        Args:
+            text: O texto a ser resumido.
+            **kwargs: Os parâmetros de Func.summarize_text_hierarquico_async.
+
+        Returns:
+            O resumo do texto.
+        """
+        return asyncio.run(Func.summarize_text_hierarquico_async(text, **kwargs))
+
+    @staticmethod
+    async def summarize_text_hierarquico_async(text: str, engine="text-davinci-002",
+                                               prompt_prefix="Please summarize the following text:\n\n",
+                                               prompt_suffix="\n\nSummary:",
+                                               prompt_reducao_prefix="Please combine the following partial "
+                                                                     "summaries into a single summary:\n\n",
+                                               max_tokens: int = 512, tamanho_bloco: int = 2500,
+                                               sobreposicao: int = 200, limite_contexto: int = 4097,
+                                               max_niveis: int = 8, **kwargs) -> str:
+        """
+        Resume um texto maior que o contexto do modelo em etapas de mapeamento e redução.
+
+        Se o prompt com o texto inteiro couber no contexto, o texto é resumido em uma única chamada. Caso contrário,
+        o texto é dividido por Func.divide_em_blocos, os blocos são resumidos em paralelo (mapeamento) e os resumos
+        parciais são unidos e resumidos novamente (redução), em quantos níveis forem necessários.
+
+        Os limites dos blocos dependem apenas do conteúdo das frases próximas, e não da posição no texto, e as
+        respostas ficam no cache de Func.cache_resumos(). Assim, ao resumir novamente um documento editado,
+        apenas os blocos que mudaram (e os resumos dos níveis acima deles) geram novas chamadas à API.
+
+        Args:
+            text: O texto a ser resumido.
+            engine: O mecanismo do modelo (padrão: "text-davinci-002").
+            prompt_prefix: O prefixo do prompt de resumo dos blocos do texto original.
+            prompt_suffix: O sufixo do prompt, usado em todos os níveis.
+            prompt_reducao_prefix: O prefixo do prompt usado para resumir os resumos parciais.
+            max_tokens: O número máximo de tokens de cada resumo.
+            tamanho_bloco: O número máximo de tokens de cada bloco, sem contar a sobreposição.
+            sobreposicao: O número máximo de tokens repetidos do final de um bloco no início do bloco seguinte.
+            limite_contexto: O tamanho do contexto do modelo, em tokens (prompt mais resposta).
+            max_niveis: O número máximo de níveis de redução.
+            **kwargs: Outros parâmetros de Func.summarize_texts_async (concorrencia, tokens_por_minuto,
+                      temperature, usar_cache...).
+
+        Returns:
+            O resumo do texto.
+
+        Raises:
+            ValueError: Se os blocos, com a sobreposição, o prompt e a resposta, não couberem no contexto, ou se os
+                        blocos não forem maiores que os resumos.
+            RuntimeError: Se o resumo não couber no contexto após max_niveis níveis.
+        """
+        # Verifica se cada bloco, com a sobreposição, o prompt e a resposta, cabe no contexto do modelo
+        excesso = max(Func.conta_tokens(prefixo + prompt_suffix, engine)
+                      for prefixo in (prompt_prefix, prompt_reducao_prefix))
+        if tamanho_bloco + sobreposicao + excesso + max_tokens > limite_contexto:
+            raise ValueError("tamanho_bloco, sobreposicao e max_tokens não cabem em limite_contexto")
+        if tamanho_bloco <= max_tokens:
+            raise ValueError("tamanho_bloco precisa ser maior que max_tokens para que os resumos diminuam o texto")
+
+        prefixo = prompt_prefix
+        for _ in range(max_niveis):
+            # Se o texto já couber no contexto, faz a redução final
+            if Func.conta_tokens(f"{prefixo}{text}{prompt_suffix}", engine) + max_tokens <= limite_contexto:
+                (resumo, _), = await Func.summarize_texts_async(
+                    [text], engine=engine, prompt_prefix=prefixo, prompt_suffix=prompt_suffix, max_tokens=max_tokens,
+                    **kwargs)
+                return resumo
+
+            # Mapeamento: resume os blocos em paralelo
+            blocos = Func.divide_em_blocos(text, tamanho_bloco, sobreposicao, engine)
+            resultados = await Func.summarize_texts_async(
+                blocos, engine=engine, prompt_prefix=prefixo, prompt_suffix=prompt_suffix, max_tokens=max_tokens,
+                **kwargs)
+
+            # Redução: os resumos parciais formam o texto do próximo nível
+            text = '\n\n'.join(resumo for resumo, _ in resultados)
+            prefixo = prompt_reducao_prefix
+
+        raise RuntimeError(f"O resumo não coube no contexto após {max_niveis} níveis de redução")
+
+    @staticmethod
+    def divide_em_blocos(texto: str, tamanho_bloco: int, sobreposicao: int = 0,
+                         engine: str = "text-davinci-002") -> List[str]:
+        """
+        Divide um texto em blocos de no máximo tamanho_bloco tokens, cortados entre frases.
+
+        Os cortes são definidos pelo conteúdo: depois que um bloco atinge metade do tamanho, ele termina na primeira
+        frase cujo hash seja múltiplo de um divisor fixo (ou quando a próxima frase não couber). Por isso, uma
+        edição no texto só altera os blocos vizinhos a ela; os demais blocos continuam idênticos e suas respostas
+        são reaproveitadas do cache.
+
+        Args:
+            texto: O texto a ser dividido.
+            tamanho_bloco: O número máximo de tokens de cada bloco, sem contar a sobreposição.
+            sobreposicao: O número máximo de tokens das últimas frases de um bloco repetidos no início do seguinte.
+            engine: O modelo cujo tokenizador é usado na contagem.
+
+        Returns:
+            A lista de blocos, na ordem do texto.
+        """
+        # Divide o texto em frases, quebrando as frases maiores que o bloco
+        frases = []
+        for frase in Func._REGEX_FRASES.split(texto):
+            palavras = frase.split()
+            if not palavras:
+                continue
+            tokens = Func.conta_tokens(frase, engine)
+            partes = -(-tokens // tamanho_bloco)
+            passo = -(-len(palavras) // partes)
+            for inicio in range(0, len(palavras), passo):
+                parte = ' '.join(palavras[inicio:inicio + passo])
+                frases.append((parte, Func.conta_tokens(parte, engine) if partes > 1 else tokens))
+
+        # Divisor fixo para que os blocos tenham, em média, o tamanho pedido (frases de ~25 tokens)
+        divisor = max(1, tamanho_bloco // 50)
+
+        blocos = []
+        atual = []
+        tokens_atual = 0
+        for i, (frase, tokens) in enumerate(frases):
+            atual.append((frase, tokens))
+            tokens_atual += tokens
+
+            proxima = frases[i + 1][1] if i + 1 < len(frases) else 0
+            marco = int.from_bytes(hashlib.blake2b(frase.encode('utf-8'), digest_size=8).digest(), 'big') % divisor == 0
+            if i + 1 == len(frases) or tokens_atual + proxima > tamanho_bloco or \
+                    (tokens_atual >= tamanho_bloco // 2 and marco):
+                blocos.append(atual)
+                atual = []
+                tokens_atual = 0
+
+        # Acrescenta a cada bloco as últimas frases do bloco anterior, até o limite da sobreposição
+        textos = []
+        for i, bloco in enumerate(blocos):
+            repetidas = []
+            tokens_repetidos = 0
+            for frase, tokens in reversed(blocos[i - 1] if i > 0 else []):
+                if tokens_repetidos + tokens > sobreposicao:
+                    break
+                repetidas.insert(0, frase)
+                tokens_repetidos += tokens
+            textos.append(' '.join(repetidas + [frase for frase, _ in bloco]))
+
+        return textos
+
+    @staticmethod
+    async def _acompletion_com_retentativas(parametros: dict, tentativas: int, espera_inicial: float):
+        """
+        Chama openai.Completion.acreate, repetindo a chamada nos erros transitórios.
+
+        Args:
+            parametros: Os parâmetros da chamada.
+            tentativas: O número máximo de tentativas.
+            espera_inicial: A espera, em segundos, antes da segunda tentativa; dobra a cada nova tentativa.
+
+        Returns:
+            A resposta da API.
+
+        Raises:
+            openai.error.OpenAIError: O erro da última tentativa, ou qualquer erro não transitório.
+        """
+        import openai
+
+        for tentativa in range(tentativas):
+            try:
+                return await openai.Completion.acreate(**parametros)
+            except (openai.error.Timeout, openai.error.APIConnectionError, openai.error.RateLimitError,
+                    openai.error.ServiceUnavailableError, openai.error.APIError) as e:
+                status = getattr(e, 'http_status', None)
+                transitorio = status is None or status == 429 or status >= 500
+                if not transitorio or tentativa == tentativas - 1:
+                    raise
+
+                # Respeita o cabeçalho Retry-After, se houver; senão, espera exponencial com variação aleatória
+                retry_after = (getattr(e, 'headers', None) or {}).get('retry-after')
+                try:
+                    espera = float(retry_after)
+                except (TypeError, ValueError):
+                    espera = espera_inicial * 2 ** tentativa * (1 + random.random())
+                await asyncio.sleep(min(espera, 60.0))
+
+    @staticmethod
+    def conta_tokens(texto: str, engine: str = "text-davinci-002") -> int:
+        """
+        Conta os tokens de um texto segundo o tokenizador do modelo.
+
+        Usa o tiktoken, se estiver instalado; caso contrário, estima um token a cada quatro caracteres.
+
+        Args:
+            texto: O texto cujos tokens serão contados.
+            engine: O modelo cujo tokenizador será usado.
+
+        Returns:
+            O número de tokens do texto.
+        """
+        codificador = Func._codificador_tokens(engine)
+        if codificador is None:
+            return len(texto) // 4 + 1
+        return len(codificador.encode(texto, disallowed_special=()))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _codificador_tokens(engine: str):
+        """
+        Retorna o codificador do tiktoken de um modelo, carregado uma única vez por modelo.
+
+        Args:
+            engine: O nome do modelo.
+
+        Returns:
+            O codificador do tiktoken, ou None se o tiktoken não estiver instalado.
+        """
+        try:
+            import tiktoken
+        except ImportError:
+            return None
+        try:
+            return tiktoken.encoding_for_model(engine)
+        except KeyError:
+            return tiktoken.get_encoding('cl100k_base')
+
+    @staticmethod
+    def cache_resumos() -> 'CacheSQLite':
+        """
+        Retorna o cache persistente de respostas da API do ChatGPT, criando-o na primeira chamada.
+
+        Se o cache não tiver sido configurado com Func.configura_cache_resumos, é usado o arquivo resumos.sqlite na
+        pasta indicada pela variável de ambiente MOSCOVICI_CACHE_DIR (padrão: ~/.cache/moscovici_representations).
+
+        Returns:
+            O CacheSQLite usado por Func.summarize_text_simple e Func.summarize_text_full.
+        """
+        if Func._cache_resumos is None:
+            Func.configura_cache_resumos()
+        return Func._cache_resumos
+
+    @staticmethod
+    def configura_cache_resumos(caminho: Optional[str] = None, ttl: Optional[float] = 30 * 24 * 3600,
+                                max_entradas: Optional[int] = 100_000) -> 'CacheSQLite':
+        """
+        Configura o cache persistente de respostas da API do ChatGPT.
+
+        Args:
+            caminho: O arquivo SQLite do cache (padrão: resumos.sqlite na pasta de cache, veja Func.cache_resumos).
+            ttl: A validade de cada resposta em segundos (padrão: 30 dias); None para respostas sem validade.
+            max_entradas: O número máximo de respostas guardadas; as menos usadas recentemente são descartadas
+                          primeiro. None para não limitar.
+
+        Returns:
+            O novo CacheSQLite.
+        """
+        if caminho is None:
+            caminho = os.path.join(Func._pasta_cache(), 'resumos.sqlite')
+        Func._cache_resumos = CacheSQLite(caminho, ttl=ttl, max_entradas=max_entradas)
+        return Func._cache_resumos
+
+    @staticmethod
+    def _pasta_cache() -> str:
+        """
+        Retorna a pasta onde os caches persistentes são guardados.
+
+        Returns:
+            O valor da variável de ambiente MOSCOVICI_CACHE_DIR ou, se ela não existir,
+            ~/.cache/moscovici_representations.
+        """
+        return os.getenv('MOSCOVICI_CACHE_DIR',
+                         os.path.join(os.path.expanduser('~'), '.cache', 'moscovici_representations'))
+
+    @staticmethod
+    def cleaner(text, lang_code_short, ngramas: bool = False):
+        """
+        Recebe um texto e um código de idioma, realiza a limpeza do texto e retorna trigramas, bigramas,
+        lista de palavras filtradas, lista de hapaxes e uma segunda versão da lista filtrada sem hapaxes.
+
+        Args:
+            text (str ou Iterable[str]): Texto a ser limpo, ou um iterável de documentos (por exemplo, os textos
+                produzidos por Func.le_corpus), tokenizados um a um.
+            lang_code_short (str): Código de idioma de duas letras.
+            ngramas (bool): Se True, cria as listas de trigramas e bigramas. Por padrão, eles são retornados como
+                iteradores preguiçosos (Func.ngramas), que só geram os n-gramas quando percorridos; as frequências
+                dos n-gramas podem ser obtidas diretamente com Func.conta_ngramas.
+
+        Returns:
+            tuple: Uma tupla contendo os trigramas, os bigramas (listas, se ngramas for True, ou iteradores), uma
+            lista de palavras filtradas, uma lista de hapaxes e uma lista de palavras filtradas sem hapaxes.
+        """
+        # Tokenização e filtragem do texto, documento a documento
+        textos = [text] if isinstance(text, str) else text
+        filtered_word, word_counts = Func._limpa_bloco(textos, lang_code_short)
+
+        return Func._finaliza_limpeza(filtered_word, word_counts, ngramas)
+
+    @staticmethod
+    def cleaner_compacto(text, lang_code_short: str, por_linha: bool = False) -> CorpusCompacto:
+        """
+        Realiza a mesma limpeza de Func.cleaner, mas retorna o corpus como um CorpusCompacto, com as palavras de
+        cada documento codificadas como inteiros.
+
+        Args:
+            text (str ou Iterable[str]): Texto a ser limpo, ou um iterável de documentos.
+            lang_code_short (str): Código de idioma de duas letras.
+            por_linha (bool): Se True, cada linha de um texto é um documento (por exemplo, a resposta de um
+                respondente, para Func.calcula_ome com por_respondente=True).
+
+        Returns:
+            Um CorpusCompacto com um documento por texto (ou por linha). CorpusCompacto.palavras_filtradas,
+            CorpusCompacto.hapaxes e CorpusCompacto.sem_hapaxes reproduzem as listas de Func.cleaner.
+        """
+        if isinstance(text, str):
+            textos = text.splitlines() if por_linha else [text]
+        else:
+            textos = text
+        return CorpusCompacto.constroi(Func._filtra_palavras([texto], lang_code_short) for texto in textos)
+
+    @staticmethod
+    def cleaner_paralelo(text, lang_code_short: str, n_processos: Optional[int] = None,
+                         tamanho_bloco: int = 1_000_000, ngramas: bool = False) -> Tuple:
+        """
+        Versão paralela de Func.cleaner: divide o corpus em blocos e limpa os blocos em vários processos.
+
+        O texto é dividido em quebras de linha (ou, na falta delas, em espaços) e os documentos de um iterável são
+        agrupados em blocos de aproximadamente tamanho_bloco caracteres. Cada processo tokeniza e filtra seus
+        blocos; os Counters dos blocos são então somados e os hapaxes e a lista sem hapaxes são calculados com
+        consultas a conjuntos.
+
+        Args:
+            text (str ou Iterable[str]): Texto a ser limpo, ou um iterável de documentos.
+            lang_code_short (str): Código de idioma de duas letras.
+            n_processos (int): Número de processos (padrão: número de núcleos da máquina).
+            tamanho_bloco (int): Número aproximado de caracteres de cada bloco enviado a um processo.
+            ngramas (bool): Se True, cria as listas de trigramas e bigramas, como em Func.cleaner.
+
+        Returns:
+            tuple: A mesma tupla retornada por Func.cleaner.
+        """
+        # Divide o corpus em blocos de documentos
+        blocos = Func._blocos_corpus([text] if isinstance(text, str) else text, tamanho_bloco)
+
+        # Limpa os blocos em paralelo, mantendo a ordem do corpus
+        filtered_word = []
+        word_counts = Counter()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=n_processos) as executor:
+            for palavras, contagem in executor.map(Func._limpa_bloco, blocos, itertools.repeat(lang_code_short)):
+                filtered_word.extend(palavras)
+                word_counts.update(contagem)
+
+        return Func._finaliza_limpeza(filtered_word, word_counts, ngramas)
+
+    @staticmethod
+    def _blocos_corpus(textos: Iterable[str], tamanho_bloco: int) -> Iterator[List[str]]:
+        """
+        Agrupa os documentos de um corpus em blocos de aproximadamente tamanho_bloco caracteres. Documentos maiores
+        que o bloco são divididos em quebras de linha.
+
+        Args:
+            textos: Os documentos do corpus.
+            tamanho_bloco: O número aproximado de caracteres de cada bloco.
+
+        Returns:
+            Um gerador de blocos, cada um uma lista de textos.
+        """
+        bloco = []
+        tamanho = 0
+        for texto in textos:
+            for parte in Func._blocos_texto(texto, tamanho_bloco, preferir_linhas=True):
+                bloco.append(parte)
+                tamanho += len(parte)
+                if tamanho >= tamanho_bloco:
+                    yield bloco
+                    bloco = []
+                    tamanho = 0
+        if bloco:
+            yield bloco
+
+    @staticmethod
+    def _limpa_bloco(textos: Iterable[str], lang_code_short: str) -> Tuple[List[str], Counter]:
+        """
+        Tokeniza e filtra um bloco de documentos. É a etapa de Func.cleaner executada em cada processo por
+        Func.cleaner_paralelo.
+
+        Args:
+            textos: Os documentos do bloco.
+            lang_code_short: Código de idioma de duas letras.
+
+        Returns:
+            Uma tupla com a lista de palavras filtradas e um Counter com a frequência de cada palavra.
+        """
+        filtered_word = list(Func._filtra_palavras(textos, lang_code_short))
+        return filtered_word, Counter(filtered_word)
+
+    @staticmethod
+    def _filtra_palavras(textos: Iterable[str], lang_code_short: str) -> Iterator[str]:
+        """
+        Tokeniza os documentos e gera as palavras que passam pelos filtros de Func.cleaner.
+
+        Args:
+            textos: Os documentos.
+            lang_code_short: Código de idioma de duas letras.
+
+        Returns:
+            Um gerador das palavras filtradas, na ordem do texto.
+        """
+        import nltk
+
+        # Tokenização do texto, documento a documento
+        text_tokens = (token for texto in textos
+                       for token in nltk.tokenize.word_tokenize(texto, language=lang_code_short))
+
+        # Definição das stopwords, carregadas uma única vez por idioma
+        stopwords = Func._stopwords(lang_code_short)
+
+        # Remoção das stopwords e dos caracteres especiais
+        filtered_word_0 = (word.lower() for word in text_tokens)
+        filtered_word_0 = (word for word in filtered_word_0
+                           if word not in stopwords and word not in Func._CARACTERES_ESPECIAIS)
+
+        # Remoção dos números e das palavras com menos de dois caracteres
+        filtered_word_1 = (Func._REGEX_NUMEROS.sub('', word) for word in filtered_word_0)
+        return (word for word in filtered_word_1 if len(word) >= 2)
+
+    @staticmethod
+    def _finaliza_limpeza(filtered_word: List[str], word_counts: Counter, ngramas: bool = False) -> Tuple:
+        """
+        Calcula os n-gramas, os hapaxes e a lista sem hapaxes a partir das palavras filtradas.
+
+        Args:
+            filtered_word: A lista de palavras filtradas do corpus, na ordem do texto.
+            word_counts: A frequência de cada palavra de filtered_word.
+            ngramas: Se False, os trigramas e bigramas são retornados como iteradores preguiçosos, sem criar as
+                listas.
+
+        Returns:
+            tuple: A mesma tupla retornada por Func.cleaner.
+        """
+        # Trigramas e bigramas: iteradores que não custam nada até serem percorridos, ou listas, se solicitadas
+        output_tri = Func.ngramas(filtered_word, 3)
+        output_bi = Func.ngramas(filtered_word, 2)
+        if ngramas:
+            output_tri, output_bi = list(output_tri), list(output_bi)
+
+        # Criação das listas de palavras únicas e palavras sem hapaxes
+        hapaxes = [word for word in word_counts if word_counts[word] == 1]
+        conjunto_hapaxes = set(hapaxes)
+        filtered_word_no_hap = [word for word in filtered_word if word not in conjunto_hapaxes]
+
+        return output_tri, output_bi, filtered_word, hapaxes, filtered_word_no_hap
+
+    @staticmethod
+    def ngramas(palavras: Iterable[str], n: int = 2) -> Iterator[Tuple[str, ...]]:
+        """
+        Gera os n-gramas de uma sequência de palavras de forma preguiçosa, sem criar a lista de n-gramas.
+
+        Args:
+            palavras: A sequência de palavras, como a lista de palavras filtradas de Func.cleaner.
+            n: O tamanho dos n-gramas.
+
+        Returns:
+            Um iterador de tuplas com n palavras consecutivas, na ordem do texto.
+        """
+        if n < 1:
+            raise ValueError("n precisa ser maior ou igual a 1")
+
+        # Cria n iteradores sobre as palavras, cada um adiantado em uma posição, e os percorre juntos
+        iteradores = itertools.tee(palavras, n)
+        for deslocamento, iterador in enumerate(iteradores):
+            next(itertools.islice(iterador, deslocamento, deslocamento), None)
+        return zip(*iteradores)
+
+    @staticmethod
+    def conta_ngramas(palavras: Union[Iterable[str], CorpusCompacto], n: int = 2,
+                      top_k: Optional[int] = None) -> List[Tuple[Tuple[str, ...], int]]:
+        """
+        Conta os n-gramas de uma sequência de palavras usando códigos inteiros em vetores NumPy.
+
+        As palavras são codificadas como inteiros e os n-gramas são janelas sobre o vetor de códigos, contadas com
+        np.unique, de modo que nenhuma tupla de strings é criada além das retornadas.
+
+        Args:
+            palavras: A sequência de palavras, como a lista de palavras filtradas de Func.cleaner, ou um
+                CorpusCompacto, cujos códigos são usados diretamente (os n-gramas atravessam os limites entre
+                documentos, como na lista filtrada).
+            n: O tamanho dos n-gramas.
+            top_k: Se informado, retorna apenas os top_k n-gramas mais frequentes.
+
+        Returns:
+            Uma lista de tuplas (n-grama, frequência), da mais frequente para a menos frequente, na mesma ordem de
+            Counter.most_common (os empates seguem a ordem da primeira ocorrência no texto).
+        """
+        if n < 1:
+            raise ValueError("n precisa ser maior ou igual a 1")
+
+        # Codifica as palavras como inteiros
+        if isinstance(palavras, CorpusCompacto):
+            palavras_vocabulario = palavras.palavras
+            codigos = palavras.tokens.astype(np.int64)
+        else:
+            vocabulario = {}
+            codigos = np.fromiter((vocabulario.setdefault(palavra, len(vocabulario)) for palavra in palavras),
+                                  dtype=np.int64)
+            palavras_vocabulario = list(vocabulario)
+        if len(codigos) < n:
+            return []
+        janelas = np.lib.stride_tricks.sliding_window_view(codigos, n)
+
+        # Conta as janelas distintas, empacotando cada janela em um único inteiro quando o vocabulário permite
+        if len(palavras_vocabulario) ** n < 2 ** 63:
+            chaves = janelas @ (len(palavras_vocabulario) ** np.arange(n - 1, -1, -1, dtype=np.int64))
+            _, primeiras, contagens = np.unique(chaves, return_index=True, return_counts=True)
+        else:
+            _, primeiras, contagens = np.unique(janelas, axis=0, return_index=True, return_counts=True)
+
+        # Seleciona os top_k mais frequentes, incluindo todos os empatados no limite
+        if top_k is not None and top_k < len(contagens):
+            if top_k <= 0:
+                return []
+            limite = np.partition(contagens, len(contagens) - top_k)[len(contagens) - top_k]
+            selecionados = np.flatnonzero(contagens >= limite)
+            primeiras = primeiras[selecionados]
+            contagens = contagens[selecionados]
+
+        # Ordena por frequência decrescente e, nos empates, pela primeira ocorrência
+        ordem = np.lexsort((primeiras, -contagens))[:top_k]
+        return [(tuple(palavras_vocabulario[codigo] for codigo in janelas[primeiras[i]].tolist()), int(contagens[i]))
+                for i in ordem.tolist()]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _stopwords(lang_code_short: str) -> frozenset:
+        """
+        Retorna as stopwords do NLTK de um idioma, lidas do disco apenas na primeira chamada de cada processo.
+
+        Args:
+            lang_code_short: O nome do idioma no NLTK, como 'portuguese'.
+
+        Returns:
+            Um conjunto imutável com as stopwords do idioma.
+        """
+        import nltk
+
+        return frozenset(nltk.corpus.stopwords.words(lang_code_short))
+
+    @staticmethod
+    def entities(texto, lang_code: Optional[str] = None, tamanho_bloco: int = 2000):
+        """
+        Função que extrai entidades nomeadas de um texto e identifica o idioma do texto.
+
+        Se o idioma não for informado, o texto é dividido em blocos de cerca de tamanho_bloco caracteres, cortados
+        em quebras de linha, e o idioma de cada bloco é detectado separadamente (veja Func.agrupa_por_idioma). Cada
+        bloco é processado pelo modelo do Spacy do seu idioma, de modo que um texto com trechos em português e em
+        inglês, como o de Func.import_text_from_folder, não é processado inteiro com o modelo do primeiro trecho.
+
+        Args:
+        texto (str): O texto para extrair entidades nomeadas e identificar idioma.
+        lang_code (str): O código ISO do idioma do texto inteiro, se já for conhecido.
+        tamanho_bloco (int): O número aproximado de caracteres de cada bloco com idioma próprio.
+
+        Returns:
+        tuple: Uma tupla contendo uma lista de entidades nomeadas, o código ISO do idioma, 
+        o nome do idioma em sua forma reduzida e o nome do modelo do Spacy usado para processar o texto. Com
+        blocos em mais de um idioma, os três últimos itens se referem ao idioma da maior parte do texto.
+        """
+        # Divide o texto em blocos e agrupa os blocos por idioma
+        blocos = [texto] if lang_code else list(Func._blocos_texto(texto, tamanho_bloco, preferir_linhas=True))
+        grupos = {lang_code: [0]} if lang_code else Func.agrupa_por_idioma(blocos, tamanho_bloco)
+        if not grupos:
+            blocos = [texto]
+            grupos = {Func.detecta_idioma(texto, tamanho_bloco): [0]}
+
+        # Extrai as entidades de cada grupo com o modelo Spacy do seu idioma (Func.entities_lote troca as quebras de
+        # linha por espaços)
+        entidades = [None] * len(blocos)
+        for idioma, indices in grupos.items():
+            por_bloco, _ = Func.entities_lote([blocos[i] for i in indices], idioma)
+            for i, contagem in zip(indices, por_bloco):
+                entidades[i] = contagem
+
+        # Junta as entidades de todos os blocos, na ordem do texto e sem repetições
+        ent_list = [list(entidade) for entidade in dict.fromkeys(
+            entidade for contagem in entidades for entidade in contagem)]
+
+        # Identificar o idioma predominante, o nome do idioma em sua forma reduzida e o nome do modelo Spacy
+        lang_code = Func._idioma_predominante(grupos, blocos)
+        lang_code_short, lang_code_full = Func.recursos_idioma(lang_code)
+
+        # Retornar lista de entidades nomeadas, código ISO do idioma, nome do idioma em sua forma reduzida
+        # e nome do modelo do Spacy usado para processar o texto
+        return ent_list, lang_code, lang_code_short, lang_code_full
+
+    @staticmethod
+    def _idioma_predominante(grupos: Dict[str, List[int]], textos: List[str]) -> str:
+        """
+        Retorna o idioma com o maior número de caracteres entre os grupos de Func.agrupa_por_idioma.
+
+        Args:
+            grupos: Um dicionário idioma -> índices dos documentos.
+            textos: Os textos dos documentos.
+
+        Returns:
+            O código ISO do idioma predominante; nos empates, o primeiro dos grupos.
+        """
+        return max(grupos, key=lambda idioma: sum(len(textos[i]) for i in grupos[idioma]))
+
+    @staticmethod
+    def entities_lote(textos: Iterable[str], lang_code: str = None, batch_size: int = 64,
+                      n_process: int = 1) -> Tuple[List[Counter], Counter]:
+        """
+        Extrai as entidades nomeadas de vários documentos de uma só vez, usando nlp.pipe do Spacy.
+
+        Os documentos são processados em fluxo, em lotes de batch_size documentos e, se n_process for maior que 1,
+        em vários processos. As entidades são contadas em Counters, cujas chaves (texto, rótulo) eliminam as
+        repetições sem buscas lineares.
+
+        Args:
+            textos: Um iterável com os textos dos documentos.
+            lang_code: O código ISO do idioma dos documentos. Se None, o idioma é detectado no primeiro documento.
+            batch_size: O número de documentos enviados ao Spacy em cada lote.
+            n_process: O número de processos usados pelo Spacy (-1 usa todos os núcleos).
+
+        Returns:
+            Uma tupla contendo uma lista com um Counter de entidades (texto, rótulo) por documento, na ordem de
+            entrada, e um Counter com o total de ocorrências de cada entidade em todos os documentos.
+        """
+        # Quebras de linha são trocadas por espaços, como em Func.entities
+        textos = (texto.replace('\n', ' ') for texto in textos)
+
+        # Detecta o idioma no primeiro documento, se ele não tiver sido informado
+        if lang_code is None:
+            primeiro = next(textos, None)
+            if primeiro is None:
+                return [], Counter()
+            lang_code = Func.detecta_idioma(primeiro)
+            textos = itertools.chain([primeiro], textos)
+
+        # Processa os documentos em lotes com o pipeline compartilhado do idioma
+        pln = Func.pipeline_spacy(lang_code)
+        ent_por_documento = []
+        ent_total = Counter()
+        for documento in pln.pipe(textos, batch_size=batch_size, n_process=n_process):
+            contagem = Counter((entidade.text, entidade.label_) for entidade in documento.ents)
+            ent_por_documento.append(contagem)
+            ent_total.update(contagem)
+
+        return ent_por_documento, ent_total
+
+    @staticmethod
+    def detecta_idioma(texto: str, tamanho_prefixo: int = 2000) -> str:
+        """
+        Detecta o idioma de um texto com o fastText, a partir apenas do seu início.
+
+        O idioma é detectado nos primeiros tamanho_prefixo caracteres do texto (cortados num espaço em branco) e
+        guardado em Func._idiomas_detectados pelo hash desse trecho, de modo que documentos repetidos, ou com o
+        mesmo início, não são analisados de novo.
+
+        Args:
+            texto: O texto.
+            tamanho_prefixo: O número aproximado de caracteres analisados.
+
+        Returns:
+            O código ISO do idioma, como 'pt' ou 'en'.
+        """
+        # O fastText não aceita quebras de linha
+        prefixo = next(Func._blocos_texto(texto, tamanho_prefixo), '')[:2 * tamanho_prefixo].replace('\n', ' ')
+        chave = hashlib.blake2b(prefixo.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+        idioma = Func._idiomas_detectados.get(chave)
+        if idioma is None:
+            from ftlangdetect import detect
+            idioma = detect(text=prefixo, low_memory=False)['lang']
+            if len(Func._idiomas_detectados) >= Func._MAX_IDIOMAS_DETECTADOS:
+                Func._idiomas_detectados.clear()
+            Func._idiomas_detectados[chave] = idioma
+        return idioma
+
+    @staticmethod
+    def agrupa_por_idioma(textos: Iterable[str], tamanho_prefixo: int = 2000,
+                          idioma_padrao: Optional[str] = None) -> Dict[str, List[int]]:
+        """
+        Detecta o idioma de cada documento e agrupa os documentos por idioma.
+
+        Documentos detectados num idioma sem recursos em Func._IDIOMAS (em geral, documentos curtos detectados
+        incorretamente) são atribuídos a idioma_padrao ou, se ele não for informado, ao idioma com recursos mais
+        frequente do corpus.
+
+        Args:
+            textos: Os textos dos documentos.
+            tamanho_prefixo: O número aproximado de caracteres analisados por documento (veja
+                Func.detecta_idioma).
+            idioma_padrao: O idioma dos documentos detectados num idioma sem recursos.
+
+        Returns:
+            Um dicionário idioma -> índices dos documentos desse idioma, na ordem de entrada.
+        """
+        grupos = {}
+        for i, texto in enumerate(textos):
+            grupos.setdefault(Func.detecta_idioma(texto, tamanho_prefixo), []).append(i)
+
+        suportados = [idioma for idioma in grupos if idioma in Func._IDIOMAS]
+        if idioma_padrao is None and suportados:
+            idioma_padrao = max(suportados, key=lambda idioma: len(grupos[idioma]))
+        if idioma_padrao is None:
+            return grupos
+
+        # Reúne os documentos de idiomas sem recursos no idioma padrão
+        agrupados = {}
+        for idioma, indices in grupos.items():
+            agrupados.setdefault(idioma if idioma in Func._IDIOMAS else idioma_padrao, []).extend(indices)
+        return {idioma: sorted(indices) for idioma, indices in agrupados.items()}
+
+    @staticmethod
+    def processa_por_idioma(textos: List[str], tamanho_prefixo: int = 2000, idioma_padrao: Optional[str] = None,
+                            batch_size: int = 64, n_process: int = 1,
+                            grupos: Optional[Dict[str, List[int]]] = None,
+                            perfilador: Optional[Perfilador] = None) -> Dict[str, GrupoIdioma]:
+        """
+        Limpa os documentos e extrai suas entidades com os recursos do idioma de cada documento.
+
+        Os documentos são agrupados por Func.agrupa_por_idioma; cada grupo é então limpo de uma só vez com as
+        stopwords do seu idioma (Func.cleaner_compacto) e processado em lotes pelo pipeline do Spacy do seu idioma
+        (Func.entities_lote). Assim, um corpus com entrevistas em português e textos de referência em inglês não é
+        processado inteiro com um único modelo.
+
+        Args:
+            textos: Os textos dos documentos, como os produzidos por Func.le_corpus.
+            tamanho_prefixo: O número aproximado de caracteres analisados por documento na detecção do idioma.
+            idioma_padrao: O idioma dos documentos detectados num idioma sem recursos (veja
+                Func.agrupa_por_idioma).
+            batch_size: O número de documentos enviados ao Spacy em cada lote.
+            n_process: O número de processos usados pelo Spacy.
+            grupos: Os grupos já calculados por Func.agrupa_por_idioma; se None, os idiomas são detectados aqui.
+            perfilador: Se informado, mede à parte a limpeza (etapa 'limpeza') e o reconhecimento de entidades
+                (etapa 'entidades') de todos os grupos.
+
+        Returns:
+            Um dicionário idioma -> GrupoIdioma. O documento d do corpus do grupo é o documento indices[d] de textos.
+        """
+        def mede(nome):
+            return perfilador.etapa(nome) if perfilador is not None else contextlib.nullcontext()
+
+        if grupos is None:
+            grupos = Func.agrupa_por_idioma(textos, tamanho_prefixo, idioma_padrao)
+        documentos = {idioma: [textos[i] for i in indices] for idioma, indices in grupos.items()}
+
+        with mede('limpeza'):
+            corpus = {idioma: Func.cleaner_compacto(documentos[idioma], Func.recursos_idioma(idioma)[0])
+                      for idioma in grupos}
+
+        processados = {}
+        with mede('entidades'):
+            for idioma, indices in grupos.items():
+                entidades, total_entidades = Func.entities_lote(documentos[idioma], idioma, batch_size, n_process)
+                processados[idioma] = GrupoIdioma(idioma, indices, corpus[idioma], entidades, total_entidades)
+        return processados
+
+    @staticmethod
+    def recursos_idioma(lang_code: str) -> Tuple[str, str]:
+        """
+        Retorna os recursos de linguagem associados a um código ISO de idioma.
+
+        Args:
+            lang_code: O código ISO do idioma, como 'pt' ou 'en'.
+
+        Returns:
+            Uma tupla com o nome do idioma usado pelo NLTK e o nome do modelo do Spacy. Para idiomas sem modelo,
+            o nome do idioma é o próprio código e o nome do modelo é uma string vazia.
+        """
+        return Func._IDIOMAS.get(lang_code, (lang_code, ''))
+
+    @staticmethod
+    def pipeline_spacy(lang_code: str):
+        """
+        Retorna o pipeline do Spacy de um idioma, carregando-o apenas na primeira chamada do processo.
+
+        Os pipelines ficam guardados em Func._pipelines_spacy e são compartilhados por todas as chamadas, de modo
+        que o custo de spacy.load é pago uma única vez por idioma. Os componentes que não são usados no
+        reconhecimento de entidades (parser, lematizador etc.) são desativados. Para idiomas sem modelo
+        treinado, é usado um pipeline vazio (spacy.blank).
+
+        Args:
+            lang_code: O código ISO do idioma, como 'pt' ou 'en'.
+
+        Returns:
+            O objeto Language do Spacy para o idioma.
+        """
+        pln = Func._pipelines_spacy.get(lang_code)
+        if pln is None:
+            with Func._trava_spacy:
+                # Verifica novamente, pois outra thread pode ter carregado o pipeline enquanto esperávamos
+                pln = Func._pipelines_spacy.get(lang_code)
+                if pln is None:
+                    pln = Func._carrega_pipeline_spacy(lang_code)
+                    Func._pipelines_spacy[lang_code] = pln
+        return pln
+
+    @staticmethod
+    def _carrega_pipeline_spacy(lang_code: str):
+        """
+        Carrega o pipeline do Spacy de um idioma, desativando os componentes desnecessários.
+
+        Args:
+            lang_code: O código ISO do idioma.
+
+        Returns:
+            O pipeline treinado do idioma ou, se não houver modelo para o idioma, um pipeline vazio.
+        """
+        import spacy
+
+        lang_code_full = Func.recursos_idioma(lang_code)[1]
+
+        if lang_code_full:
+            pln = spacy.load(lang_code_full)
+            for componente in Func._COMPONENTES_DESATIVADOS:
+                if componente in pln.pipe_names:
+                    pln.disable_pipe(componente)
+            return pln
+
+        # Idioma sem modelo treinado: usa o tokenizador do idioma ou, se o Spacy não o conhecer, o multilíngue
+        try:
+            return spacy.blank(lang_code)
+        except ImportError:
+            return spacy.blank('xx')
+
+    @staticmethod
+    def calcula_ome(texto: Union[str, Iterable, CorpusCompacto], por_respondente: bool = False,
+                    tamanho_lote: int = 1_000_000) -> Tuple[List[str], Dict[str, float]]:
+        """Calcula a ordem média de evocação (OME) para cada palavra em um texto e retorna as
+        palavras ordenadas pela OME, do maior para o menor, juntamente com um dicionário
+        contendo as OMEs calculadas para cada palavra.
+
+        As palavras são codificadas como inteiros lote a lote e as somas das ordens e as
+        frequências são acumuladas com np.bincount, de modo que a memória usada é proporcional ao
+        vocabulário e ao tamanho do lote, e não ao número total de palavras.
+
+        Argumentos:
+        texto -- O texto a ser analisado. Pode ser uma string, um iterável de respostas, em que cada
+                 resposta é uma string ou uma sequência de palavras, ou um CorpusCompacto, cujos códigos
+                 são usados diretamente (cada documento é uma resposta).
+        por_respondente -- Se False, a ordem de cada palavra é sua posição no texto inteiro (as respostas
+                           são encadeadas). Se True, a ordem é a posição de evocação dentro da resposta de
+                           cada respondente; uma string é então dividida em uma resposta por linha.
+        tamanho_lote -- Número aproximado de palavras codificadas de cada vez.
+
+        Retorna:
+        Uma tupla contendo uma lista de strings com as palavras ordenadas pela OME e um
+        dicionário onde cada chave é uma palavra do texto e cada valor é a OME calculada para essa palavra.
+        """
+        # Acumula a soma das ordens e a frequência de cada palavra, lote a lote
+        if isinstance(texto, CorpusCompacto):
+            palavras, somas, frequencias = Func._acumula_ordens_compacto(texto, por_respondente)
+        else:
+            palavras, somas, frequencias = Func._acumula_ordens(
+                Func._lotes_evocacoes(texto, por_respondente, tamanho_lote))
+
+        # Calcula a OME de cada palavra dividindo a soma das ordens pelo número de ocorrências
+        valores = somas / frequencias
+        ome = dict(zip(palavras, valores.tolist()))
+
+        # Ordena as palavras pela OME (maior OME primeiro), preservando a ordem de aparição nos empates
+        ordem = np.argsort(-valores, kind='stable')
+        palavras_ordenadas = [palavras[i] for i in ordem.tolist()]
+
+        # retorna as palavras ordenadas pela OME e o dicionário com as OMEs calculadas para cada palavra
+        return palavras_ordenadas, ome
+
+    @staticmethod
+    def _lotes_evocacoes(texto: Union[str, Iterable], por_respondente: bool,
+                         tamanho_lote: int) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """
+        Divide as evocações em lotes de palavras acompanhadas da ordem de cada palavra.
+
+        Args:
+            texto: Uma string ou um iterável de respostas (strings ou sequências de palavras).
+            por_respondente: Se True, a ordem recomeça em 1 a cada resposta; se False, é a posição global.
+            tamanho_lote: Número aproximado de palavras por lote.
+
+        Returns:
+            Um gerador de tuplas (palavras, ordens), em que ordens é um vetor int64 com a ordem de cada palavra.
+        """
+        if isinstance(texto, str):
+            if por_respondente:
+                respostas = texto.splitlines()
+            else:
+                # Percorre o texto em fatias, sem criar a lista completa de palavras do texto
+                respostas = Func._fatias_texto(texto, tamanho_lote * 8)
+        else:
+            respostas = texto
+
+        palavras = []
+        tamanhos = []
+        emitidas = 0
+        deslocamento = 0
+
+        for resposta in respostas:
+            itens = iter(resposta.split() if isinstance(resposta, str) else resposta)
+            emitidas_resposta = 0
+            while True:
+                # A ordem do primeiro trecho de um lote continua de onde o lote anterior parou
+                if not tamanhos:
+                    deslocamento = emitidas_resposta if por_respondente else emitidas
+
+                bloco = list(itertools.islice(itens, tamanho_lote - len(palavras)))
+                palavras.extend(bloco)
+                tamanhos.append(len(bloco))
+                if len(palavras) < tamanho_lote:
+                    break
+
+                # Lote cheio: uma resposta longa continua no próximo lote
+                yield palavras, Func._ordens_do_lote(tamanhos, deslocamento, por_respondente)
+                emitidas += len(palavras)
+                emitidas_resposta += len(bloco)
+                palavras = []
+                tamanhos = []
+
+        if palavras:
+            yield palavras, Func._ordens_do_lote(tamanhos, deslocamento, por_respondente)
+
+    @staticmethod
+    def _fatias_texto(texto: str, tamanho: int) -> Iterator[List[str]]:
         """
-        Inicializa a classe Func e limpa a tela do terminal.
+        Divide um texto em fatias de aproximadamente tamanho caracteres, cortadas sempre em um espaço em branco,
+        e retorna as palavras de cada fatia.
+
+        Args:
+            texto: O texto a ser dividido.
+            tamanho: O número aproximado de caracteres de cada fatia.
+
+        Returns:
+            Um gerador com a lista de palavras de cada fatia, na ordem do texto.
         """
-        os.system('clear')
+        for bloco in Func._blocos_texto(texto, tamanho):
+            yield bloco.split()
 
     @staticmethod
-    def api_loader():
+    def _blocos_texto(texto: str, tamanho: int, preferir_linhas: bool = False) -> Iterator[str]:
         """
-        Carrega a chave de API do OpenAI a partir do arquivo .env.
+        Divide um texto em blocos de aproximadamente tamanho caracteres, sem partir nenhuma palavra.
 
-        Argumentos:
-        None
+        Args:
+            texto: O texto a ser dividido.
+            tamanho: O número aproximado de caracteres de cada bloco.
+            preferir_linhas: Se True, os blocos são cortados em uma quebra de linha sempre que houver uma até o
+                             dobro do tamanho, para não partir frases e parágrafos; caso contrário, no primeiro
+                             espaço em branco após o tamanho.
 
-        Retorna:
-        str: chave de API do OpenAI
+        Returns:
+            Um gerador com os blocos, na ordem do texto.
         """
-        load_dotenv()
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        return openai_api_key
+        inicio = 0
+        while inicio < len(texto):
+            # Avança o fim do bloco até a próxima quebra de linha ou espaço em branco
+            corte = Func._REGEX_LINHA.search(texto, inicio + tamanho, inicio + 2 * tamanho) if preferir_linhas \
+                else None
+            corte = corte or Func._REGEX_ESPACO.search(texto, inicio + tamanho)
+            fim = corte.start() if corte else len(texto)
+            yield texto[inicio:fim]
+            inicio = fim
 
     @staticmethod
-    def import_text_from_folder(folder_path):
+    def _ordens_do_lote(tamanhos: List[int], deslocamento: int, por_respondente: bool) -> np.ndarray:
         """
-        Esta função recebe um caminho de pasta como entrada e retorna uma única string contendo todo o texto dos
-        arquivos txt encontrados nessa pasta.
-    
-        Argumentos:
-        folder_path -- O caminho da pasta que contém os arquivos txt a serem importados
-    
-        Retorna:
-        text -- A única string contendo todo o texto dos arquivos txt encontrados na pasta especificada por folder_path
-    
-        Raises:
-        FileNotFoundError -- Se a pasta especificada por folder_path não existir
-    
-        Esta função percorre todos os arquivos txt encontrados na pasta especificada por folder_path, lê o conteúdo
-        de cada um deles e adiciona seu texto a uma única string. A string contendo todo o texto é então retornada
-        pela função.
-    
-        Se a pasta especificada por folder_path não existir, a função levanta a exceção FileNotFoundError.
+        Calcula a ordem de cada palavra de um lote a partir do tamanho de cada trecho de resposta.
+
+        Args:
+            tamanhos: O número de palavras de cada trecho de resposta do lote, na ordem.
+            deslocamento: A última ordem atribuída antes do lote (no primeiro trecho, se por_respondente).
+            por_respondente: Se True, a ordem recomeça a cada trecho, exceto no primeiro, que continua do
+                             deslocamento; se False, a ordem é contínua.
+
+        Returns:
+            Um vetor int64 com a ordem de cada palavra do lote.
         """
-        import os
+        total = int(sum(tamanhos))
+        posicoes = np.arange(1, total + 1, dtype=np.int64)
+        if not por_respondente:
+            return posicoes + deslocamento
 
-        # Verifica se a pasta existe
-        if not os.path.exists(folder_path):
-            raise FileNotFoundError(f"A pasta {folder_path} não existe.")
+        # Subtrai de cada posição o início do trecho a que ela pertence
+        tamanhos = np.asarray(tamanhos, dtype=np.int64)
+        inicios = np.cumsum(tamanhos) - tamanhos
+        posicoes -= np.repeat(inicios, tamanhos)
+        if len(tamanhos):
+            posicoes[:tamanhos[0]] += deslocamento
+        return posicoes
+
+    @staticmethod
+    def _acumula_ordens(lotes: Iterable[Tuple[List[str], np.ndarray]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Codifica as palavras de cada lote como inteiros e acumula a soma das ordens e a frequência por palavra.
+
+        Args:
+            lotes: Um iterável de tuplas (palavras, ordens), como as geradas por Func._lotes_evocacoes.
 
-        # Cria uma lista vazia para armazenar o texto de todos os arquivos
-        text_list = []
+        Returns:
+            Uma tupla com o vocabulário (na ordem da primeira ocorrência), o vetor com a soma das ordens de cada
+            palavra e o vetor com a frequência de cada palavra.
+        """
+        vocabulario = {}
+        somas = np.zeros(0, dtype=np.float64)
+        frequencias = np.zeros(0, dtype=np.int64)
 
-        # Percorre todos os arquivos da pasta especificada por folder_path
-        for file_name in os.listdir(folder_path):
-            # Verifica se o arquivo é um arquivo txt
-            if file_name.endswith('.txt'):
-                # Abre o arquivo em modo de leitura ('r') e armazena seu texto na lista text_list
-                file_path = os.path.join(folder_path, file_name)
-                with open(file_path, 'r') as file:
-                    text_list.append(file.read())
+        for palavras, ordens in lotes:
+            # Codifica as palavras do lote como inteiros do vocabulário, na ordem da primeira ocorrência
+            codigos = np.fromiter((vocabulario.setdefault(palavra, len(vocabulario)) for palavra in palavras),
+                                  dtype=np.int64, count=len(palavras))
 
-        # Combina todo o texto da lista text_list em uma única string
-        text = ''.join(text_list)
-        return text
+            # Acumula as somas e as frequências com o vocabulário atual
+            tamanho = len(vocabulario)
+            somas = np.concatenate([somas, np.zeros(tamanho - len(somas))])
+            frequencias = np.concatenate([frequencias, np.zeros(tamanho - len(frequencias), dtype=np.int64)])
+            somas += np.bincount(codigos, weights=ordens, minlength=tamanho)
+            frequencias += np.bincount(codigos, minlength=tamanho)
+
+        return list(vocabulario), somas, frequencias
 
     @staticmethod
-    def criar_indice_sql(host, user, password, database_sql, tabela):
+    def _acumula_ordens_compacto(corpus: CorpusCompacto,
+                                 por_respondente: bool) -> Tuple[List[str], np.ndarray, np.ndarray]:
         """
-        Cria um índice de pesquisa usando os dados de uma tabela específica em um banco de dados SQL.
-        Argumentos:
-        host (str): endereço do servidor de banco de dados
-        user (str): nome de usuário do banco de dados
-        password (str): senha do usuário do banco de dados
-        database_sql (str): nome do banco de dados a ser conectado
-        tabela (str): nome da tabela que contém os dados a serem indexados
-        
-        Retorna:
-        None
+        Calcula a soma das ordens e a frequência de cada palavra de um CorpusCompacto, como Func._acumula_ordens.
+
+        Args:
+            corpus: O corpus.
+            por_respondente: Se True, a ordem recomeça a cada documento.
+
+        Returns:
+            Uma tupla com as palavras presentes no corpus (na ordem da primeira ocorrência), o vetor com a soma das
+            ordens de cada palavra e o vetor com a frequência de cada palavra.
         """
-        # Conectar ao banco de dados
-        conn = pymysql.connect(host=host, user=user, password=password, database=database_sql)
-        cursor = conn.cursor()
+        tamanho = len(corpus.palavras)
+        somas = np.bincount(corpus.tokens, weights=corpus.ordens(por_respondente), minlength=tamanho)
+        frequencias = np.bincount(corpus.tokens, minlength=tamanho)
 
-        try:
-            # Selecionar os dados a serem indexados
-            cursor.execute(f"SELECT id_sql, texto FROM {tabela}")
+        # Descarta as palavras do vocabulário ausentes do corpus (por exemplo, os hapaxes de sem_hapaxes)
+        presentes = np.flatnonzero(frequencias)
+        if len(presentes) < tamanho:
+            return [corpus.palavras[i] for i in presentes.tolist()], somas[presentes], frequencias[presentes]
+        return list(corpus.palavras), somas, frequencias
+
+    @staticmethod
+    def analise_prototipica(palavras_ordenadas: Union[list, CorpusCompacto], ome: Optional[dict] = None) -> Tuple[
+        List[Tuple[str, float]], List[Tuple[str, float]], List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """
+        A função analise_prototipica analisa a distribuição das palavras em um texto de acordo com a teoria do
+        protótipo, que divide as palavras em quatro categorias: núcleo central, zona periférica 1, zona periférica 2
+        e zona periférica 3. A função recebe uma lista de palavras ordenadas pela OME (do maior para o menor) e um
+        dicionário contendo as OMEs calculadas para cada palavra. Retorna uma tupla contendo as quatro listas de
+        acordo com a análise prototípica.
 
-            # Criar os documentos e adicionar ao índice
-            indice = GPTSimpleVectorIndex()
-            for id_sql, texto in cursor:
-                documento = Document(texto, doc_id=str(id_sql))
-                indice.add_document(documento)
+        As OMEs e sua normalização são calculadas em vetores NumPy e a pertinência às zonas é controlada com
+        máscaras e conjuntos, de modo que o custo é linear no tamanho do vocabulário. O resultado é idêntico ao
+        da implementação original, mantida como referência em tests/test_analise_prototipica.py.
 
-            # Salvar o índice em disco
-            reader = SimpleDirectoryReader("indice")
-            indice.write(reader)
+        palavras_ordenadas também pode ser um CorpusCompacto, sem ome: as OMEs são então calculadas diretamente
+        dos códigos do corpus, com o mesmo resultado de Func.analise_prototipica(*Func.calcula_ome(corpus)).
+        """
+        if isinstance(palavras_ordenadas, CorpusCompacto):
+            palavras, somas, frequencias = Func._acumula_ordens_compacto(palavras_ordenadas, False)
+            valores = somas / frequencias
+            ordem = np.argsort(-valores, kind='stable')
+            media_ome = np.mean(valores) if len(valores) else np.float64(np.nan)
+            return Func._zonas_prototipicas([palavras[i] for i in ordem.tolist()], valores[ordem], media_ome)
 
-        except Exception as e:
-            print(f"Error: {e}")
-            conn.rollback()
-        else:
-            conn.commit()
+        # Verifica se as entradas são válidas
+        if not isinstance(palavras_ordenadas, list) or not isinstance(ome, dict):
+            raise TypeError("palavras_ordenadas deve ser uma lista e ome deve ser um dicionário")
 
-        finally:
-            # Fechar a conexão com o banco de dados
-            cursor.close()
-            conn.close()
+        # Verifica se as entradas têm o mesmo tamanho
+        if len(palavras_ordenadas) != len(ome):
+            raise ValueError("palavras_ordenadas e ome devem ter o mesmo tamanho")
+
+        # Cria o vetor com as ome das palavras, na ordem recebida
+        valores = np.fromiter((ome.get(palavra, 0) for palavra in palavras_ordenadas), dtype=np.float64,
+                              count=len(palavras_ordenadas))
+
+        # Obtém a média da OME para a normalização
+        media_ome = np.mean(list(ome.values()))
 
-        return None
+        # Cria as quatro listas de acordo com a análise prototípica
+        return Func._zonas_prototipicas(palavras_ordenadas, valores, media_ome)
 
     @staticmethod
-    def llama_index_texts(path_folder):
+    def _zonas_prototipicas(palavras: list, valores: np.ndarray, media_ome: float) -> Tuple[
+        List[Tuple[str, float]], List[Tuple[str, float]], List[Tuple[str, float]], List[Tuple[str, float]]]:
         """
-        Esta função indexa documentos de texto contidos em um diretório usando a biblioteca Llama Index.
+        Distribui as palavras pelas quatro zonas da análise prototípica a partir do vetor de OMEs.
+
+        Args:
+            palavras: As palavras, ordenadas pela OME (do maior para o menor).
+            valores: Vetor float64 com a OME de cada palavra, na mesma ordem de palavras.
+            media_ome: A média da OME usada na normalização.
+
+        Returns:
+            Uma tupla com o núcleo central e as zonas periféricas 1, 2 e 3.
+        """
+        total = len(palavras)
+
+        # Normaliza todas as OMEs de uma só vez
+        normas = valores / media_ome
+
+        # Núcleo central: palavras com OME acima da média
+        nucleo = np.flatnonzero(valores > media_ome)
+        nucleo_central = list(zip([palavras[i] for i in nucleo.tolist()], normas[nucleo]))
+
+        # Posições elegíveis para as zonas periféricas e a faixa de cada posição
+        posicoes = np.arange(total)
+        elegiveis = normas <= 1
+        faixa_1 = posicoes < total * 0.25
+        faixa_3 = posicoes >= total * 0.75
+
+        if len(set(palavras)) == total:
+            # Sem palavras repetidas, a zona 1 recebe todas as palavras elegíveis, a zona 2 as da faixa central
+            # e a zona 3 as da faixa final
+            zonas = []
+            for mascara in (elegiveis, elegiveis & ~faixa_1 & ~faixa_3, elegiveis & faixa_3):
+                indices = np.flatnonzero(mascara)
+                zonas.append(list(zip([palavras[i] for i in indices.tolist()], normas[indices])))
+            zona_periferica_1, zona_periferica_2, zona_periferica_3 = zonas
+            return nucleo_central, zona_periferica_1, zona_periferica_2, zona_periferica_3
+
+        # Com palavras repetidas, reproduz as regras de pertinência usando conjuntos em vez de buscas em listas
+        zona_periferica_1 = []
+        zona_periferica_2 = []
+        zona_periferica_3 = []
+        em_zona_1 = set()
+        em_zona_2 = set()
+
+        for i in np.flatnonzero(elegiveis).tolist():
+            palavra = palavras[i]
+            item = (palavra, normas[i])
+            if faixa_1[i]:
+                zona_periferica_1.append(item)
+                em_zona_1.add(palavra)
+            elif not faixa_3[i]:
+                zona_periferica_2.append(item)
+                em_zona_2.add(palavra)
+                # Adiciona a palavra em zona_periferica_1 se já não estiver presente
+                if palavra not in em_zona_1:
+                    zona_periferica_1.append(item)
+                    em_zona_1.add(palavra)
+            else:
+                zona_periferica_3.append(item)
+                # Adiciona a palavra em zona_periferica_1 ou zona_periferica_2 se já não estiver presente
+                if palavra not in em_zona_1:
+                    if palavra not in em_zona_2:
+                        zona_periferica_1.append(item)
+                        em_zona_1.add(palavra)
+                    else:
+                        zona_periferica_2.append(item)
+                elif palavra not in em_zona_2:
+                    zona_periferica_2.append(item)
+                    em_zona_2.add(palavra)
+
+        return nucleo_central, zona_periferica_1, zona_periferica_2, zona_periferica_3
+
+    @staticmethod
+    def benchmark_analise_prototipica(tamanhos: Tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000),
+                                      referencia=None, limite_referencia: int = 10_000,
+                                      semente: int = 0) -> List[List]:
+        """
+        Mede o tempo de Func.analise_prototipica em vocabulários sintéticos de tamanhos crescentes e, opcionalmente,
+        o de uma implementação de referência com a mesma assinatura, para comparação.
+
+        Args:
+            tamanhos: Os tamanhos de vocabulário a serem medidos.
+            referencia: Função opcional com a assinatura de Func.analise_prototipica (por exemplo, a implementação
+                original de tests/test_analise_prototipica.py), medida e comparada nos vocabulários pequenos.
+            limite_referencia: Maior vocabulário no qual a referência é executada.
+            semente: Semente do gerador de números aleatórios, para que as medições sejam reprodutíveis.
+
+        Returns:
+            Uma lista de linhas [tamanho, segundos, segundos da referência, equivalente], também impressa em tabela.
+            As duas últimas colunas são None quando a referência não é executada.
+        """
+        gerador = np.random.default_rng(semente)
+        linhas = []
+
+        for tamanho in tamanhos:
+            # Gera um vocabulário sintético já ordenado pela OME, como faz Func.calcula_ome
+            valores = gerador.gamma(2.0, 50.0, size=tamanho)
+            palavras = [f"palavra{i}" for i in range(tamanho)]
+            ome = dict(zip(palavras, valores.tolist()))
+            palavras_ordenadas = sorted(ome, key=ome.get, reverse=True)
+
+            inicio = time.perf_counter()
+            zonas = Func.analise_prototipica(palavras_ordenadas, ome)
+            segundos = time.perf_counter() - inicio
+
+            # Compara com a referência apenas nos vocabulários pequenos
+            segundos_referencia = None
+            equivalente = None
+            if referencia is not None and tamanho <= limite_referencia:
+                inicio = time.perf_counter()
+                zonas_referencia = referencia(palavras_ordenadas, ome)
+                segundos_referencia = time.perf_counter() - inicio
+                equivalente = zonas == zonas_referencia
+
+            linhas.append([tamanho, segundos, segundos_referencia, equivalente])
+
+        print(tabulate(linhas, headers=["Vocabulário", "Segundos", "Segundos (referência)", "Equivalente"]))
+        return linhas
+
+    @staticmethod
+    def benchmark_pipeline(tamanhos: Tuple[int, ...] = (10_000, 100_000, 1_000_000), vocabulario: int = 20_000,
+                           lang_code_short: str = 'portuguese', semente: int = 0,
+                           caminho_json: Optional[str] = None) -> List[List]:
+        """
+        Mede as etapas quentes da análise prototípica em corpus sintéticos de tamanhos crescentes.
+
+        Cada corpus tem tamanho palavras sorteadas, com a distribuição de Zipf, de um vocabulário sintético de
+        palavras só com letras (que passam pelos filtros de Func.cleaner), dividido em respostas de 5 a 15 palavras
+        por linha. A semente torna os corpus e, portanto, as medições reprodutíveis. As etapas medidas são a limpeza
+        (Func.cleaner_compacto), a OME a partir do corpus compacto e a partir do texto, as zonas da análise
+        prototípica e a contagem de bigramas. O reconhecimento de entidades não é medido, pois depende do modelo
+        do Spacy instalado; use Func.teste com um Perfilador para medi-lo.
+
+        Args:
+            tamanhos: O número de palavras de cada corpus.
+            vocabulario: O número de palavras distintas do vocabulário sintético.
+            lang_code_short: O idioma das stopwords usadas na limpeza.
+            semente: Semente do gerador de números aleatórios.
+            caminho_json: Se informado, as medições também são salvas nesse arquivo JSON.
+
+        Returns:
+            Uma lista de linhas [palavras, etapa, segundos, pico de memória em MB], também impressa em tabela.
+        """
+        gerador = np.random.default_rng(semente)
+        letras = np.array(list(string.ascii_lowercase))
+        comprimentos = gerador.integers(3, 10, size=vocabulario)
+        palavras = [''.join(gerador.choice(letras, size=comprimento)) for comprimento in comprimentos.tolist()]
+
+        linhas = []
+        for tamanho in tamanhos:
+            # Sorteia as palavras e as divide em respostas, uma por linha
+            indices = (gerador.zipf(1.3, size=tamanho) - 1) % vocabulario
+            cortes = np.cumsum(gerador.integers(5, 16, size=tamanho // 5 + 1))
+            cortes = cortes[cortes < tamanho].tolist()
+            texto = '\n'.join(' '.join(palavras[i] for i in resposta.tolist())
+                               for resposta in np.split(indices, cortes))
+
+            perfilador = Perfilador()
+            with perfilador.etapa('limpeza'):
+                corpus = Func.cleaner_compacto(texto, lang_code_short, por_linha=True)
+            with perfilador.etapa('ome'):
+                palavras_ordenadas, omes = Func.calcula_ome(corpus)
+            with perfilador.etapa('ome_texto'):
+                Func.calcula_ome(' '.join(corpus.palavras_filtradas()))
+            with perfilador.etapa('zonas'):
+                Func.analise_prototipica(palavras_ordenadas, omes)
+            with perfilador.etapa('bigramas'):
+                Func.conta_ngramas(corpus, 2, top_k=100)
+
+            for medicao in perfilador.etapas:
+                linhas.append([tamanho, medicao.nome, medicao.segundos, medicao.pico_memoria / 2 ** 20])
+
+        print(tabulate(linhas, headers=["Palavras", "Etapa", "Segundos", "Pico de memória (MB)"], floatfmt=".3f"))
+        if caminho_json is not None:
+            with open(caminho_json, 'w', encoding='utf-8') as arquivo:
+                json.dump({'semente': semente, 'vocabulario': vocabulario,
+                           'medicoes': [dict(zip(['palavras', 'etapa', 'segundos', 'pico_memoria_mb'], linha))
+                                        for linha in linhas]}, arquivo, indent=2)
+        return linhas
+
+    @staticmethod
+    def teste(path_folder: str, hap_or_no_hap: str, pasta_artefatos: Optional[str] = None,
+              usar_cache: bool = True, perfilador: Optional[Perfilador] = None) -> ResultadoAnalise:
+        """Executa o teste de análise prototípica no corpus especificado.
+
+        As etapas são executadas por um PipelineAnalise, que guarda os resultados intermediários em disco. Rodar
+        de novo sobre o mesmo corpus, ou trocar apenas hap_or_no_hap, não repete o reconhecimento de entidades nem
+        a limpeza do texto.
     
-        Argumentos:
-        path_folder (str): Caminho absoluto ou relativo do diretório contendo os documentos a serem indexados.
+        Args:
+            path_folder: O caminho da pasta que contém o corpus a ser utilizado.
+            hap_or_no_hap: Um parâmetro que determina se a análise prototípica deve ser realizada com palavras hapax
+            ou sem palavras hapax.
+            pasta_artefatos: A pasta onde os resultados intermediários são guardados (veja PipelineAnalise).
+            usar_cache: Se False, todas as etapas são recalculadas.
+            perfilador: Se informado, mede o tempo e a memória de cada etapa (veja Perfilador.relatorio).
     
-        Retorna:
-        GPTSimpleVectorIndex: Um índice Llama que contém os documentos indexados.
+        Returns:
+            Um ResultadoAnalise com todos os resultados relevantes da análise. Ele pode ser desempacotado como a
+            tupla das versões anteriores.
     
-        Esta função começa carregando os documentos de texto do diretório especificado por meio da função 
-        SimpleDirectoryReader(). O caminho do diretório é fornecido pelo argumento path_folder. A função retorna uma 
-        lista de objetos Document que contêm os documentos de texto a serem indexados. Em seguida, a função cria um 
-        objeto GPTSimpleVectorIndex, que é um índice Llama para documentos de texto. O objeto index é inicializado 
-        com a lista de documentos de texto passada como argumento e o tamanho máximo de fragmento permitido. Por fim, 
-        a função retorna o objeto index, que contém os documentos de texto indexados.
+        Raises:
+            ValueError: Se hap_or_no_hap não for 'hap' ou 'no_hap'.
         """
-        # Carregando documentos a partir de um diretório
-        documents = SimpleDirectoryReader(path_folder).load_data()
+        resultado = PipelineAnalise(pasta_artefatos, usar_cache, perfilador).executa(path_folder, hap_or_no_hap)
 
-        # Criando um índice Llama com os documentos carregados
-        index = GPTSimpleVectorIndex.from_documents(documents)
+        # Imprime a tabela dos resultados da análise
+        print(tabulate(resultado.data, headers=["", "Nº de Palavras", "", "Nº de Palavras", "", "Nº de Palavras", "",
+                                                "Nº de Palavras"]))
 
-        # Retornando o índice
-        return index
+        # Retorna todos os resultados relevantes
+        return resultado
 
     @staticmethod
-    def add_to_index(index, file_path):
+    def compara_grupos(pastas: List[str], hap_or_no_hap: str = 'hap', n_processos: Optional[int] = None,
+                       pasta_artefatos: Optional[str] = None, usar_cache: bool = True,
+                       caminho_relatorio: Optional[str] = None) -> ComparacaoGrupos:
         """
-        Esta função adiciona um documento de texto contido em um arquivo ao índice Llama existente.
-        
-        Argumentos:
-        index -- O índice Llama atual.
-        file_path -- Caminho absoluto ou relativo do arquivo contendo o documento a ser adicionado ao índice.
-        
-        Retorna:
-        index -- O índice Llama atualizado com o novo documento de texto adicionado.
-        
-        Esta função carrega o documento de texto do arquivo especificado e o adiciona ao índice Llama existente.
-        O índice é atualizado com o novo documento de texto adicionado e a função retorna o índice atualizado.
+        Executa a análise prototípica em vários corpus (grupos de respondentes, períodos etc.) e compara as zonas.
+
+        Cada pasta é analisada por um PipelineAnalise num processo separado, com os artefatos intermediários
+        guardados em pasta_artefatos como em Func.teste. Em seguida, as zonas de todos os grupos são codificadas
+        num vocabulário comum como matrizes de pertinência (grupos x palavras), e as sobreposições entre todos os
+        pares de grupos são calculadas de uma vez com um produto de matrizes.
+
+        Args:
+            pastas: As pastas dos corpus, uma por grupo. O nome do grupo é o nome da pasta.
+            hap_or_no_hap: 'hap' ou 'no_hap', como em Func.teste.
+            n_processos: O número de processos (padrão: número de núcleos da máquina). Com 1, os grupos são
+                analisados em sequência no processo atual.
+            pasta_artefatos: A pasta dos resultados intermediários (veja PipelineAnalise).
+            usar_cache: Se False, todas as etapas são recalculadas.
+            caminho_relatorio: Se informado, o relatório da comparação também é salvo nesse arquivo JSON.
+
+        Returns:
+            Um ComparacaoGrupos.
+
+        Raises:
+            ValueError: Se hap_or_no_hap não for 'hap' ou 'no_hap'.
         """
-        # Carregando documento a partir do arquivo
-        with open(file_path, 'r') as f:
-            text = f.read()
-        doc = Document(file_path, text)
+        if hap_or_no_hap not in ('hap', 'no_hap'):
+            raise ValueError("hap_or_no_hap precisa ser 'hap' ou 'no_hap'")
 
-        # Adicionando documento ao índice Llama existente
-        index.add_documents([doc])
+        # Nomes dos grupos: o nome da pasta, ou o caminho completo quando dois grupos têm pastas de mesmo nome
+        nomes = [os.path.basename(os.path.normpath(pasta)) for pasta in pastas]
+        grupos = [nome if nomes.count(nome) == 1 else pasta for nome, pasta in zip(nomes, pastas)]
 
-        # Retornando o índice atualizado
-        return index
+        # Analisa os grupos em paralelo, mantendo a ordem das pastas
+        argumentos = (pastas, itertools.repeat(hap_or_no_hap), itertools.repeat(pasta_artefatos),
+                      itertools.repeat(usar_cache))
+        if n_processos == 1:
+            resultados = list(map(Func._analisa_grupo, *argumentos))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=n_processos) as executor:
+                resultados = list(executor.map(Func._analisa_grupo, *argumentos))
+
+        # Vocabulário comum a todas as zonas de todos os grupos
+        zonas = ResultadoAnalise._fields[-4:]
+        codigos = {}
+        linhas = {zona: [] for zona in zonas}
+        colunas = {zona: [] for zona in zonas}
+        for g, resultado in enumerate(resultados):
+            for zona in zonas:
+                ids = [codigos.setdefault(palavra, len(codigos)) for palavra, _ in getattr(resultado, zona)]
+                linhas[zona].extend([g] * len(ids))
+                colunas[zona].extend(ids)
+        vocabulario = list(codigos)
+
+        # Matrizes de pertinência e sobreposições entre todos os pares de grupos
+        pertinencia = {}
+        intersecoes = {}
+        jaccard = {}
+        for zona in zonas:
+            matriz = np.zeros((len(resultados), len(vocabulario)), dtype=bool)
+            matriz[linhas[zona], colunas[zona]] = True
+            valores = matriz.astype(np.float32)
+            comuns = np.rint(valores @ valores.T).astype(np.int64)
+            tamanhos = np.diag(comuns)
+            unioes = tamanhos[:, None] + tamanhos[None, :] - comuns
+            pertinencia[zona] = matriz
+            intersecoes[zona] = comuns
+            jaccard[zona] = np.divide(comuns, unioes, out=np.zeros(comuns.shape), where=unioes > 0)
+
+        comparacao = ComparacaoGrupos(grupos, resultados, vocabulario, pertinencia, intersecoes, jaccard)
+        Func._imprime_comparacao(comparacao)
+
+        if caminho_relatorio is not None:
+            relatorio = {
+                'grupos': grupos,
+                'hap_or_no_hap': hap_or_no_hap,
+                'tamanhos': {zona: np.diag(intersecoes[zona]).tolist() for zona in zonas},
+                'intersecoes': {zona: intersecoes[zona].tolist() for zona in zonas},
+                'jaccard': {zona: np.round(jaccard[zona], 6).tolist() for zona in zonas},
+                'zonas': [{zona: [palavra for palavra, _ in getattr(resultado, zona)] for zona in zonas}
+                          for resultado in resultados],
+            }
+            with open(caminho_relatorio, 'w', encoding='utf-8') as arquivo:
+                json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+        return comparacao
+
+    @staticmethod
+    def _analisa_grupo(pasta: str, hap_or_no_hap: str, pasta_artefatos: Optional[str],
+                       usar_cache: bool) -> ResultadoAnalise:
+        """
+        Analisa um grupo de Func.compara_grupos. Executado nos processos do pool.
+        """
+        return PipelineAnalise(pasta_artefatos, usar_cache).executa(pasta, hap_or_no_hap)
+
+    @staticmethod
+    def _imprime_comparacao(comparacao: ComparacaoGrupos, n_palavras: int = 10) -> None:
+        """
+        Imprime o relatório de Func.compara_grupos: o tamanho das zonas de cada grupo, a matriz de Jaccard de
+        cada zona e as palavras presentes no núcleo central do maior número de grupos.
+
+        Args:
+            comparacao: O resultado de Func.compara_grupos.
+            n_palavras: O número de palavras do núcleo central listadas.
+        """
+        zonas = list(comparacao.jaccard)
+        tamanhos = [[grupo] + [int(comparacao.intersecoes[zona][g, g]) for zona in zonas]
+                    for g, grupo in enumerate(comparacao.grupos)]
+        print(tabulate(tamanhos, headers=["Grupo", "Núcleo Central", "Zona Periférica 1", "Zona Periférica 2",
+                                          "Zona Periférica 3"]))
+
+        for zona in zonas:
+            print(f"\nSobreposição (Jaccard) - {zona}")
+            linhas = [[grupo] + linha for grupo, linha in zip(comparacao.grupos, comparacao.jaccard[zona].tolist())]
+            print(tabulate(linhas, headers=[""] + comparacao.grupos, floatfmt=".2f"))
+
+        # Palavras do núcleo central compartilhadas pelo maior número de grupos
+        presenca = comparacao.pertinencia['nucleo_central'].sum(axis=0)
+        melhores = np.argsort(-presenca, kind='stable')[:n_palavras]
+        linhas = [[comparacao.vocabulario[v], int(presenca[v])] for v in melhores.tolist() if presenca[v] > 0]
+        print("\nPalavras mais compartilhadas do núcleo central")
+        print(tabulate(linhas, headers=["Palavra", "Nº de Grupos"]))
 
     @staticmethod
-    def saver(index, path_folder):
+    def translate_text(text, target_language):
         """
-        Salva o índice do Llama em disco como um arquivo json.
+        Função para traduzir um texto para outro idioma usando a biblioteca googletrans.
     
         Args:
-            index: O índice do Llama a ser salvo.
-            path_folder: O caminho para o diretório onde o arquivo json será salvo.
+        text (str): O texto a ser traduzido.
+        target_language (str): O código ISO do idioma de destino para a tradução, como 'pt' para português.
     
         Returns:
-            Nada. A função salva o índice do Llama como um arquivo json.
+        O texto traduzido para o idioma de destino.
         """
-        # Salva o índice em um arquivo json
-        index.save_to_disk(f'{path_folder}/index.json')
+        translator = Func.tradutor()
+        translated_text = translator.translate(text, dest=target_language)
+        return translated_text.text
 
     @staticmethod
-    def loader(path_folder):
+    def tradutor() -> 'Translator':
         """
-        Carrega o índice do Llama a partir de um arquivo json em disco.
-    
+        Retorna o cliente do Google Tradutor compartilhado, criando-o na primeira chamada, para que as conexões
+        HTTP sejam reaproveitadas entre as traduções.
+
+        Returns:
+            O Translator do googletrans.
+        """
+        from googletrans import Translator
+
+        if Func._tradutor is None:
+            Func._tradutor = Translator()
+        return Func._tradutor
+
+    @staticmethod
+    def traduz_lote(textos: List[str], target_language: str, source_language: str = 'auto', backend=None,
+                    tamanho_lote: int = 50, max_workers: int = 4, usar_cache: bool = True,
+                    nome_backend: Optional[str] = None) -> List[str]:
+        """
+        Traduz vários textos sentença a sentença, enviando ao tradutor apenas as sentenças que ainda não foram
+        traduzidas.
+
+        Os textos são divididos em sentenças (veja Func._segmenta_sentencas) e as sentenças repetidas, dentro de
+        um texto ou entre textos, são traduzidas uma única vez. As traduções ficam em Func.cache_traducoes(),
+        indexadas pelo tradutor, pelos idiomas de origem e de destino e pela sentença. As sentenças que não estão
+        no cache são enviadas em lotes de tamanho_lote, com no máximo max_workers lotes simultâneos. Os separadores
+        entre as sentenças (espaços e quebras de linha) são preservados.
+
         Args:
-            path_folder: O caminho para o diretório onde o arquivo json do índice está salvo.
-    
+            textos: Os textos a serem traduzidos.
+            target_language: O código ISO do idioma de destino, como 'pt'.
+            source_language: O código ISO do idioma de origem, ou 'auto' para detectá-lo.
+            backend: Uma função (sentencas: List[str], source_language: str, target_language: str) -> List[str]
+                que traduz um lote de sentenças, como um tradutor offline ou uma função de teste. Se None, é usado
+                o Google Tradutor (Func._traduz_google).
+            tamanho_lote: O número de sentenças de cada lote enviado ao tradutor.
+            max_workers: O número máximo de lotes traduzidos simultaneamente.
+            usar_cache: Se True, consulta e atualiza o cache de traduções.
+            nome_backend: O nome do tradutor no cache. Se None, é o nome qualificado de backend (veja
+                Func._nome_funcao), o que só é possível se backend for uma função definida no nível do módulo ou de
+                uma classe; para lambdas, functools.partial, funções locais e objetos chamáveis, ele é obrigatório.
+
         Returns:
-            O índice do Llama carregado a partir do arquivo json.
+            Os textos traduzidos, na ordem de entrada.
+
+        Raises:
+            ValueError: Se usar_cache for True e o nome do tradutor não puder ser determinado.
         """
-        # Carrega o índice a partir de um arquivo json
-        index = GPTSimpleVectorIndex.load_from_disk(f'{path_folder}/index.json')
-        return index
+        backend = backend or Func._traduz_google
+        nome_backend = nome_backend or Func._nome_funcao(backend)
+        if usar_cache and nome_backend is None:
+            raise ValueError("nome_backend é obrigatório para tradutores que não são funções com nome qualificado")
+        cache = Func.cache_traducoes() if usar_cache else None
+
+        def chave(sentenca):
+            return CacheSQLite.chave('traducao', nome_backend, source_language, target_language, sentenca)
+
+        # Divide os textos em sentenças e reúne as sentenças distintas
+        segmentos = [Func._segmenta_sentencas(texto) for texto in textos]
+        distintas = dict.fromkeys(sentenca.strip() for partes in segmentos for sentenca in partes[::2])
+        distintas.pop('', None)
+
+        # Consulta o cache
+        traducoes = {}
+        for sentenca in distintas:
+            traducao = cache.get(chave(sentenca)) if cache is not None else None
+            if traducao is not None:
+                traducoes[sentenca] = traducao
+        faltantes = [sentenca for sentenca in distintas if sentenca not in traducoes]
+
+        # Traduz as sentenças que faltam em lotes simultâneos
+        def traduz(lote):
+            traduzidas = backend(lote, source_language, target_language)
+            if len(traduzidas) != len(lote):
+                raise ValueError("O tradutor precisa retornar uma tradução para cada sentença do lote")
+            if cache is not None:
+                for sentenca, traducao in zip(lote, traduzidas):
+                    cache.set(chave(sentenca), traducao)
+            return traduzidas
+
+        lotes = [faltantes[inicio:inicio + tamanho_lote] for inicio in range(0, len(faltantes), tamanho_lote)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for lote, traduzidas in zip(lotes, executor.map(traduz, lotes)):
+                traducoes.update(zip(lote, traduzidas))
+
+        # Remonta os textos, trocando cada sentença pela sua tradução e mantendo os separadores
+        resultado = []
+        for partes in segmentos:
+            for k in range(0, len(partes), 2):
+                sentenca = partes[k].strip()
+                if sentenca:
+                    inicio = partes[k].index(sentenca)
+                    partes[k] = partes[k][:inicio] + traducoes[sentenca] + partes[k][inicio + len(sentenca):]
+            resultado.append(''.join(partes))
+        return resultado
 
     @staticmethod
-    def response(index, question):
+    def _nome_funcao(funcao) -> Optional[str]:
         """
-        Consulta o índice do Llama com uma pergunta e exibe a resposta.
-    
+        Retorna um nome estável para uma função, usado para separar no cache os resultados de funções diferentes.
+
         Args:
-            index: O índice do Llama.
-            question: A pergunta a ser consultada.
-    
+            funcao: A função.
+
         Returns:
-            None
+            O módulo e o nome qualificado da função, como 'main_pat.Func._traduz_google', ou None se a função não
+            tiver um nome que a identifique (lambdas, funções locais, functools.partial, métodos ligados a objetos e
+            objetos chamáveis, cujo comportamento pode depender de valores que o nome não captura).
         """
-        # Consulta o índice com a pergunta e armazena a resposta
-        response = index.query(f'{question}')
+        if not inspect.isfunction(funcao) or '<' in funcao.__qualname__:
+            return None
 
-        # Exibe a resposta
-        print(response)
+        # As funções deste arquivo têm o mesmo nome quando ele é importado ou executado como script
+        modulo = pathlib.Path(__file__).stem if funcao.__module__ == __name__ else funcao.__module__
+        return f'{modulo}.{funcao.__qualname__}'
+
+    @staticmethod
+    def _segmenta_sentencas(texto: str) -> List[str]:
+        """
+        Divide um texto em sentenças nos finais de frase e nas linhas em branco (Func._REGEX_FRASES).
+
+        Args:
+            texto: O texto.
+
+        Returns:
+            Uma lista que alterna sentenças (nas posições pares) e os separadores entre elas (nas posições
+            ímpares), de modo que ''.join da lista reproduz o texto.
+        """
+        partes = []
+        inicio = 0
+        for separador in Func._REGEX_FRASES.finditer(texto):
+            partes.append(texto[inicio:separador.start()])
+            partes.append(separador.group())
+            inicio = separador.end()
+        partes.append(texto[inicio:])
+        return partes
 
     @staticmethod
-    def summarize_text_simple(text):
+    def _traduz_google(sentencas: List[str], source_language: str, target_language: str) -> List[str]:
         """
-        Função que usa a API gratuita do ChatGPT para resumir um texto.
-    
+        Traduz um lote de sentenças com o cliente compartilhado do Google Tradutor. É o tradutor padrão de
+        Func.traduz_lote.
+
         Args:
-        text (str): O texto a ser resumido.
-    
+            sentencas: As sentenças.
+            source_language: O código ISO do idioma de origem, ou 'auto'.
+            target_language: O código ISO do idioma de destino.
+
         Returns:
-        O resumo do texto, gerado pela API do ChatGPT.
+            As traduções, na ordem das sentenças.
         """
-        # Configura o modelo e o prompt de entrada para a API
-        model_engine = "text-davinci-002"
-        prompt = f"Please summarize the following text:\n\n{text}\n\nSummary:"
+        traduzidas = Func.tradutor().translate(sentencas, src=source_language, dest=target_language)
+        return [traduzida.text for traduzida in traduzidas]
 
-        # Gera a saída usando a API do ChatGPT
-        response = openai.Completion.create(
-            engine=model_engine,
-            prompt=prompt,
-            max_tokens=1024,
-            n=1,
-            stop=None,
-            temperature=0.5,
-        )
+    @staticmethod
+    def cache_traducoes() -> 'CacheSQLite':
+        """
+        Retorna o cache persistente das traduções de Func.traduz_lote, criando-o na primeira chamada.
 
-        # Extrai o resumo da resposta da API
-        summary = response.choices[0].text.strip()
+        O cache fica no arquivo traducoes.sqlite da pasta de cache (veja Func.cache_resumos), sem validade.
 
-        return summary
+        Returns:
+            O CacheSQLite das traduções.
+        """
+        if Func._cache_traducoes is None:
+            Func._cache_traducoes = CacheSQLite(os.path.join(Func._pasta_cache(), 'traducoes.sqlite'),
+                                                max_entradas=1_000_000)
+        return Func._cache_traducoes
 
     @staticmethod
-    def summarize_text_full(text, engine="text-davinci-002", prompt_prefix="Please summarize the following text:\n\n", prompt_suffix="\n\nSummary:", max_tokens=1024, n=1, stop=None, temperature=0.5):
+    def text_to_audio(text: str, save_file: bool = False) -> None:
         """
-        Função que usa a API gratuita do ChatGPT para resumir um texto.
+        Função que gera um arquivo de áudio com um texto fornecido e reproduz o áudio.
     
+        Args: text (str): Texto a ser convertido em áudio. save_file (bool): Indica se o arquivo de áudio deve ser 
+        salvo. Se `False`, o arquivo é salvo como "audio.mp3". Se `True`, o arquivo é salvo com o nome no formato 
+        "YYYY-MM-DD_HH-MM-SS.mp3".
+        """
+        from gtts import gTTS
+
+        # Gerar arquivo de áudio com o texto fornecido
+        tts = gTTS(text=text, lang='pt-br')
+        audio_file = "audio.mp3" if not save_file else datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".mp3"
+        tts.save(audio_file)
+
+        # Reproduzir áudio
+        os.system(f"start {audio_file}")
+
+    @staticmethod
+    def audio_to_text(audio_file, reconhecedor=None, language: str = 'pt-BR', nome_reconhecedor: Optional[str] = None):
+        """
+        Função que recebe um arquivo de áudio e retorna seu conteúdo como texto.
+
+        O áudio é dividido em trechos nos silêncios e os trechos são transcritos em paralelo, com cache (veja
+        Func.transcreve_lote), de modo que gravações longas não são enviadas numa única requisição.
+
         Args:
-        text (str): O texto a ser resumido.
-        engine (str): O mecanismo do modelo a ser usado na API do ChatGPT (padrão: "text-davinci-002").
-        prompt_prefix (str): O prefixo do prompt de entrada para a API (padrão: "Please summarize the following text:\n\n").
-        prompt_suffix (str): O sufixo do prompt de entrada para a API (padrão: "\n\nSummary:").
-        max_tokens (int): O número máximo de tokens permitidos na resposta (padrão: 1024).
-        n (int): O número de respostas a serem geradas pela API (padrão: 1).
-        stop (str or List[str]): Uma string ou lista de strings que indica onde parar a geração da resposta (padrão: None).
-        temperature (float): Controla a aleatoriedade da geração de texto pela API (padrão: 0.5).
-    
+        audio_file (str): O caminho para o arquivo de áudio.
+        reconhecedor: A função que transcreve um trecho (padrão: o serviço da Google, veja Func.transcreve_lote).
+        language (str): O idioma do áudio.
+        nome_reconhecedor (str): O nome do reconhecedor no cache (veja Func.transcreve_lote).
+
         Returns:
-        O resumo do texto, gerado pela API do ChatGPT.
+        str: O conteúdo do áudio como texto.
         """
-    
-        # Monta o prompt de entrada para a API, com o texto fornecido
-        prompt = f"{prompt_prefix}{text}{prompt_suffix}"
-    
-        # Gera a saída usando a API do ChatGPT
-        response = openai.Completion.create(
-            engine=engine,
-            prompt=prompt,
-            max_tokens=max_tokens,
-            n=n,
-            stop=stop,
-            temperature=temperature,
-        )
-    
-        # Extrai o resumo da resposta da API
-        summary = response.choices[0].text.strip()
-    
-        return summary, response
+        return Func.transcreve_lote([audio_file], reconhecedor=reconhecedor, language=language,
+                                    nome_reconhecedor=nome_reconhecedor)[audio_file]
 
     @staticmethod
-    def cleaner(text, lang_code_short):
+    def transcreve_lote(arquivos: List[str], pasta_corpus: Optional[str] = None, reconhecedor=None,
+                        language: str = 'pt-BR', max_workers: int = 4, duracao_maxima: float = 60.0,
+                        min_silence_len: int = 500, silence_thresh: float = -16.0,
+                        usar_cache: bool = True, nome_reconhecedor: Optional[str] = None) -> Dict[str, str]:
         """
-        Recebe um texto e um código de idioma, realiza a limpeza do texto e retorna trigramas, bigramas,
-        lista de palavras filtradas, lista de hapaxes e uma segunda versão da lista filtrada sem hapaxes.
+        Transcreve várias gravações, dividindo cada uma em trechos alinhados aos silêncios e transcrevendo os
+        trechos em paralelo.
+
+        Cada áudio é dividido por Func.divide_audio em trechos de no máximo duracao_maxima segundos, cortados no
+        meio dos silêncios. Os trechos de todas as gravações são enviados ao reconhecedor por um pool de
+        max_workers threads. As transcrições ficam em Func.cache_transcricoes(), indexadas pelo hash do áudio do
+        trecho, pelo idioma e pelo reconhecedor, e a transcrição completa de cada arquivo, pelo hash do arquivo.
+        Assim, repetir a transcrição de um lote interrompido só envia os trechos que faltam.
+
+        Se pasta_corpus for informada, a transcrição de cada gravação é gravada em <pasta_corpus>/<nome>.txt
+        assim que todos os seus trechos terminam, pronta para Func.teste ou Func.le_corpus. Gravações de pastas
+        diferentes com o mesmo nome (como a/x.mp3 e b/x.wav) recebem o hash do caminho no nome do arquivo (veja
+        Func._nomes_transcricoes), para que uma transcrição não sobrescreva a outra.
 
         Args:
-            text (str): Texto a ser limpo.
-            lang_code_short (str): Código de idioma de duas letras.
+            arquivos: Os caminhos das gravações; caminhos repetidos são ignorados. Formatos além de WAV exigem o
+                ffmpeg.
+            pasta_corpus: A pasta onde as transcrições são gravadas; None para não gravar.
+            reconhecedor: Uma função (audio_wav: bytes, language: str) -> str que transcreve um trecho em WAV,
+                como um mecanismo offline ou uma função de teste. Se None, é usado o serviço da Google
+                (Func._reconhece_google).
+            language: O idioma das gravações, repassado ao reconhecedor.
+            max_workers: O número de trechos transcritos simultaneamente.
+            duracao_maxima: A duração máxima de um trecho, em segundos.
+            min_silence_len: A duração mínima, em milissegundos, de um silêncio usado como corte.
+            silence_thresh: O volume, em dB relativos ao volume médio da gravação, abaixo do qual há silêncio.
+            usar_cache: Se True, consulta e atualiza o cache de transcrições.
+            nome_reconhecedor: O nome do reconhecedor no cache; obrigatório nos mesmos casos que nome_backend em
+                Func.traduz_lote.
 
         Returns:
-            tuple: Uma tupla contendo uma lista de trigramas, uma lista de bigramas, uma lista de palavras
-            filtradas, uma lista de hapaxes e uma lista de palavras filtradas sem hapaxes.
+            Um dicionário caminho da gravação -> transcrição.
+
+        Raises:
+            ValueError: Se usar_cache for True e o nome do reconhecedor não puder ser determinado.
         """
-        # Tokenização do texto
-        text_tokens = nltk.tokenize.word_tokenize(text, language=lang_code_short)
+        reconhecedor = reconhecedor or Func._reconhece_google
+        nome_reconhecedor = nome_reconhecedor or Func._nome_funcao(reconhecedor)
+        if usar_cache and nome_reconhecedor is None:
+            raise ValueError("nome_reconhecedor é obrigatório para reconhecedores que não são funções com nome "
+                             "qualificado")
+        parametros = (duracao_maxima, min_silence_len, silence_thresh)
+        cache = Func.cache_transcricoes() if usar_cache else None
+        # Uma gravação listada mais de uma vez é transcrita uma única vez
+        arquivos = list(dict.fromkeys(arquivos))
+        if pasta_corpus is not None:
+            os.makedirs(pasta_corpus, exist_ok=True)
+            nomes = Func._nomes_transcricoes(arquivos)
 
-        # Definição das stopwords
-        stopwords = set(nltk.corpus.stopwords.words(lang_code_short))
+        transcricoes = {}
+        pendentes = {}
 
-        # Definição dos caracteres especiais que serão removidos
-        special_chars = string.punctuation + '`”\'\'``). .). .: .) ]: [: :] :[ ©\'–// /\'- ! ? ., . “'
+        def conclui(arquivo, chave_arquivo, textos):
+            texto = ' '.join(texto for texto in textos if texto)
+            transcricoes[arquivo] = texto
+            if cache is not None:
+                cache.set(chave_arquivo, texto)
+            if pasta_corpus is not None:
+                destino = os.path.join(pasta_corpus, nomes[arquivo])
+                with open(f'{destino}.tmp', 'w', encoding='utf-8') as saida:
+                    saida.write(texto)
+                os.replace(f'{destino}.tmp', destino)
 
-        # Remoção das stopwords e dos caracteres especiais
-        filtered_word_0 = [word.lower() for word in text_tokens if
-                           word.lower() not in stopwords and word.lower() not in special_chars]
+        def transcreve(trecho):
+            # Cada trecho é identificado pelo hash do seu áudio
+            audio = trecho.export(io.BytesIO(), format='wav').getvalue()
+            chave = CacheSQLite.chave('transcricao', hashlib.sha256(audio).hexdigest(), language, nome_reconhecedor)
+            if cache is not None:
+                texto = cache.get(chave)
+                if texto is not None:
+                    return texto
+            texto = reconhecedor(audio, language)
+            if cache is not None:
+                cache.set(chave, texto)
+            return texto
 
-        # Remoção dos número
-        filtered_word_1 = [re.sub('[0-9]', '', word) for word in filtered_word_0]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {}
+            for arquivo in arquivos:
+                with open(arquivo, 'rb') as entrada:
+                    hash_arquivo = hashlib.file_digest(entrada, 'sha256').hexdigest() \
+                        if hasattr(hashlib, 'file_digest') else hashlib.sha256(entrada.read()).hexdigest()
+                chave_arquivo = CacheSQLite.chave('transcricao_arquivo', hash_arquivo, language, nome_reconhecedor,
+                                                  parametros)
 
-        # Remoção de palavras com menos de dois caracteres
-        filtered_word = [word for word in filtered_word_1 if len(word) >= 2]
+                # Gravações já transcritas por completo não precisam nem ser decodificadas
+                texto = cache.get(chave_arquivo) if cache is not None else None
+                if texto is not None:
+                    conclui(arquivo, chave_arquivo, [texto])
+                    continue
 
-        # Criação das listas de trigramas e bigramas
-        output_tri = list(nltk.trigrams(filtered_word))
-        output_bi = list(nltk.bigrams(filtered_word))
+                trechos = Func.divide_audio(arquivo, duracao_maxima, min_silence_len, silence_thresh)
+                if not trechos:
+                    conclui(arquivo, chave_arquivo, [])
+                    continue
+                pendentes[arquivo] = [chave_arquivo, [None] * len(trechos), len(trechos)]
+                for posicao, trecho in enumerate(trechos):
+                    futuros[executor.submit(transcreve, trecho)] = (arquivo, posicao)
 
-        # Criação das listas de palavras únicas e palavras sem hapaxes
-        word_counts = Counter(filtered_word)
-        hapaxes = [word for word in word_counts if word_counts[word] == 1]
-        filtered_word_no_hap = [word for word in filtered_word if word not in hapaxes]
+            # Grava cada transcrição assim que todos os trechos da gravação terminam
+            for futuro in concurrent.futures.as_completed(futuros):
+                arquivo, posicao = futuros.pop(futuro)
+                estado = pendentes[arquivo]
+                estado[1][posicao] = futuro.result()
+                estado[2] -= 1
+                if estado[2] == 0:
+                    conclui(arquivo, estado[0], estado[1])
+                    del pendentes[arquivo]
 
-        return output_tri, output_bi, filtered_word, hapaxes, filtered_word_no_hap
+        return {arquivo: transcricoes[arquivo] for arquivo in arquivos}
 
     @staticmethod
-    def entities(texto):
+    def _nomes_transcricoes(arquivos: List[str]) -> Dict[str, str]:
         """
-        Função que extrai entidades nomeadas de um texto e identifica o idioma do texto.
+        Escolhe o nome do arquivo de texto da transcrição de cada gravação de Func.transcreve_lote.
+
+        O nome é o da gravação com a extensão .txt. Quando gravações diferentes (caminhos absolutos distintos) têm o
+        mesmo nome, o nome de cada uma recebe os primeiros caracteres do hash SHA-256 do seu caminho absoluto, como
+        em x-1a2b3c4d.txt, de modo que os nomes são únicos e estáveis entre execuções.
 
         Args:
-        texto (str): O texto para extrair entidades nomeadas e identificar idioma.
+            arquivos: Os caminhos das gravações.
 
         Returns:
-        tuple: Uma tupla contendo uma lista de entidades nomeadas, o código ISO do idioma, 
-        o nome do idioma em sua forma reduzida e o nome do modelo do Spacy usado para processar o texto.
-        """
-        # Remover quebras de linha do texto
-        text = re.sub(r'\n', '', texto)
-        texto = texto.replace('\n', ' ')
-
-        # Detectar idioma do texto
-        lang_code = detect(text=text, low_memory=False)
-
-        # Identificar nome do idioma em sua forma reduzida e nome do modelo Spacy correspondente
-        if lang_code['lang'] == 'en':
-            lang_code_short = 'english'
-            lang_code_full = 'en_core_web_sm'
-        elif lang_code['lang'] == 'pt':
-            lang_code_short = 'portuguese'
-            lang_code_full = 'pt_core_news_sm'
-        else:
-            lang_code_short = lang_code['lang']
-            lang_code_full = ''
-
-        # Extrair entidades nomeadas do texto usando modelo Spacy e adicioná-las à lista
-        ent_list = []
-        pln = spacy.load(lang_code_full)
-        documento = pln(texto)
-        for entidade in documento.ents:
-            if [entidade.text, entidade.label_] not in ent_list:
-                ent_list.append([entidade.text, entidade.label_])
+            Um dicionário caminho da gravação -> nome do arquivo da transcrição.
+        """
+        caminhos = {arquivo: os.path.abspath(arquivo) for arquivo in arquivos}
+        gravacoes = {}
+        for caminho in caminhos.values():
+            # A comparação ignora maiúsculas, para não colidir em sistemas de arquivos que também as ignoram
+            gravacoes.setdefault(pathlib.Path(caminho).stem.casefold(), set()).add(caminho)
 
-        # Retornar lista de entidades nomeadas, código ISO do idioma, nome do idioma em sua forma reduzida
-        # e nome do modelo do Spacy usado para processar o texto
-        lang_code = lang_code['lang']
-        return list(ent_list), lang_code, lang_code_short, lang_code_full
+        nomes = {}
+        for arquivo, caminho in caminhos.items():
+            nome = pathlib.Path(caminho).stem
+            if len(gravacoes[nome.casefold()]) > 1:
+                nome = f"{nome}-{hashlib.sha256(caminho.encode('utf-8', 'surrogatepass')).hexdigest()[:8]}"
+            nomes[arquivo] = f'{nome}.txt'
+        return nomes
 
     @staticmethod
-    def calcula_ome(texto: str) -> Tuple[List[str], Dict[str, float]]:
-        """Calcula a ordem média de evocação (OME) para cada palavra em um texto e retorna as
-        palavras ordenadas pela OME, do maior para o menor, juntamente com um dicionário
-        contendo as OMEs calculadas para cada palavra.
+    def divide_audio(arquivo: str, duracao_maxima: float = 60.0, min_silence_len: int = 500,
+                     silence_thresh: float = -16.0) -> list:
+        """
+        Divide uma gravação em trechos de no máximo duracao_maxima segundos, cortados no meio dos silêncios.
 
-        Argumentos:
-        texto -- O texto a ser analisado.
+        Os trechos com som são detectados com o pydub e agrupados em sequência enquanto couberem na duração
+        máxima; cada corte é feito no meio do silêncio entre dois trechos com som, para não partir palavras. Um
+        trecho com som mais longo que a duração máxima é cortado em partes iguais.
 
-        Retorna:
-        Uma tupla contendo uma lista de strings com as palavras ordenadas pela OME e um
-        dicionário onde cada chave é uma palavra do texto e cada valor é a OME calculada para essa palavra.
+        Args:
+            arquivo: O caminho da gravação.
+            duracao_maxima: A duração máxima de um trecho, em segundos.
+            min_silence_len: A duração mínima, em milissegundos, de um silêncio usado como corte.
+            silence_thresh: O volume, em dB relativos ao volume médio da gravação, abaixo do qual há silêncio.
+
+        Returns:
+            Uma lista de AudioSegment do pydub, na ordem da gravação. Gravações sem som retornam uma lista vazia.
         """
-        # Quebra o texto em uma lista de palavras
-        palavras = texto.split()
+        from pydub import AudioSegment
+        from pydub.silence import detect_nonsilent
 
-        # Calcular a frequência de cada palavra
-        frequencias = Counter(palavras)
+        audio = AudioSegment.from_file(arquivo)
+        maximo = int(duracao_maxima * 1000)
+        faixas = detect_nonsilent(audio, min_silence_len=min_silence_len, silence_thresh=audio.dBFS + silence_thresh)
 
-        # Calcular a ordem de cada palavra na lista
-        ordens = {}
-        for i, palavra in enumerate(palavras):
-            if palavra not in ordens:
-                ordens[palavra] = []
-            ordens[palavra].append(i + 1)  # adiciona a posição da palavra na lista
+        # Divide as faixas com som mais longas que a duração máxima
+        partes = []
+        for inicio, fim in faixas:
+            n = -(-(fim - inicio) // maximo)
+            limites = np.linspace(inicio, fim, n + 1).astype(int).tolist()
+            partes.extend(zip(limites[:-1], limites[1:]))
 
-        # Calcular a OME para cada palavra
-        ome = {}
-        for palavra in frequencias:
-            # soma as ordens de cada ocorrência da palavra na lista
-            soma_ordens = sum([ordem for ordem in ordens[palavra]])
-            # calcula a OME da palavra dividindo a soma das ordens pelo número de ocorrências
-            ome_palavra = soma_ordens / frequencias[palavra]
-            # adiciona a OME calculada ao dicionário ome, com a palavra como chave
-            ome[palavra] = ome_palavra
+        # Agrupa as faixas consecutivas enquanto couberem num trecho e corta no meio dos silêncios
+        cortes = []
+        for inicio, fim in partes:
+            if cortes and fim - cortes[-1][0] <= maximo:
+                cortes[-1][1] = fim
+            else:
+                cortes.append([inicio, fim])
 
-        # Ordenar as palavras pela OME (maior OME primeiro)
-        palavras_ordenadas = sorted(ome, key=ome.get, reverse=True)
+        trechos = []
+        for k, (inicio, fim) in enumerate(cortes):
+            antes = (cortes[k - 1][1] + inicio) // 2 if k else 0
+            depois = (fim + cortes[k + 1][0]) // 2 if k + 1 < len(cortes) else len(audio)
+            trechos.append(audio[antes:depois])
+        return trechos
 
-        # retorna as palavras ordenadas pela OME e o dicionário com as OMEs calculadas para cada palavra
-        return palavras_ordenadas, ome
+    @staticmethod
+    def _reconhece_google(audio_wav: bytes, language: str) -> str:
+        """
+        Transcreve um trecho de áudio em WAV com o serviço da Google. É o reconhecedor padrão de
+        Func.transcreve_lote.
+
+        Args:
+            audio_wav: O trecho em WAV.
+            language: O idioma do trecho.
+
+        Returns:
+            O texto reconhecido, ou uma string vazia se nenhuma fala for reconhecida.
+        """
+        import speech_recognition as sr
+
+        r = sr.Recognizer()
+        with sr.AudioFile(io.BytesIO(audio_wav)) as source:
+            audio_data = r.record(source)
+        try:
+            return r.recognize_google(audio_data, language=language)
+        except sr.UnknownValueError:
+            return ''
 
     @staticmethod
-    def analise_prototipica(palavras_ordenadas: list, ome: dict) -> Tuple[
-        List[Tuple[str, float]], List[Tuple[str, float]], List[Tuple[str, float]], List[Tuple[str, float]]]:
+    def cache_transcricoes() -> 'CacheSQLite':
         """
-        A função analise_prototipica analisa a distribuição das palavras em um texto de acordo com a teoria do
-        protótipo, que divide as palavras em quatro categorias: núcleo central, zona periférica 1, zona periférica 2
-        e zona periférica 3. A função recebe uma lista de palavras ordenadas pela OME (do maior para o menor) e um
-        dicionário contendo as OMEs calculadas para cada palavra. Retorna uma tupla contendo as quatro listas de
-        acordo com a análise prototípica.
+        Retorna o cache persistente das transcrições de Func.transcreve_lote, criando-o na primeira chamada.
+
+        O cache fica no arquivo transcricoes.sqlite da pasta de cache (veja Func.cache_resumos), sem validade, pois
+        o hash do áudio já faz parte da chave.
+
+        Returns:
+            O CacheSQLite das transcrições.
         """
+        if Func._cache_transcricoes is None:
+            Func._cache_transcricoes = CacheSQLite(os.path.join(Func._pasta_cache(), 'transcricoes.sqlite'),
+                                                   max_entradas=1_000_000)
+        return Func._cache_transcricoes
 
-        # Verifica se as entradas são válidas
-        if not isinstance(palavras_ordenadas, list) or not isinstance(ome, dict):
-            raise TypeError("palavras_ordenadas deve ser uma lista e ome deve ser um dicionário")
+    @staticmethod
+    def sumarizador_bert(modelo: Optional[str] = None, n_threads: Optional[int] = None) -> 'Summarizer':
+        """
+        Retorna o Summarizer de um modelo BERT, carregando os pesos apenas na primeira chamada do processo.
 
-        # Verifica se as entradas têm o mesmo tamanho
-        if len(palavras_ordenadas) != len(ome):
-            raise ValueError("palavras_ordenadas e ome devem ter o mesmo tamanho")
+        Os sumarizadores ficam guardados em Func._sumarizadores_bert e são compartilhados por todas as chamadas,
+        como os pipelines do Spacy em Func.pipeline_spacy.
 
-        # Cria uma lista de tuplas contendo as palavras e suas ome
-        palavras_omes = [(palavra, ome.get(palavra, 0)) for palavra in palavras_ordenadas]
+        Args:
+            modelo: O nome do modelo do Hugging Face. Se None, é o modelo padrão do Summarizer.
+            n_threads: Se informado, o número de threads usadas pelo PyTorch na CPU (torch.set_num_threads).
 
-        # Obtém a média da OME para a normalização
-        media_ome = np.mean(list(ome.values()))
+        Returns:
+            O Summarizer compartilhado do modelo.
+        """
+        if n_threads is not None:
+            import torch
+            torch.set_num_threads(n_threads)
 
-        # Cria as quatro listas de acordo com a análise prototípica
-        nucleo_central = [(palavra, ome / media_ome) for palavra, ome in palavras_omes if ome > media_ome]
+        sumarizador = Func._sumarizadores_bert.get(modelo)
+        if sumarizador is None:
+            with Func._trava_bert:
+                # Verifica novamente, pois outra thread pode ter carregado o modelo enquanto esperávamos
+                sumarizador = Func._sumarizadores_bert.get(modelo)
+                if sumarizador is None:
+                    from summarizer import Summarizer
+                    sumarizador = Summarizer() if modelo is None else Summarizer(model=modelo)
+                    Func._sumarizadores_bert[modelo] = sumarizador
+        return sumarizador
 
-        zona_periferica_1 = []
-        zona_periferica_2 = []
-        zona_periferica_3 = []
+    @staticmethod
+    def bert_sumarizar_text(text, num, modelo: Optional[str] = None):
+        # Obtém a instância compartilhada de Summarizer, carregada apenas na primeira chamada
+        sumarizador = Func.sumarizador_bert(modelo)
 
-        for i, (palavra, ome) in enumerate(palavras_omes):
-            ome_norm = ome / media_ome
-            if ome_norm <= 1:
-                if i < len(palavras_omes) * 0.25:
-                    zona_periferica_1.append((palavra, ome_norm))
-                elif i >= len(palavras_omes) * 0.25 and i < len(palavras_omes) * 0.75:
-                    zona_periferica_2.append((palavra, ome_norm))
-                    # Adiciona a palavra em zona_periferica_1 se já não estiver presente
-                    if palavra not in [p[0] for p in zona_periferica_1]:
-                        zona_periferica_1.append((palavra, ome_norm))
-                else:
-                    zona_periferica_3.append((palavra, ome_norm))
-                    # Adiciona a palavra em zona_periferica_1 ou zona_periferica_2 se já não estiver presente
-                    if palavra not in [p[0] for p in zona_periferica_1]:
-                        if palavra not in [p[0] for p in zona_periferica_2]:
-                            zona_periferica_1.append((palavra, ome_norm))
-                        else:
-                            zona_periferica_2.append((palavra, ome_norm))
-                    elif palavra not in [p[0] for p in zona_periferica_2]:
-                        zona_periferica_2.append((palavra, ome_norm))
-
-        # Retorna as quatro listas de acordo com a análise prototípica
-        return nucleo_central, zona_periferica_1, zona_periferica_2, zona_periferica_3
+        # Chama o método summarize da instância de Summarizer, passando o texto e o número de sentenças a serem 
+        # resumidas
+        resumo = sumarizador(text, num_sentences=num)
+
+        # Retorna o resumo gerado pelo Summarizer
+        return resumo
 
     @staticmethod
-    def teste(path_folder: str, hap_or_no_hap: str) -> Tuple:
-        """Executa o teste de análise prototípica no corpus especificado.
-    
+    def bert_sumarizar_lote(textos: List[str], num: int = 3, modelo: Optional[str] = None,
+                            n_threads: Optional[int] = None, min_length: int = 40, max_length: int = 600,
+                            use_first: bool = True, algorithm: str = 'kmeans', ratio: float = 0.2,
+                            tamanho_lote: int = 32) -> List[ResumoBert]:
+        """
+        Resume vários textos com o sumarizador BERT compartilhado e retorna, além de cada resumo, as sentenças do
+        texto e as posições das sentenças escolhidas.
+
+        As sentenças de todos os textos são separadas pelo sentence_handler do Summarizer e seus embeddings são
+        calculados juntos, em lotes de sentenças de tamanhos parecidos completadas com padding (veja
+        Func._embeddings_bert), em vez de uma chamada do modelo por sentença. As sentenças de cada texto são então
+        agrupadas como em SummaryProcessor.cluster_runner, com o ClusterFeatures da biblioteca, de modo que o
+        resumo é o de Func.bert_sumarizar_text, a menos de diferenças de arredondamento nos embeddings. Os
+        parâmetros têm o mesmo significado e os mesmos valores padrão de Summarizer.__call__.
+
         Args:
-            path_folder: O caminho da pasta que contém o corpus a ser utilizado.
-            hap_or_no_hap: Um parâmetro que determina se a análise prototípica deve ser realizada com palavras hapax
-            ou sem palavras hapax.
-    
+            textos: Os textos a serem resumidos.
+            num: O número de sentenças de cada resumo. Se None, é usada a proporção ratio.
+            modelo: O nome do modelo do Hugging Face (veja Func.sumarizador_bert).
+            n_threads: O número de threads usadas pelo PyTorch na CPU.
+            min_length: O tamanho mínimo, em caracteres, de uma sentença.
+            max_length: O tamanho máximo, em caracteres, de uma sentença.
+            use_first: Se True, a primeira sentença de cada texto sempre faz parte do resumo.
+            algorithm: O algoritmo de agrupamento ('kmeans' ou 'gmm').
+            ratio: A proporção de sentenças de cada resumo, quando num é None.
+            tamanho_lote: O número de sentenças enviadas ao modelo de cada vez.
+
         Returns:
-            Uma tupla contendo todos os resultados relevantes da análise.
-    
-        Raises:
-            ValueError: Se hap_or_no_hap não for 'hap' ou 'no_hap'.
+            Uma lista de ResumoBert, na ordem dos textos, com as sentenças de cada texto, os índices das sentenças
+            selecionadas (que podem ser passados a Func.visualiza_resumo) e o resumo.
         """
-        # Importa o texto do arquivo especificado
-        texto = Func.import_text_from_folder(f"{path_folder}")
+        sumarizador = Func.sumarizador_bert(modelo, n_threads)
+        sentencas = [sumarizador.sentence_handler(texto, min_length, max_length) for texto in textos]
+        embeddings = Func._embeddings_bert(sumarizador, [s for sentencas_texto in sentencas for s in sentencas_texto],
+                                           tamanho_lote)
 
-        # Identifica as entidades do texto e seu idioma
-        ent_list, lang_code, lang_code_short, lang_code_full = Func.entities(texto)
+        resumos = []
+        inicio = 0
+        for sentencas_texto in sentencas:
+            hidden = embeddings[inicio:inicio + len(sentencas_texto)]
+            inicio += len(sentencas_texto)
+            indices = Func._seleciona_sentencas(hidden, ratio, num, use_first, algorithm,
+                                                sumarizador.random_state) if sentencas_texto else []
+            resumos.append(ResumoBert(sentencas_texto, indices, ' '.join(sentencas_texto[i] for i in indices)))
+        return resumos
 
-        # Limpa o texto e obtém as listas filtradas de palavras
-        output_tri, output_bi, filtered_word, hapaxes, filtered_word_no_hap = Func.cleaner(texto, lang_code_short)
+    @staticmethod
+    def _embeddings_bert(sumarizador: 'Summarizer', sentencas: List[str], tamanho_lote: int = 32) -> np.ndarray:
+        """
+        Calcula os embeddings de sentenças com o modelo de um Summarizer, em lotes.
 
-        # Calcula a OME das palavras filtradas de acordo com o parâmetro hap_or_no_hap
-        if hap_or_no_hap == 'hap':
-            palavras_ordenadas, omes = Func.calcula_ome(' '.join(filtered_word))
-        elif hap_or_no_hap == 'no_hap':
-            palavras_ordenadas, omes = Func.calcula_ome(' '.join(filtered_word_no_hap))
-        else:
-            raise ValueError("hap_or_no_hap precisa ser 'hap' ou 'no_hap'")
+        Com o BertEmbedding da biblioteca (o modelo do Summarizer), as sentenças são tokenizadas como em
+        BertEmbedding.tokenize_input, ordenadas pelo número de tokens e enviadas ao modelo em lotes completados
+        com padding e máscara de atenção. O embedding de cada sentença é a redução (reduce_option) dos estados da
+        camada hidden nos seus próprios tokens, como em BertEmbedding.extract_embeddings. Outros modelos (como o
+        do SBert ou camadas concatenadas) recebem todas as sentenças numa única chamada.
 
-        # Realiza a análise prototípica das palavras filtradas
-        nucleo_central, zona_periferica_1, zona_periferica_2, zona_periferica_3 = Func.analise_prototipica(
-            palavras_ordenadas, omes)
+        Args:
+            sumarizador: O Summarizer cujo modelo calcula os embeddings.
+            sentencas: As sentenças.
+            tamanho_lote: O número de sentenças enviadas ao modelo de cada vez.
+
+        Returns:
+            Uma matriz com o embedding de cada sentença, na ordem de sentencas.
+        """
+        modelo = sumarizador.model
+        embedding = getattr(modelo, 'func', None)
+        opcoes = getattr(modelo, 'keywords', {})
+        camada = opcoes.get('hidden', -2)
+        reducao = opcoes.get('reduce_option', 'mean')
+        if not sentencas:
+            return np.zeros((0, 0), dtype=np.float32)
+        if not (hasattr(embedding, 'tokenizer') and hasattr(embedding, 'model') and isinstance(camada, int)
+                and reducao in ('mean', 'max', 'median')):
+            return np.asarray(modelo(sentencas))
 
-        # Formata os dados da análise para exibição em tabela
-        data = [["Núcleo Central", len(nucleo_central), "Zona Periférica 1", len(zona_periferica_1),
-                 "Zona Periférica 2", len(zona_periferica_2), "Zona Periférica 3", len(zona_periferica_3)]]
+        import torch
 
-        # Imprime a tabela dos resultados da análise
-        print(tabulate(data, headers=["", "Nº de Palavras", "", "Nº de Palavras", "", "Nº de Palavras", "",
-                                      "Nº de Palavras"]))
+        tokenizer = embedding.tokenizer
+        dispositivo = getattr(embedding, 'device', 'cpu')
+        ids = [tokenizer.convert_tokens_to_ids(tokenizer.tokenize(sentenca)) for sentenca in sentencas]
+        preenchimento = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
 
-        # Retorna todos os resultados relevantes
-        return texto, ent_list, lang_code, lang_code_short, lang_code_full, output_tri, data, \
-            output_bi, filtered_word, hapaxes, filtered_word_no_hap, palavras_ordenadas, omes, \
-            nucleo_central, zona_periferica_1, zona_periferica_2, zona_periferica_3
+        resultado = [None] * len(sentencas)
+        with torch.no_grad():
+            for posicoes, matriz, mascara in Func._lotes_preenchidos(ids, tamanho_lote, preenchimento):
+                saida = embedding.model(input_ids=torch.as_tensor(matriz, device=dispositivo),
+                                        attention_mask=torch.as_tensor(mascara, device=dispositivo),
+                                        output_hidden_states=True)
+                estados = saida.hidden_states[camada].cpu()
+                for linha, posicao in enumerate(posicoes):
+                    # Só os tokens da própria sentença entram na redução, sem o padding
+                    tokens = estados[linha, :len(ids[posicao])]
+                    if reducao == 'max':
+                        vetor = tokens.max(dim=0)[0]
+                    elif reducao == 'median':
+                        vetor = tokens.median(dim=0)[0]
+                    else:
+                        vetor = tokens.mean(dim=0)
+                    resultado[posicao] = vetor.numpy()
+        return np.asarray(resultado)
 
     @staticmethod
-    def translate_text(text, target_language):
+    def _lotes_preenchidos(ids: List[List[int]], tamanho_lote: int,
+                           preenchimento: int = 0) -> Iterator[Tuple[List[int], np.ndarray, np.ndarray]]:
         """
-        Função para traduzir um texto para outro idioma usando a biblioteca googletrans.
-    
+        Divide sequências de ids de tokens em lotes de sequências de tamanhos parecidos, completadas até o tamanho
+        da maior sequência do lote, de modo que o padding seja o menor possível.
+
         Args:
-        text (str): O texto a ser traduzido.
-        target_language (str): O código ISO do idioma de destino para a tradução, como 'pt' para português.
-    
+            ids: Os ids dos tokens de cada sequência.
+            tamanho_lote: O número máximo de sequências de cada lote.
+            preenchimento: O id usado para completar as sequências.
+
         Returns:
-        O texto traduzido para o idioma de destino.
+            Um iterador de tuplas (posicoes, matriz, mascara): as posições das sequências do lote em ids, a matriz
+            int64 dos ids completados e a máscara de atenção, 1 nos tokens das sequências e 0 no padding.
         """
-        translator = Translator()
-        translated_text = translator.translate(text, dest=target_language)
-        return translated_text.text
+        ordem = sorted(range(len(ids)), key=lambda i: len(ids[i]))
+        for inicio in range(0, len(ordem), tamanho_lote):
+            posicoes = ordem[inicio:inicio + tamanho_lote]
+            largura = max(len(ids[i]) for i in posicoes)
+            matriz = np.full((len(posicoes), largura), preenchimento, dtype=np.int64)
+            mascara = np.zeros((len(posicoes), largura), dtype=np.int64)
+            for linha, i in enumerate(posicoes):
+                matriz[linha, :len(ids[i])] = ids[i]
+                mascara[linha, :len(ids[i])] = 1
+            yield posicoes, matriz, mascara
 
     @staticmethod
-    def text_to_audio(text: str, save_file: bool = False) -> None:
+    def _seleciona_sentencas(hidden: np.ndarray, ratio: float, num: Optional[int], use_first: bool, algorithm: str,
+                             random_state: int) -> List[int]:
         """
-        Função que gera um arquivo de áudio com um texto fornecido e reproduz o áudio.
-    
-        Args: text (str): Texto a ser convertido em áudio. save_file (bool): Indica se o arquivo de áudio deve ser 
-        salvo. Se `False`, o arquivo é salvo como "audio.mp3". Se `True`, o arquivo é salvo com o nome no formato 
-        "YYYY-MM-DD_HH-MM-SS.mp3".
+        Escolhe as sentenças do resumo de um texto a partir dos embeddings já calculados das suas sentenças,
+        como SummaryProcessor.cluster_runner.
+
+        Returns:
+            As posições das sentenças escolhidas, em ordem crescente.
         """
-        # Gerar arquivo de áudio com o texto fornecido
-        tts = gTTS(text=text, lang='pt-br')
-        audio_file = "audio.mp3" if not save_file else datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".mp3"
-        tts.save(audio_file)
+        if use_first:
+            num = num - 1 if num else num
+            if len(hidden) <= 1:
+                return list(range(len(hidden)))
+            hidden = hidden[1:]
 
-        # Reproduzir áudio
-        os.system(f"start {audio_file}")
+        indices = Func._agrupa_embeddings(hidden, ratio, num, algorithm, random_state)
+        return [0] + [i + 1 for i in indices] if use_first else indices
 
     @staticmethod
-    def audio_to_text(audio_file):
+    def _agrupa_embeddings(hidden: np.ndarray, ratio: float, num: Optional[int], algorithm: str,
+                           random_state: int) -> List[int]:
         """
-        Função que recebe um arquivo de áudio e retorna seu conteúdo como texto.
+        Agrupa os embeddings com o ClusterFeatures do bert-extractive-summarizer e retorna as posições das
+        sentenças mais próximas dos centroides, em ordem crescente.
+        """
+        from summarizer.cluster_features import ClusterFeatures
 
-        Args:
-        audio_file (str): O caminho para o arquivo de áudio.
+        return [int(i) for i in ClusterFeatures(hidden, algorithm, random_state=random_state).cluster(ratio, num)]
 
-        Returns:
-        str: O conteúdo do áudio como texto.
+    @staticmethod
+    def benchmark_bert(textos: List[str], num: int = 3, repeticoes: int = 3, modelo: Optional[str] = None,
+                       n_threads: Optional[int] = None, tamanho_lote: int = 32) -> List[List]:
         """
+        Mede a latência por documento do sumarizador BERT, separando o carregamento do modelo das execuções com o
+        modelo já carregado, texto a texto (Func.bert_sumarizar_text) e em lote (Func.bert_sumarizar_lote).
 
-        # Inicializar o reconhecedor de fala
-        r = sr.Recognizer()
+        Args:
+            textos: Os textos usados na medição.
+            num: O número de sentenças de cada resumo.
+            repeticoes: O número de repetições de cada medição com o modelo carregado (é usada a menor).
+            modelo: O nome do modelo do Hugging Face.
+            n_threads: O número de threads usadas pelo PyTorch na CPU.
+            tamanho_lote: O número de sentenças enviadas ao modelo de cada vez no modo em lote.
 
-        # Ler arquivo de áudio
-        with sr.AudioFile(audio_file) as source:
-            audio_data = r.record(source)
+        Returns:
+            Uma lista de linhas [medição, segundos totais, segundos por documento], também impressa em tabela.
+        """
+        linhas = []
 
-        # Reconhecer texto do áudio usando o serviço da Google
-        text = r.recognize_google(audio_data, language='pt-BR')
+        # Carregamento do modelo (imediato se ele já tiver sido carregado neste processo)
+        inicio = time.perf_counter()
+        Func.sumarizador_bert(modelo, n_threads)
+        linhas.append(["Carregamento do modelo", time.perf_counter() - inicio, None])
 
-        # Retorna o texto reconhecido
-        return text
+        def mede(funcao):
+            tempos = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                funcao()
+                tempos.append(time.perf_counter() - inicio)
+            return min(tempos)
 
-    @staticmethod
-    def bert_sumarizar_text(text, num):
-        # Cria uma instância de Summarizer
-        sumarizador = Summarizer()
+        segundos = mede(lambda: [Func.bert_sumarizar_text(texto, num, modelo) for texto in textos])
+        linhas.append(["Texto a texto (bert_sumarizar_text)", segundos, segundos / max(len(textos), 1)])
 
-        # Chama o método summarize da instância de Summarizer, passando o texto e o número de sentenças a serem 
-        # resumidas
-        resumo = sumarizador(text, num_sentences=num)
+        segundos = mede(lambda: Func.bert_sumarizar_lote(textos, num, modelo, tamanho_lote=tamanho_lote))
+        linhas.append(["Em lote (bert_sumarizar_lote)", segundos, segundos / max(len(textos), 1)])
 
-        # Retorna o resumo gerado pelo Summarizer
-        return resumo
+        print(tabulate(linhas, headers=["Medição", "Segundos", "Segundos por documento"]))
+        return linhas
 
     @staticmethod
     def visualiza_resumo(titulo, lista_sentencas, melhores_sentencas):
+        from IPython.display import HTML, display
+
+        # As melhores sentenças podem ser as próprias sentenças ou seus índices (veja Func.bert_sumarizar_lote)
+        if all(isinstance(i, (int, np.integer)) for i in melhores_sentencas):
+            destacadas = {int(i) for i in melhores_sentencas}
+        else:
+            destacadas = {i for i, sentenca in enumerate(lista_sentencas) if sentenca in melhores_sentencas}
+
         # Cria uma string vazia
         texto = ""
 
@@ -611,11 +4401,180 @@ class Func:
         display(HTML(f'<h1>Resumo do texto - {titulo}</h1>'))
 
         # Itera sobre a lista de sentenças recebida pela função
-        for i in lista_sentencas:
+        for i, sentenca in enumerate(lista_sentencas):
             # Se a sentença atual estiver entre as melhores sentenças, adiciona uma marcação de destaque HTML
-            if i in melhores_sentencas:
-                texto += str(i).replace(i, f"<mark>{i}</mark>")
+            if i in destacadas:
+                texto += f"<mark>{sentenca}</mark>"
             else:
-                texto += i
+                texto += sentenca
         # Exibe o resumo do texto com as sentenças marcadas em destaque (se aplicável)
         display(HTML(f""" {texto} """))
+
+
+def _configura_openai() -> None:
+    """
+    Carrega a chave da API do OpenAI do arquivo .env (veja Func.api_loader) antes dos comandos que usam a API.
+    """
+    chave = Func.api_loader()
+    if chave:
+        import openai
+        openai.api_key = chave
+
+
+def _embeddings_openai(textos: List[str], engine: str = 'text-embedding-ada-002') -> np.ndarray:
+    """
+    Calcula os embeddings de textos com a API do OpenAI, com o mesmo modelo usado pelo índice do Llama. É o
+    embedder de Func.busca_local no comando query --local.
+    """
+    import openai
+    resposta = openai.Embedding.create(input=textos, model=engine)
+    return np.array([item['embedding'] for item in sorted(resposta['data'], key=lambda item: item['index'])],
+                    dtype=np.float32)
+
+
+def _comando_analyze(args) -> None:
+    """
+    Executa o comando analyze: Func.teste com uma pasta, Func.compara_grupos com várias.
+    """
+    if len(args.pastas) > 1:
+        Func.compara_grupos(args.pastas, args.modo, args.processos, args.artefatos, not args.sem_cache,
+                            args.relatorio)
+        return
+
+    perfilador = Perfilador() if args.perfil or args.trace else None
+    resultado = Func.teste(args.pastas[0], args.modo, args.artefatos, not args.sem_cache, perfilador)
+    print()
+    print(tabulate([[palavra, ome] for palavra, ome in resultado.nucleo_central],
+                   headers=["Núcleo Central", "OME normalizada"], floatfmt=".3f"))
+    if perfilador is not None:
+        print()
+        perfilador.relatorio()
+        if args.trace:
+            perfilador.salva_trace(args.trace)
+
+
+def _comando_index(args) -> None:
+    """
+    Executa o comando index: indexa uma pasta com o Llama, por completo ou incrementalmente.
+    """
+    _configura_openai()
+    if args.incremental:
+        index, alteracoes = Func.indexa_incremental(args.pasta, args.destino)
+        print(tabulate([[tipo, len(arquivos)] for tipo, arquivos in alteracoes.items()],
+                       headers=["Alteração", "Arquivos"]))
+    else:
+        os.makedirs(args.destino, exist_ok=True)
+        index = Func.llama_index_texts(args.pasta)
+        Func.saver(index, args.destino)
+    if args.formato == 'binario' and index is not None:
+        Func.saver(index, args.destino, formato='binario')
+
+
+def _comando_query(args) -> None:
+    """
+    Executa o comando query: Func.consulta_lote, ou Func.busca_local com --local.
+    """
+    _configura_openai()
+    if args.local:
+        resultados = Func.busca_local(args.indice, args.perguntas, k=args.k, embedder=_embeddings_openai)
+        for pergunta, trechos in zip(args.perguntas, resultados):
+            print(f"\n{pergunta}")
+            print(tabulate([[doc_id, score, texto[:100]] for doc_id, score, texto in trechos],
+                           headers=["Documento", "Similaridade", "Trecho"], floatfmt=".3f"))
+        return
+
+    index = Func.loader(args.indice)
+    versao_indice = None if args.sem_cache else Func.versao_indice(args.indice)
+    for resultado in Func.consulta_lote(index, args.perguntas, max_workers=args.workers,
+                                        versao_indice=versao_indice, similarity_top_k=args.k):
+        print(f"\n{resultado.pergunta}\n{resultado.resposta.strip()}")
+        print(tabulate([[doc_id, score] for doc_id, score, _ in resultado.fontes],
+                       headers=["Fonte", "Similaridade"], floatfmt=".3f"))
+
+
+def _comando_summarize(args) -> None:
+    """
+    Executa o comando summarize: resumo hierárquico com o ChatGPT, ou extrativo com o BERT.
+    """
+    textos = []
+    for arquivo in args.arquivos:
+        with open(arquivo, 'r', encoding='utf-8') as entrada:
+            textos.append(entrada.read())
+
+    if args.bert:
+        resumos = [resumo.resumo for resumo in Func.bert_sumarizar_lote(textos, args.bert, n_threads=args.threads)]
+    else:
+        _configura_openai()
+        resumos = [Func.summarize_text_hierarquico(texto, usar_cache=not args.sem_cache) for texto in textos]
+
+    for arquivo, resumo in zip(args.arquivos, resumos):
+        print(f"\n== {arquivo} ==\n{resumo.strip()}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Ponto de entrada da linha de comando.
+
+    As dependências pesadas (Spacy, NLTK, OpenAI, Llama, BERT etc.) são importadas apenas pelas funções que as
+    usam, de modo que cada comando carrega somente o que precisa.
+
+    Exemplos:
+        python main_pat.py analyze corpus/entrevistas --modo no_hap --perfil
+        python main_pat.py analyze grupo_a grupo_b grupo_c --relatorio comparacao.json
+        python main_pat.py index corpus/referencia indice --incremental --formato binario
+        python main_pat.py query indice "Qual é o tema central?" -k 3
+        python main_pat.py summarize entrevista.txt --bert 5
+
+    Args:
+        argv: Os argumentos da linha de comando (padrão: sys.argv[1:]).
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='main_pat.py', description="Análise de representações sociais segundo a "
+                                                                     "teoria de Moscovici.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    analyze = comandos.add_parser('analyze', help="Análise prototípica de um corpus, ou comparação de vários")
+    analyze.add_argument('pastas', nargs='+', help="Pasta(s) com os arquivos .txt do corpus; com mais de uma, os "
+                                                   "grupos são comparados (veja Func.compara_grupos)")
+    analyze.add_argument('--modo', choices=['hap', 'no_hap'], default='hap', help="Com ou sem palavras hapax")
+    analyze.add_argument('--artefatos', help="Pasta dos resultados intermediários (veja PipelineAnalise)")
+    analyze.add_argument('--sem-cache', action='store_true', help="Recalcula todas as etapas")
+    analyze.add_argument('--processos', type=int, help="Número de processos na comparação de grupos")
+    analyze.add_argument('--relatorio', help="Arquivo JSON do relatório da comparação de grupos")
+    analyze.add_argument('--perfil', action='store_true', help="Mede o tempo e a memória de cada etapa")
+    analyze.add_argument('--trace', help="Arquivo JSON do trace das etapas (formato do Chrome)")
+    analyze.set_defaults(funcao=_comando_analyze)
+
+    index = comandos.add_parser('index', help="Indexa um corpus de referência com o Llama")
+    index.add_argument('pasta', help="Pasta com os documentos do corpus")
+    index.add_argument('destino', help="Pasta onde o índice é salvo")
+    index.add_argument('--incremental', action='store_true', help="Reindexa apenas os arquivos novos ou alterados")
+    index.add_argument('--formato', choices=['json', 'binario'], default='json',
+                       help="Também salva o índice no formato binário (veja IndiceBinario)")
+    index.set_defaults(funcao=_comando_index)
+
+    query = comandos.add_parser('query', help="Consulta um índice")
+    query.add_argument('indice', help="Pasta do índice")
+    query.add_argument('perguntas', nargs='+', help="As perguntas")
+    query.add_argument('-k', type=int, default=5, help="Número de trechos similares usados em cada resposta")
+    query.add_argument('--local', action='store_true',
+                       help="Apenas busca os trechos similares no índice binário, sem gerar respostas")
+    query.add_argument('--workers', type=int, default=8, help="Número de consultas simultâneas")
+    query.add_argument('--sem-cache', action='store_true', help="Ignora o cache de respostas")
+    query.set_defaults(funcao=_comando_query)
+
+    summarize = comandos.add_parser('summarize', help="Resume arquivos de texto")
+    summarize.add_argument('arquivos', nargs='+', help="Os arquivos de texto")
+    summarize.add_argument('--bert', type=int, metavar='N', help="Resumo extrativo com N sentenças usando o BERT, "
+                                                                "em vez da API do ChatGPT")
+    summarize.add_argument('--threads', type=int, help="Número de threads do PyTorch na CPU (com --bert)")
+    summarize.add_argument('--sem-cache', action='store_true', help="Ignora o cache de respostas")
+    summarize.set_defaults(funcao=_comando_summarize)
+
+    args = parser.parse_args(argv)
+    args.funcao(args)
+
+
+if __name__ == '__main__':
+    main()
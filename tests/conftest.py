@@ -0,0 +1,62 @@
+import os
+import sys
+
+# Os testes importam main_pat diretamente da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import types
+
+import pytest
+
+# Stopwords reduzidas usadas no lugar dos corpora do NLTK
+STOPWORDS = {
+    'portuguese': frozenset({'a', 'o', 'e', 'de', 'da', 'do', 'em', 'que', 'um', 'uma', 'no', 'na'}),
+    'english': frozenset({'the', 'a', 'of', 'and', 'in', 'is', 'to', 'an'}),
+}
+
+# Entidades reconhecidas pelos pipelines falsos do Spacy
+ENTIDADES = [{'label': 'LOC', 'pattern': 'Brasil'}, {'label': 'LOC', 'pattern': 'Recife'},
+             {'label': 'GPE', 'pattern': 'London'}, {'label': 'PER', 'pattern': 'Maria'}]
+
+
+def detecta_falso(text, low_memory=False):
+    """Detector de idioma do ftlangdetect falso: inglês se houver 'the' ou 'and', senão português."""
+    return {'lang': 'en' if re.search(r'\b(the|and)\b', text, re.IGNORECASE) else 'pt', 'score': 1.0}
+
+
+@pytest.fixture
+def recursos_falsos(monkeypatch):
+    """
+    Substitui os recursos de linguagem que dependem de downloads (modelos do fastText e do Spacy, dados do NLTK)
+    por versões pequenas e determinísticas, registrando os idiomas usados em cada chamada.
+    """
+    import nltk
+    import spacy
+
+    from main_pat import Func
+
+    usados = {'spacy': [], 'stopwords': [], 'deteccoes': []}
+
+    def detect(text, low_memory=False):
+        usados['deteccoes'].append(text)
+        return detecta_falso(text, low_memory)
+
+    def carrega_pipeline(lang_code):
+        usados['spacy'].append(lang_code)
+        pln = spacy.blank(lang_code)
+        pln.add_pipe('entity_ruler').add_patterns(ENTIDADES)
+        return pln
+
+    def stopwords(lang_code_short):
+        usados['stopwords'].append(lang_code_short)
+        return STOPWORDS[lang_code_short]
+
+    monkeypatch.setitem(sys.modules, 'ftlangdetect', types.SimpleNamespace(detect=detect))
+    monkeypatch.setattr(nltk.tokenize, 'word_tokenize', lambda texto, language='english': re.findall(
+        r'\w+|[^\w\s]', texto))
+    monkeypatch.setattr(Func, '_carrega_pipeline_spacy', staticmethod(carrega_pipeline))
+    monkeypatch.setattr(Func, '_stopwords', staticmethod(stopwords))
+    monkeypatch.setattr(Func, '_pipelines_spacy', {})
+    monkeypatch.setattr(Func, '_idiomas_detectados', {})
+    return usados
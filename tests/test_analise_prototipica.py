@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from main_pat import CorpusCompacto, Func
+
+
+def analise_prototipica_referencia(palavras_ordenadas: list, ome: dict):
+    """
+    Implementação original (quadrática) da análise prototípica, usada como referência para verificar a
+    equivalência de Func.analise_prototipica.
+    """
+
+    # Verifica se as entradas são válidas
+    if not isinstance(palavras_ordenadas, list) or not isinstance(ome, dict):
+        raise TypeError("palavras_ordenadas deve ser uma lista e ome deve ser um dicionário")
+
+    # Verifica se as entradas têm o mesmo tamanho
+    if len(palavras_ordenadas) != len(ome):
+        raise ValueError("palavras_ordenadas e ome devem ter o mesmo tamanho")
+
+    # Cria uma lista de tuplas contendo as palavras e suas ome
+    palavras_omes = [(palavra, ome.get(palavra, 0)) for palavra in palavras_ordenadas]
+
+    # Obtém a média da OME para a normalização
+    media_ome = np.mean(list(ome.values()))
+
+    # Cria as quatro listas de acordo com a análise prototípica
+    nucleo_central = [(palavra, ome / media_ome) for palavra, ome in palavras_omes if ome > media_ome]
+
+    zona_periferica_1 = []
+    zona_periferica_2 = []
+    zona_periferica_3 = []
+
+    for i, (palavra, ome) in enumerate(palavras_omes):
+        ome_norm = ome / media_ome
+        if ome_norm <= 1:
+            if i < len(palavras_omes) * 0.25:
+                zona_periferica_1.append((palavra, ome_norm))
+            elif i >= len(palavras_omes) * 0.25 and i < len(palavras_omes) * 0.75:
+                zona_periferica_2.append((palavra, ome_norm))
+                # Adiciona a palavra em zona_periferica_1 se já não estiver presente
+                if palavra not in [p[0] for p in zona_periferica_1]:
+                    zona_periferica_1.append((palavra, ome_norm))
+            else:
+                zona_periferica_3.append((palavra, ome_norm))
+                # Adiciona a palavra em zona_periferica_1 ou zona_periferica_2 se já não estiver presente
+                if palavra not in [p[0] for p in zona_periferica_1]:
+                    if palavra not in [p[0] for p in zona_periferica_2]:
+                        zona_periferica_1.append((palavra, ome_norm))
+                    else:
+                        zona_periferica_2.append((palavra, ome_norm))
+                elif palavra not in [p[0] for p in zona_periferica_2]:
+                    zona_periferica_2.append((palavra, ome_norm))
+
+    # Retorna as quatro listas de acordo com a análise prototípica
+    return nucleo_central, zona_periferica_1, zona_periferica_2, zona_periferica_3
+
+
+def vocabulario_sintetico(tamanho, semente):
+    gerador = np.random.default_rng(semente)
+    ome = dict(zip((f"palavra{i}" for i in range(tamanho)), gerador.gamma(2.0, 50.0, size=tamanho).tolist()))
+    return sorted(ome, key=ome.get, reverse=True), ome, gerador
+
+
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 4, 7, 50, 1_000])
+@pytest.mark.parametrize("semente", [0, 1, 2])
+def test_equivale_a_referencia(tamanho, semente):
+    palavras_ordenadas, ome, _ = vocabulario_sintetico(tamanho, semente)
+
+    assert Func.analise_prototipica(palavras_ordenadas, ome) == analise_prototipica_referencia(
+        palavras_ordenadas, ome)
+
+
+@pytest.mark.parametrize("tamanho", [4, 9, 40, 500])
+@pytest.mark.parametrize("semente", [0, 1, 2, 3])
+def test_equivale_a_referencia_com_palavras_repetidas(tamanho, semente):
+    _, ome, gerador = vocabulario_sintetico(tamanho, semente)
+    # Sorteia com reposição, de modo que algumas palavras se repetem e outras ficam de fora (OME 0 ausente)
+    palavras_ordenadas = gerador.choice(list(ome), size=tamanho).tolist()
+    assert len(set(palavras_ordenadas)) < tamanho
+
+    assert Func.analise_prototipica(palavras_ordenadas, ome) == analise_prototipica_referencia(
+        palavras_ordenadas, ome)
+
+
+def test_equivale_a_referencia_com_omes_empatadas():
+    ome = {f"palavra{i}": float(i % 3) + 1 for i in range(12)}
+    palavras_ordenadas = sorted(ome, key=ome.get, reverse=True)
+
+    assert Func.analise_prototipica(palavras_ordenadas, ome) == analise_prototipica_referencia(
+        palavras_ordenadas, ome)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_entrada_vazia():
+    assert Func.analise_prototipica([], {}) == analise_prototipica_referencia([], {}) == ([], [], [], [])
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_corpus_compacto_vazio():
+    assert Func.analise_prototipica(CorpusCompacto.constroi([])) == ([], [], [], [])
+
+
+@pytest.mark.parametrize("semente", [0, 1, 2])
+def test_corpus_compacto_equivale_a_referencia(semente):
+    gerador = np.random.default_rng(semente)
+    vocabulario = [f"palavra{i}" for i in range(60)]
+    documentos = [gerador.choice(vocabulario, size=gerador.integers(1, 15)).tolist() for _ in range(40)]
+    corpus = CorpusCompacto.constroi(documentos)
+
+    palavras_ordenadas, ome = Func.calcula_ome(" ".join(" ".join(documento) for documento in documentos))
+
+    assert Func.analise_prototipica(corpus) == analise_prototipica_referencia(palavras_ordenadas, ome)
+
+
+def test_entradas_invalidas():
+    with pytest.raises(TypeError):
+        Func.analise_prototipica(("a",), {"a": 1.0})
+    with pytest.raises(ValueError):
+        Func.analise_prototipica(["a", "b"], {"a": 1.0})
+
+
+def test_benchmark_compara_com_referencia():
+    linhas = Func.benchmark_analise_prototipica((100, 2_000), referencia=analise_prototipica_referencia,
+                                                limite_referencia=1_000)
+
+    assert [linha[0] for linha in linhas] == [100, 2_000]
+    assert linhas[0][3] is True
+    assert linhas[1][2] is None and linhas[1][3] is None
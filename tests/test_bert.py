@@ -0,0 +1,201 @@
+import re
+
+import numpy as np
+import pytest
+
+from main_pat import Func
+
+TEXTOS = [
+    "A praia de Boa Viagem fica cheia durante todo o verão. Os turistas chegam cedo para aproveitar o sol forte. "
+    "O mar é agitado e exige cuidado dos banhistas. Os quiosques vendem água de coco e peixe frito na areia. "
+    "À tarde, o vento do mar torna o calor mais suportável. Muitos moradores caminham no calçadão ao entardecer.",
+    "O trabalho remoto mudou a rotina de muitas famílias brasileiras. Os deslocamentos diários deixaram de "
+    "existir para boa parte das pessoas. Em compensação, a casa passou a ser também o escritório da família.",
+    "Uma única sentença longa o bastante para passar pelo filtro de tamanho.",
+    "",
+    "Curta. Também curta.",
+    "A mesma sentença aparece duas vezes neste texto de exemplo. Depois vem uma sentença diferente das outras. "
+    "A mesma sentença aparece duas vezes neste texto de exemplo. E o texto termina com mais uma sentença nova.",
+]
+
+
+def modelo_falso(sentencas):
+    """Embeddings determinísticos: frequência de algumas letras e tamanho de cada sentença."""
+    return np.asarray([[len(s)] + [s.lower().count(letra) for letra in 'aeiosr'] for s in sentencas],
+                      dtype=np.float64)
+
+
+class SumarizadorFalso:
+    """
+    Reproduz SummaryProcessor.run e SummaryProcessor.cluster_runner do bert-extractive-summarizer 0.10.1, com o
+    modelo de embeddings falso e, no lugar do ClusterFeatures, a escolha das sentenças de maior norma.
+    """
+
+    def __init__(self):
+        self.model = modelo_falso
+        self.random_state = 12345
+
+    def sentence_handler(self, body, min_length=40, max_length=600):
+        return [s for s in re.split(r'(?<=[.!?])\s+', body.strip()) if min_length <= len(s) <= max_length]
+
+    @staticmethod
+    def agrupa(hidden, ratio, num_sentences):
+        k = min(num_sentences, len(hidden)) if num_sentences is not None else max(int(len(hidden) * ratio), 1)
+        if k == 0:
+            return []
+        return sorted(np.argsort(-np.linalg.norm(hidden, axis=1), kind='stable')[:k].tolist())
+
+    def cluster_runner(self, sentences, ratio=0.2, algorithm='kmeans', use_first=True, num_sentences=3):
+        first_embedding = None
+        hidden = self.model(sentences)
+
+        if use_first:
+            num_sentences = num_sentences - 1 if num_sentences else num_sentences
+            if len(sentences) <= 1:
+                return sentences, hidden
+            first_embedding = hidden[0, :]
+            hidden = hidden[1:, :]
+
+        summary_sentence_indices = self.agrupa(hidden, ratio, num_sentences)
+
+        if use_first:
+            if summary_sentence_indices:
+                summary_sentence_indices = [i + 1 for i in summary_sentence_indices]
+                summary_sentence_indices.insert(0, 0)
+            else:
+                summary_sentence_indices.append(0)
+            hidden = np.vstack([first_embedding, hidden])
+
+        return [sentences[j] for j in summary_sentence_indices], np.asarray(
+            [hidden[j] for j in summary_sentence_indices])
+
+    def __call__(self, body, ratio=0.2, min_length=40, max_length=600, use_first=True, algorithm='kmeans',
+                 num_sentences=None, return_as_list=False):
+        sentences = self.sentence_handler(body, min_length, max_length)
+        if sentences:
+            sentences, _ = self.cluster_runner(sentences, ratio, algorithm, use_first, num_sentences)
+        return sentences if return_as_list else ' '.join(sentences)
+
+
+@pytest.fixture
+def sumarizador(monkeypatch):
+    sumarizador = SumarizadorFalso()
+    monkeypatch.setattr(Func, '_sumarizadores_bert', {None: sumarizador})
+    monkeypatch.setattr(Func, '_agrupa_embeddings', staticmethod(
+        lambda hidden, ratio, num, algorithm, random_state: SumarizadorFalso.agrupa(hidden, ratio, num)))
+    return sumarizador
+
+
+@pytest.mark.parametrize("num", [1, 2, 3, 5])
+@pytest.mark.parametrize("use_first", [True, False])
+def test_lote_equivale_a_bert_sumarizar_text(sumarizador, num, use_first):
+    resumos = Func.bert_sumarizar_lote(TEXTOS, num, use_first=use_first)
+
+    assert len(resumos) == len(TEXTOS)
+    for texto, resumo in zip(TEXTOS, resumos):
+        assert resumo.sentencas == sumarizador.sentence_handler(texto)
+        assert resumo.resumo == sumarizador(texto, num_sentences=num, use_first=use_first)
+        assert resumo.resumo == ' '.join(resumo.sentencas[i] for i in resumo.indices)
+        assert resumo.indices == sorted(set(resumo.indices))
+        assert len(resumo.indices) <= num
+        if use_first and resumo.sentencas:
+            assert resumo.indices[0] == 0
+    if use_first:
+        assert [resumo.resumo for resumo in resumos] == [Func.bert_sumarizar_text(texto, num) for texto in TEXTOS]
+
+
+def test_textos_sem_sentencas(sumarizador):
+    vazio, curto = Func.bert_sumarizar_lote(["", "Curta. Também curta."], 3)
+
+    assert vazio.sentencas == vazio.indices == [] and vazio.resumo == ''
+    assert curto.sentencas == curto.indices == [] and curto.resumo == ''
+
+
+def test_sentencas_de_todos_os_textos_vao_juntas_ao_modelo(sumarizador):
+    chamadas = []
+
+    def modelo(sentencas):
+        chamadas.append(list(sentencas))
+        return modelo_falso(sentencas)
+
+    sumarizador.model = modelo
+    Func.bert_sumarizar_lote(TEXTOS, 3)
+
+    assert chamadas == [[s for texto in TEXTOS for s in sumarizador.sentence_handler(texto)]]
+
+
+def test_lotes_preenchidos_agrupam_sequencias_de_tamanhos_parecidos():
+    ids = [[1, 2, 3], [4], [5, 6, 7, 8, 9], [10, 11], [12, 13, 14, 15]]
+
+    lotes = list(Func._lotes_preenchidos(ids, 2, preenchimento=-1))
+
+    assert [posicoes for posicoes, _, _ in lotes] == [[1, 3], [0, 4], [2]]
+    for posicoes, matriz, mascara in lotes:
+        assert matriz.shape == mascara.shape == (len(posicoes), max(len(ids[i]) for i in posicoes))
+        for linha, i in enumerate(posicoes):
+            assert matriz[linha][mascara[linha] == 1].tolist() == ids[i]
+            assert (matriz[linha][mascara[linha] == 0] == -1).all()
+
+
+class TokenizadorFalso:
+    pad_token_id = 0
+
+    def tokenize(self, texto):
+        return texto.lower().split()
+
+    def convert_tokens_to_ids(self, tokens):
+        return [1 + sum(map(ord, token)) % 97 for token in tokens]
+
+
+def test_embeddings_em_lote_ignoram_o_padding():
+    torch = pytest.importorskip("torch")
+    from functools import partial
+    from types import SimpleNamespace
+
+    class ModeloFalso(torch.nn.Module):
+        """Cada camada soma aos estados a média dos estados dos tokens reais da sentença."""
+
+        def __init__(self):
+            super().__init__()
+            self.tabela = torch.nn.Embedding(100, 8)
+
+        def forward(self, input_ids, attention_mask=None, output_hidden_states=True):
+            if attention_mask is None:
+                attention_mask = torch.ones_like(input_ids)
+            mascara = attention_mask.unsqueeze(-1).float()
+            estados = [self.tabela(input_ids)]
+            for _ in range(3):
+                media = (estados[-1] * mascara).sum(1, keepdim=True) / mascara.sum(1, keepdim=True)
+                estados.append(torch.tanh(estados[-1] + media))
+            return SimpleNamespace(hidden_states=tuple(estados))
+
+    embedding = SimpleNamespace(tokenizer=TokenizadorFalso(), model=ModeloFalso().eval(), device='cpu')
+    sentencas = [s for texto in TEXTOS for s in re.split(r'(?<=[.!?])\s+', texto) if s]
+
+    for reducao in ('mean', 'max', 'median'):
+        sumarizador = SimpleNamespace(model=partial(embedding, hidden=-2, reduce_option=reducao))
+        em_lote = Func._embeddings_bert(sumarizador, sentencas, tamanho_lote=4)
+
+        for sentenca, vetor in zip(sentencas, em_lote):
+            ids = torch.tensor([embedding.tokenizer.convert_tokens_to_ids(embedding.tokenizer.tokenize(sentenca))])
+            with torch.no_grad():
+                estados = embedding.model(ids).hidden_states[-2][0]
+            esperado = {'mean': estados.mean(0), 'max': estados.max(0)[0], 'median': estados.median(0)[0]}[reducao]
+            np.testing.assert_allclose(vetor, esperado.numpy(), rtol=1e-5, atol=1e-6)
+
+
+def test_summary_processor_da_biblioteca(monkeypatch):
+    summary_processor = pytest.importorskip("summarizer.summary_processor")
+    sentence_handler = pytest.importorskip("summarizer.text_processors.sentence_handler")
+
+    sumarizador = summary_processor.SummaryProcessor(modelo_falso, sentence_handler.SentenceHandler())
+    monkeypatch.setattr(Func, '_sumarizadores_bert', {None: sumarizador})
+
+    for use_first in (True, False):
+        resumos = Func.bert_sumarizar_lote(TEXTOS, 3, use_first=use_first)
+
+        assert [resumo.resumo for resumo in resumos] == [sumarizador(texto, num_sentences=3, use_first=use_first)
+                                                         for texto in TEXTOS]
+        for resumo in resumos:
+            assert resumo.resumo == ' '.join(resumo.sentencas[i] for i in resumo.indices)
+            assert len(resumo.indices) <= 3
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from main_pat import BuscaVetorial, Func, IndiceBinario
+
+
+@pytest.fixture(autouse=True)
+def limpa_buscas(monkeypatch):
+    monkeypatch.setattr(Func, '_buscas_locais', {})
+
+
+def test_busca_os_trechos_mais_similares(tmp_path):
+    pasta = str(tmp_path / 'indice')
+    IndiceBinario.salva(pasta, ['n0', 'n1', 'n2'], ['d0', 'd1', 'd2'], [[1, 0], [0, 1], [1, 1]],
+                        ['norte', 'leste', 'nordeste'])
+
+    resultados = Func.busca_local(pasta, np.array([[1.0, 0.1]], dtype=np.float32), k=2)
+
+    assert [(doc_id, texto) for doc_id, _, texto in resultados[0]] == [('d0', 'norte'), ('d2', 'nordeste')]
+
+
+def test_indice_regravado_nao_e_servido_do_cache(tmp_path):
+    pasta = str(tmp_path / 'indice')
+    IndiceBinario.salva(pasta, ['n0', 'n1'], ['d0', 'd1'], [[1, 0], [0, 1]], ['antigo', 'outro'])
+    pergunta = np.array([[1.0, 0.0]], dtype=np.float32)
+    assert Func.busca_local(pasta, pergunta, k=1)[0][0][2] == 'antigo'
+    indice_antigo = Func._buscas_locais[pasta][1]
+
+    # Regrava o índice com o mesmo tamanho, mas com outro conteúdo
+    IndiceBinario.salva(pasta, ['n0', 'n1'], ['d9', 'd1'], [[1, 0], [0, 1]], ['recente', 'outro'])
+
+    doc_id, _, texto = Func.busca_local(pasta, pergunta, k=1)[0][0]
+    assert (doc_id, texto) == ('d9', 'recente')
+    # O índice aberto antes continua lendo os arquivos antigos, que não foram truncados
+    assert indice_antigo.texto(0) == 'antigo'
+
+
+@pytest.mark.parametrize("embeddings", [[], np.zeros((0, 2), dtype=np.float32)])
+def test_indice_vazio(tmp_path, embeddings):
+    pasta = str(tmp_path / 'indice')
+    IndiceBinario.salva(pasta, [], [], embeddings, [])
+    perguntas = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+
+    assert Func.busca_local(pasta, perguntas, k=3) == [[], []]
+    assert Func.busca_local(pasta, perguntas, k=3, n_sondas=2) == [[], []]
+
+    busca = BuscaVetorial(np.asarray(embeddings, dtype=np.float32))
+    busca.constroi_ivf()
+    indices, scores = busca.busca_ivf(perguntas, k=3)
+    assert indices.tolist() == [[-1] * 3] * 2
+    assert np.isneginf(scores).all() and scores.shape == (2, 3)
@@ -0,0 +1,131 @@
+import asyncio
+
+import openai
+import pytest
+
+from main_pat import CacheSQLite, Func, LimitadorTokens
+
+
+class Relogio:
+    """Relógio manual: o tempo só avança quando o teste manda."""
+
+    def __init__(self, agora=1_000.0):
+        self.agora = agora
+        self.esperas = []
+
+    def __call__(self):
+        return self.agora
+
+    async def dorme(self, segundos):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+
+@pytest.fixture
+def relogio():
+    return Relogio()
+
+
+@pytest.fixture
+def chamadas(monkeypatch):
+    """Substitui openai.Completion.create por um endpoint falso que registra os prompts recebidos."""
+    prompts = []
+
+    def create(**parametros):
+        prompts.append(parametros['prompt'])
+        return openai.util.convert_to_openai_object({'choices': [{'text': f" resumo {len(prompts)} "}]})
+
+    monkeypatch.setattr(openai.Completion, 'create', create)
+    return prompts
+
+
+def usa_cache(monkeypatch, tmp_path, relogio, **kwargs):
+    cache = CacheSQLite(str(tmp_path / 'resumos.sqlite'), relogio=relogio, **kwargs)
+    monkeypatch.setattr(Func, '_cache_resumos', cache)
+    return cache
+
+
+def test_prompt_repetido_usa_o_cache(monkeypatch, tmp_path, relogio, chamadas):
+    cache = usa_cache(monkeypatch, tmp_path, relogio)
+
+    assert Func.summarize_text_simple("texto a") == "resumo 1"
+    assert Func.summarize_text_simple("texto a") == "resumo 1"
+    assert Func.summarize_text_full("texto a", prompt_prefix="Resuma:\n")[0] == "resumo 2"
+
+    assert len(chamadas) == 2
+    assert cache.estatisticas()['acertos'] == 1
+    assert cache.estatisticas()['entradas'] == 2
+
+
+def test_sem_cache_sempre_chama_a_api(monkeypatch, tmp_path, relogio, chamadas):
+    cache = usa_cache(monkeypatch, tmp_path, relogio)
+
+    Func.summarize_text_simple("texto a", usar_cache=False)
+    Func.summarize_text_simple("texto a", usar_cache=False)
+
+    assert len(chamadas) == 2
+    assert cache.estatisticas()['entradas'] == 0
+
+
+def test_entrada_vencida_chama_a_api_novamente(monkeypatch, tmp_path, relogio, chamadas):
+    usa_cache(monkeypatch, tmp_path, relogio, ttl=60)
+
+    Func.summarize_text_simple("texto a")
+    relogio.agora += 59
+    assert Func.summarize_text_simple("texto a") == "resumo 1"
+    relogio.agora += 61
+    assert Func.summarize_text_simple("texto a") == "resumo 2"
+
+    assert len(chamadas) == 2
+
+
+def test_descarta_a_entrada_usada_ha_mais_tempo(monkeypatch, tmp_path, relogio, chamadas):
+    cache = usa_cache(monkeypatch, tmp_path, relogio, max_entradas=2)
+
+    for texto in ("a", "b", "a", "c"):
+        Func.summarize_text_simple(texto)
+        relogio.agora += 1
+    assert len(chamadas) == 3
+    assert cache.estatisticas()['entradas'] == 2
+
+    # "b" foi usado há mais tempo e saiu do cache; "a" e "c" continuam
+    Func.summarize_text_simple("a")
+    Func.summarize_text_simple("c")
+    assert len(chamadas) == 3
+    Func.summarize_text_simple("b")
+    assert len(chamadas) == 4
+
+
+def test_cache_persiste_entre_conexoes(tmp_path, relogio):
+    caminho = str(tmp_path / 'cache.sqlite')
+    cache = CacheSQLite(caminho, relogio=relogio)
+    cache.set(CacheSQLite.chave('x', 1), {'valor': [1, 2]})
+    cache.close()
+
+    assert CacheSQLite(caminho, relogio=relogio).get(CacheSQLite.chave('x', 1)) == {'valor': [1, 2]}
+
+
+def test_limitador_espera_quando_o_orcamento_acaba(relogio):
+    limitador = LimitadorTokens(60, relogio=relogio, dorme=relogio.dorme)
+
+    async def consome():
+        await limitador.adquire(60)
+        assert relogio.esperas == []
+        # O balde está vazio e é reabastecido a 1 token por segundo
+        await limitador.adquire(30)
+        assert relogio.esperas == [pytest.approx(30)]
+        # Depois de um minuto parado, o balde volta a encher até o limite, e não além dele
+        relogio.agora += 600
+        await limitador.adquire(60)
+        await limitador.adquire(1)
+
+    asyncio.run(consome())
+    assert relogio.esperas == [pytest.approx(30), pytest.approx(1)]
+
+
+def test_limitador_reduz_pedidos_maiores_que_o_limite(relogio):
+    limitador = LimitadorTokens(10, relogio=relogio, dorme=relogio.dorme)
+
+    asyncio.run(limitador.adquire(1_000))
+
+    assert relogio.esperas == []
@@ -0,0 +1,79 @@
+import random
+from collections import Counter
+
+import pytest
+
+from main_pat import CorpusCompacto, Func
+
+
+def calcula_ome_referencia(respostas, por_respondente=False):
+    """
+    Implementação original de Func.calcula_ome, com listas de posições por palavra, usada como referência. Com
+    por_respondente=True, a posição de cada palavra é contada dentro da sua resposta.
+    """
+    if por_respondente:
+        posicoes = [(palavra, i + 1) for resposta in respostas for i, palavra in enumerate(resposta)]
+    else:
+        posicoes = [(palavra, i + 1) for i, palavra in enumerate(p for resposta in respostas for p in resposta)]
+
+    frequencias = Counter(palavra for palavra, _ in posicoes)
+    ordens = {}
+    for palavra, posicao in posicoes:
+        ordens.setdefault(palavra, []).append(posicao)
+
+    ome = {palavra: sum(ordens[palavra]) / frequencias[palavra] for palavra in frequencias}
+    return sorted(ome, key=ome.get, reverse=True), ome
+
+
+def respostas_aleatorias(semente):
+    """Respostas de tamanhos variados, incluindo respostas vazias e respostas mais longas que vários lotes."""
+    gerador = random.Random(semente)
+    vocabulario = [f"p{i}" for i in range(gerador.randint(1, 40))]
+    tamanhos = [gerador.choice([0, 1, 2, 3, 5, 8, 30]) for _ in range(gerador.randint(1, 60))]
+    return [[gerador.choice(vocabulario) for _ in range(tamanho)] for tamanho in tamanhos]
+
+
+@pytest.mark.parametrize("semente", range(8))
+@pytest.mark.parametrize("tamanho_lote", [1, 2, 3, 5, 8, 13, 100, 1000])
+@pytest.mark.parametrize("por_respondente", [False, True])
+def test_lotes_equivalem_a_referencia(semente, tamanho_lote, por_respondente):
+    respostas = respostas_aleatorias(semente)
+    esperado = calcula_ome_referencia(respostas, por_respondente)
+
+    entradas = [respostas, [' '.join(resposta) for resposta in respostas], '\n'.join(map(' '.join, respostas))]
+    for entrada in entradas:
+        assert Func.calcula_ome(entrada, por_respondente, tamanho_lote) == esperado
+
+
+@pytest.mark.parametrize("semente", range(8))
+@pytest.mark.parametrize("por_respondente", [False, True])
+def test_corpus_compacto_equivale_a_referencia(semente, por_respondente):
+    respostas = respostas_aleatorias(semente)
+
+    resultado = Func.calcula_ome(CorpusCompacto.constroi(respostas), por_respondente)
+
+    assert resultado == calcula_ome_referencia(respostas, por_respondente)
+
+
+def test_ordem_de_evocacao_por_respondente():
+    respostas = "casa sol mar\nsol casa\n\nmar"
+
+    palavras_ordenadas, ome = Func.calcula_ome(respostas, por_respondente=True, tamanho_lote=2)
+
+    assert ome == {'casa': 1.5, 'sol': 1.5, 'mar': 2.0}
+    assert palavras_ordenadas == ['mar', 'casa', 'sol']
+
+    # Sem por_respondente, a ordem é a posição no texto inteiro
+    assert Func.calcula_ome(respostas, tamanho_lote=2)[1] == {'casa': 3.0, 'sol': 3.0, 'mar': 4.5}
+
+
+def test_resposta_longa_continua_a_ordem_no_lote_seguinte():
+    lotes = list(Func._lotes_evocacoes([["a", "b", "c", "d", "e"], ["f", "g"]], True, 3))
+
+    assert [(palavras, ordens.tolist()) for palavras, ordens in lotes] == [
+        (["a", "b", "c"], [1, 2, 3]), (["d", "e", "f"], [4, 5, 1]), (["g"], [2])]
+
+
+def test_texto_vazio():
+    assert Func.calcula_ome("") == ([], {})
+    assert Func.calcula_ome([], por_respondente=True) == ([], {})
@@ -0,0 +1,79 @@
+import json
+import types
+
+import pytest
+
+from main_pat import CacheSQLite, Func
+
+
+class IndiceFalso:
+    """Índice com a interface de consulta do Llama, que não pode ser serializado."""
+
+    def __init__(self):
+        self.perguntas = []
+
+    def query(self, pergunta, **kwargs):
+        self.perguntas.append(pergunta)
+        return types.SimpleNamespace(response=f"resposta para {pergunta}", source_nodes=[])
+
+    def save_to_string(self):
+        raise AssertionError("consulta_lote não deve serializar o índice")
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch, tmp_path):
+    cache = CacheSQLite(str(tmp_path / 'consultas.sqlite'))
+    monkeypatch.setattr(Func, '_cache_consultas', cache)
+    return cache
+
+
+def test_versao_obrigatoria_com_cache():
+    with pytest.raises(ValueError):
+        Func.consulta_lote(IndiceFalso(), ["a"], usar_cache=True)
+
+
+def test_sem_versao_o_cache_nao_e_usado():
+    index = IndiceFalso()
+
+    resultados = Func.consulta_lote(index, ["a"])
+    Func.consulta_lote(index, ["a"])
+
+    assert [r.resposta for r in resultados] == ["resposta para a"]
+    assert index.perguntas == ["a", "a"]
+
+
+def test_respostas_repetidas_vem_do_cache():
+    index = IndiceFalso()
+
+    primeira = Func.consulta_lote(index, ["a", "b", "a"], versao_indice="v1")
+    segunda = Func.consulta_lote(index, ["b", "a"], versao_indice="v1")
+
+    assert sorted(index.perguntas) == ["a", "b"]
+    assert [r.resposta for r in primeira] == ["resposta para a", "resposta para b", "resposta para a"]
+    assert [(r.pergunta, r.do_cache) for r in segunda] == [("b", True), ("a", True)]
+
+
+def test_nova_versao_do_indice_consulta_novamente():
+    index = IndiceFalso()
+
+    Func.consulta_lote(index, ["a"], versao_indice="v1")
+    Func.consulta_lote(index, ["a"], versao_indice="v2")
+    Func.consulta_lote(index, ["a"], usar_cache=False)
+
+    assert index.perguntas == ["a", "a", "a"]
+
+
+def test_versao_indice_segue_o_manifesto(tmp_path):
+    with open(tmp_path / 'index.json', 'w', encoding='utf-8') as f:
+        f.write('{}')
+    versao_sem_manifesto = Func.versao_indice(str(tmp_path))
+
+    with open(tmp_path / 'manifesto.json', 'w', encoding='utf-8') as f:
+        json.dump({'a.txt': '1'}, f)
+    versao = Func.versao_indice(str(tmp_path))
+    assert versao != versao_sem_manifesto
+    assert Func.versao_indice(str(tmp_path)) == versao
+
+    with open(tmp_path / 'manifesto.json', 'w', encoding='utf-8') as f:
+        json.dump({'a.txt': '2'}, f)
+    assert Func.versao_indice(str(tmp_path)) != versao
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importar_nao_carrega_dependencias_pesadas():
+    pesadas = ['scipy', 'googletrans', 'summarizer', 'spacy', 'nltk', 'openai', 'llama_index', 'torch']
+    codigo = f"import sys, main_pat; print([m for m in {pesadas!r} if m in sys.modules])"
+
+    saida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+
+    assert saida.stdout.strip() == '[]'
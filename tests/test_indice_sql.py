@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+import sys
+import types
+
+import pytest
+
+from main_pat import Func
+
+
+class Document:
+    def __init__(self, text, doc_id=None):
+        self.text = text
+        self.doc_id = doc_id
+
+
+class IndiceFalso:
+    """GPTSimpleVectorIndex reduzido, que registra os lotes de documentos recebidos."""
+
+    lotes = []
+    falhar_no_lote = None
+    service_context = types.SimpleNamespace(node_parser=types.SimpleNamespace(get_nodes_from_documents=list))
+
+    def __init__(self, documentos=()):
+        self.documentos = {}
+        if documentos:
+            self._adiciona(documentos)
+
+    def _adiciona(self, documentos):
+        if IndiceFalso.falhar_no_lote == len(IndiceFalso.lotes):
+            raise RuntimeError("falha simulada na API de embeddings")
+        IndiceFalso.lotes.append([documento.doc_id for documento in documentos])
+        self.documentos.update((documento.doc_id, documento.text) for documento in documentos)
+
+    @classmethod
+    def from_documents(cls, documentos):
+        return cls(list(documentos))
+
+    def insert_nodes(self, nos):
+        self._adiciona(nos)
+
+    def save_to_disk(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.documentos, f)
+
+    @classmethod
+    def load_from_disk(cls, caminho):
+        indice = cls()
+        with open(caminho, encoding='utf-8') as f:
+            indice.documentos = json.load(f)
+        return indice
+
+
+@pytest.fixture(autouse=True)
+def llama_index(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'llama_index',
+                        types.SimpleNamespace(GPTSimpleVectorIndex=IndiceFalso, Document=Document))
+    monkeypatch.setattr(IndiceFalso, 'lotes', [])
+    monkeypatch.setattr(IndiceFalso, 'falhar_no_lote', None)
+
+
+@pytest.fixture
+def conexao():
+    conexao = sqlite3.connect(':memory:')
+    conexao.execute("CREATE TABLE respostas (id_sql INTEGER PRIMARY KEY, texto TEXT)")
+    insere(conexao, range(1, 8))
+    yield conexao
+    conexao.close()
+
+
+def insere(conexao, ids):
+    conexao.executemany("INSERT INTO respostas VALUES (?, ?)", [(i, f"resposta {i}") for i in ids])
+    conexao.commit()
+
+
+def indexa(conexao, pasta, **kwargs):
+    return Func.criar_indice_sql(None, None, None, None, 'respostas', path_index=str(pasta), conexao=conexao,
+                                 **kwargs)
+
+
+def marca(pasta):
+    with open(os.path.join(pasta, 'marca_sql.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_primeira_execucao_indexa_a_tabela_em_lotes(conexao, tmp_path):
+    indice = indexa(conexao, tmp_path, tamanho_lote=3)
+
+    assert IndiceFalso.lotes == [['1', '2', '3'], ['4', '5', '6'], ['7']]
+    assert indice.documentos == {str(i): f"resposta {i}" for i in range(1, 8)}
+    assert marca(tmp_path) == {'respostas': 7}
+    assert os.path.exists(tmp_path / 'index.json')
+
+
+def test_execucao_seguinte_indexa_apenas_as_linhas_novas(conexao, tmp_path):
+    indexa(conexao, tmp_path, tamanho_lote=3)
+    insere(conexao, [8, 9])
+    IndiceFalso.lotes.clear()
+
+    indice = indexa(conexao, tmp_path, tamanho_lote=3)
+
+    assert IndiceFalso.lotes == [['8', '9']]
+    assert len(indice.documentos) == 9
+    assert marca(tmp_path) == {'respostas': 9}
+
+    # Sem linhas novas, o índice salvo é retornado sem novas chamadas
+    IndiceFalso.lotes.clear()
+    assert len(indexa(conexao, tmp_path, tamanho_lote=3).documentos) == 9
+    assert IndiceFalso.lotes == []
+
+
+def test_execucao_interrompida_continua_do_ultimo_salvamento(conexao, tmp_path):
+    IndiceFalso.falhar_no_lote = 3
+    with pytest.raises(RuntimeError):
+        indexa(conexao, tmp_path, tamanho_lote=2, lotes_por_salvamento=2)
+    assert marca(tmp_path) == {'respostas': 4}
+
+    IndiceFalso.falhar_no_lote = None
+    IndiceFalso.lotes.clear()
+    indice = indexa(conexao, tmp_path, tamanho_lote=2, lotes_por_salvamento=2)
+
+    assert IndiceFalso.lotes == [['5', '6'], ['7']]
+    assert sorted(indice.documentos, key=int) == [str(i) for i in range(1, 8)]
+    assert marca(tmp_path) == {'respostas': 7}
+
+
+@pytest.mark.parametrize("tabela", ["respostas; DROP TABLE respostas", "1respostas", "respostas r", ""])
+def test_nome_de_tabela_invalido_e_recusado(conexao, tmp_path, tabela):
+    with pytest.raises(ValueError):
+        Func.criar_indice_sql(None, None, None, None, tabela, path_index=str(tmp_path), conexao=conexao)
+
+    assert conexao.execute("SELECT COUNT(*) FROM respostas").fetchone() == (7,)
+    assert IndiceFalso.lotes == []
@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+
+from main_pat import Perfilador, PipelineAnalise
+
+
+def test_etapas_aninhadas_sao_prefixadas_pela_externa():
+    perfilador = Perfilador()
+
+    with perfilador.etapa('externa'):
+        with perfilador.etapa('interna'):
+            vetor = np.ones(1_000_000)
+        del vetor
+        with perfilador.etapa('outra'):
+            pass
+
+    assert [medicao.nome for medicao in perfilador.etapas] == ['externa/interna', 'externa/outra', 'externa']
+    interna, outra, externa = perfilador.etapas
+    assert interna.pico_memoria >= 8_000_000
+    assert externa.pico_memoria >= interna.pico_memoria
+    assert outra.pico_memoria < interna.pico_memoria
+    assert externa.inicio <= interna.inicio <= outra.inicio
+    assert externa.segundos >= interna.segundos + outra.segundos
+
+    linhas = perfilador.relatorio(imprimir=False)
+    assert [linha['nome'] for linha in linhas] == ['externa/interna', 'externa/outra', 'externa']
+
+
+def test_sem_memoria_mede_apenas_os_tempos():
+    perfilador = Perfilador(memoria=False)
+
+    with perfilador.etapa('etapa'):
+        pass
+
+    assert perfilador.etapas[0].pico_memoria is None
+    assert perfilador.etapas[0].segundos >= 0
+
+
+def test_trace_no_formato_do_chrome(tmp_path):
+    perfilador = Perfilador()
+    with perfilador.etapa('a'):
+        with perfilador.etapa('b'):
+            pass
+
+    caminho = tmp_path / 'trace.json'
+    perfilador.salva_trace(str(caminho))
+    trace = json.loads(caminho.read_text(encoding='utf-8'))
+
+    assert trace['displayTimeUnit'] == 'ms'
+    eventos = {evento['name']: evento for evento in trace['traceEvents']}
+    assert set(eventos) == {'a', 'a/b'}
+    for evento in eventos.values():
+        assert evento['ph'] == 'X'
+        assert {'ts', 'dur', 'pid', 'tid'} <= set(evento)
+        assert {'segundos_cpu', 'pico_memoria', 'memoria_processo'} <= set(evento['args'])
+    assert eventos['a']['ts'] <= eventos['a/b']['ts']
+    assert eventos['a/b']['ts'] + eventos['a/b']['dur'] <= eventos['a']['ts'] + eventos['a']['dur']
+
+
+def test_pipeline_mede_limpeza_e_entidades_a_parte(recursos_falsos, tmp_path):
+    pasta = tmp_path / 'corpus'
+    pasta.mkdir()
+    (pasta / 'a.txt').write_text("Maria mora em Recife e gosta de praia.", encoding='utf-8')
+    (pasta / 'b.txt').write_text("The beach in London is cold and the sun is rare.", encoding='utf-8')
+
+    perfilador = Perfilador(memoria=False)
+    PipelineAnalise(str(tmp_path / 'artefatos'), perfilador=perfilador).executa(str(pasta), 'hap')
+
+    assert [medicao.nome for medicao in perfilador.etapas] == [
+        'corpus', 'idiomas/deteccao', 'idiomas/modelo_spacy', 'idiomas/limpeza', 'idiomas/entidades', 'idiomas',
+        'ome', 'zonas']
@@ -0,0 +1,234 @@
+import pickle
+
+import pytest
+
+from main_pat import Func, ResultadoAnalise
+
+DOCUMENTOS = {
+    'a.txt': "Maria mora em Recife e gosta de praia, sol e praia.\nPraia é lazer, sol é calor.",
+    'b.txt': "Recife tem praia, calor e sol.\nO Brasil tem muito sol.",
+    'c.txt': "Trabalho, família e saúde.\nSaúde é tudo; família unida.",
+}
+
+
+@pytest.fixture
+def pasta_corpus(tmp_path):
+    pasta = tmp_path / 'corpus'
+    pasta.mkdir()
+    for nome, texto in DOCUMENTOS.items():
+        (pasta / nome).write_text(texto, encoding='utf-8')
+    return str(pasta)
+
+
+def test_resultado_equivale_a_limpeza_em_listas(recursos_falsos, pasta_corpus, tmp_path):
+    resultado = Func.teste(pasta_corpus, 'hap', pasta_artefatos=str(tmp_path / 'artefatos'))
+
+    texto = Func.import_text_from_folder(pasta_corpus)
+    output_tri, output_bi, filtered_word, hapaxes, filtered_word_no_hap = Func.cleaner(texto, 'portuguese',
+                                                                                      ngramas=True)
+    assert resultado.texto == texto
+    assert resultado.filtered_word == filtered_word
+    assert resultado.hapaxes == hapaxes
+    assert resultado.filtered_word_no_hap == filtered_word_no_hap
+    assert resultado.output_tri == output_tri
+    assert resultado.output_bi == output_bi
+    assert (resultado.nucleo_central, resultado.zona_periferica_1, resultado.zona_periferica_2,
+            resultado.zona_periferica_3) == Func.analise_prototipica(*Func.calcula_ome(filtered_word))
+
+
+def test_listas_so_sao_criadas_quando_acessadas(recursos_falsos, pasta_corpus, tmp_path):
+    resultado = Func.teste(pasta_corpus, 'no_hap', pasta_artefatos=str(tmp_path / 'artefatos'))
+
+    materializadas = {'filtered_word', 'hapaxes', 'filtered_word_no_hap', 'output_tri', 'output_bi'}
+    assert not materializadas & set(vars(resultado))
+
+    assert resultado.data[0][1] == len(resultado.nucleo_central)
+    assert not materializadas & set(vars(resultado))
+
+    assert resultado.output_bi is resultado.output_bi
+    assert {'filtered_word', 'output_bi'} <= set(vars(resultado))
+
+
+def test_resultado_desempacota_como_a_tupla_anterior(recursos_falsos, pasta_corpus, tmp_path):
+    resultado = Func.teste(pasta_corpus, 'hap', pasta_artefatos=str(tmp_path / 'artefatos'))
+
+    (texto, ent_list, lang_code, lang_code_short, lang_code_full, output_tri, data, output_bi, filtered_word,
+     hapaxes, filtered_word_no_hap, palavras_ordenadas, omes, nucleo_central, zona_periferica_1,
+     zona_periferica_2, zona_periferica_3) = resultado
+
+    assert len(resultado) == len(ResultadoAnalise._fields) == 17
+    assert resultado[6] == data == resultado.data
+    assert resultado[-4:] == (nucleo_central, zona_periferica_1, zona_periferica_2, zona_periferica_3)
+    assert resultado._asdict()['omes'] == omes
+    assert (lang_code, lang_code_short) == ('pt', 'portuguese')
+    assert pickle.loads(pickle.dumps(resultado)) == resultado
+
+
+def test_execucao_repetida_le_todas_as_etapas_do_disco(recursos_falsos, pasta_corpus, tmp_path):
+    from main_pat import PipelineAnalise
+
+    pipeline = PipelineAnalise(str(tmp_path / 'artefatos'))
+    primeira = pipeline.executa(pasta_corpus, 'hap')
+    assert all(pipeline.executadas[etapa] for etapa in PipelineAnalise.ETAPAS)
+
+    segunda = pipeline.executa(pasta_corpus, 'hap')
+    assert not any(pipeline.executadas[etapa] for etapa in PipelineAnalise.ETAPAS if etapa != 'corpus')
+    assert segunda == primeira
+
+
+
+def test_artefatos_sao_lidos_por_outra_copia_do_modulo(recursos_falsos, pasta_corpus, tmp_path):
+    import importlib.util
+
+    import numpy as np
+
+    import main_pat
+    from main_pat import PipelineAnalise
+
+    pasta = tmp_path / 'artefatos'
+    primeira = PipelineAnalise(str(pasta)).executa(pasta_corpus, 'hap')
+
+    # Os artefatos são dados simples, sem objetos gravados com pickle
+    for caminho in pasta.rglob('*.npz'):
+        with np.load(caminho, allow_pickle=False) as dados:
+            assert 'estrutura' in dados
+
+    # Como quando o script é executado diretamente, as classes da outra cópia são diferentes das de main_pat
+    spec = importlib.util.spec_from_file_location('main_pat_script', main_pat.__file__)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    assert script.CorpusCompacto is not main_pat.CorpusCompacto
+
+    pipeline = script.PipelineAnalise(str(pasta))
+    segunda = pipeline.executa(pasta_corpus, 'hap')
+    assert not any(pipeline.executadas[etapa] for etapa in PipelineAnalise.ETAPAS if etapa != 'corpus')
+    assert isinstance(segunda.corpus, script.CorpusCompacto)
+    assert tuple(segunda) == tuple(primeira)
+
+    # Sem a OME em cache, a outra cópia calcula 'no_hap' a partir do corpus lido do disco
+    sem_hapaxes = pipeline.executa(pasta_corpus, 'no_hap')
+    assert pipeline.executadas['ome'] and not pipeline.executadas['idiomas']
+    assert sem_hapaxes.palavras_ordenadas == PipelineAnalise(str(pasta)).executa(
+        pasta_corpus, 'no_hap').palavras_ordenadas
+
+
+def test_artefato_corrompido_e_recalculado(recursos_falsos, pasta_corpus, tmp_path):
+    from main_pat import PipelineAnalise
+
+    pasta = tmp_path / 'artefatos'
+    pipeline = PipelineAnalise(str(pasta))
+    primeira = pipeline.executa(pasta_corpus, 'hap')
+
+    for caminho in (pasta / 'idiomas').glob('*.npz'):
+        caminho.write_bytes(b'nao e um artefato')
+    for caminho in (pasta / 'zonas').glob('*.npz'):
+        caminho.write_bytes(caminho.read_bytes()[:100])
+
+    segunda = pipeline.executa(pasta_corpus, 'hap')
+    assert pipeline.executadas['idiomas'] and pipeline.executadas['zonas'] and not pipeline.executadas['ome']
+    assert segunda == primeira
+
+def test_ngramas_sao_contados_sob_demanda(recursos_falsos, pasta_corpus, tmp_path):
+    resultado = Func.teste(pasta_corpus, 'hap', pasta_artefatos=str(tmp_path / 'artefatos'))
+
+    contagem = resultado.conta_ngramas(2, top_k=3)
+
+    assert not {'output_tri', 'output_bi', 'filtered_word'} & set(vars(resultado))
+    assert contagem == Func.conta_ngramas(resultado.filtered_word, 2, top_k=3)
+    assert len(contagem) == 3
+
+
+def test_cleaner_so_cria_ngramas_se_pedido(recursos_falsos):
+    texto = DOCUMENTOS['a.txt']
+
+    # Por padrão, os n-gramas são iteradores que só são percorridos quando usados
+    output_tri, output_bi, filtered_word, _, _ = Func.cleaner(texto, 'portuguese')
+    assert not isinstance(output_tri, list) and not isinstance(output_bi, list)
+    assert list(output_bi) == list(zip(filtered_word, filtered_word[1:]))
+    assert list(output_tri) == list(zip(filtered_word, filtered_word[1:], filtered_word[2:]))
+
+    output_tri, output_bi, _, _, _ = Func.cleaner(texto, 'portuguese', ngramas=True)
+    assert output_bi == list(zip(filtered_word, filtered_word[1:]))
+    assert output_tri == list(zip(filtered_word, filtered_word[1:], filtered_word[2:]))
+
+
+DOCUMENTOS_MISTOS = {
+    'a_referencia.txt': "The beach in London is cold and the sun is rare.\nThe city is large.",
+    'b.txt': DOCUMENTOS['a.txt'],
+    'c.txt': DOCUMENTOS['b.txt'],
+}
+
+
+@pytest.fixture
+def pasta_mista(tmp_path):
+    pasta = tmp_path / 'misto'
+    pasta.mkdir()
+    for nome, texto in DOCUMENTOS_MISTOS.items():
+        (pasta / nome).write_text(texto, encoding='utf-8')
+    return str(pasta)
+
+
+def test_corpus_misto_usa_os_recursos_do_idioma_de_cada_documento(recursos_falsos, pasta_mista, tmp_path):
+    resultado = Func.teste(pasta_mista, 'hap', pasta_artefatos=str(tmp_path / 'artefatos'))
+
+    # O primeiro arquivo, em inglês, não determina o idioma do corpus inteiro
+    assert resultado.idiomas == {'en': [0], 'pt': [1, 2]}
+    assert (resultado.lang_code, resultado.lang_code_short) == ('pt', 'portuguese')
+    assert sorted(recursos_falsos['spacy']) == ['en', 'pt']
+    assert max(len(texto) for texto in recursos_falsos['deteccoes']) < len(resultado.texto)
+
+    # Cada documento é limpo com as stopwords do seu idioma
+    esperado = []
+    for nome, texto in DOCUMENTOS_MISTOS.items():
+        esperado += Func.cleaner(texto, 'english' if nome.startswith('a_') else 'portuguese')[2]
+    assert resultado.filtered_word == esperado
+    assert 'is' not in resultado.filtered_word and 'de' not in resultado.filtered_word
+
+    assert resultado.ent_list == [['London', 'GPE'], ['Maria', 'PER'], ['Recife', 'LOC'], ['Brasil', 'LOC']]
+    assert (resultado.nucleo_central, resultado.zona_periferica_1, resultado.zona_periferica_2,
+            resultado.zona_periferica_3) == Func.analise_prototipica(*Func.calcula_ome(esperado))
+
+
+def test_entities_detecta_o_idioma_de_cada_trecho(recursos_falsos):
+    # Com blocos de 30 caracteres, cada linha (de 30 a 60 caracteres) é um bloco
+    texto = "\n".join(["The beach in London is cold and the sun is rare.",
+                       "The city is large and the rain is constant.",
+                       "Maria mora em Recife e gosta de praia, sol e praia.",
+                       "Praia é lazer, sol é calor, o Brasil tem muito sol.",
+                       "Recife tem praia, calor e sol durante o ano inteiro."])
+
+    ent_list, lang_code, lang_code_short, lang_code_full = Func.entities(texto, tamanho_bloco=30)
+
+    assert sorted(recursos_falsos['spacy']) == ['en', 'pt']
+    assert max(len(trecho) for trecho in recursos_falsos['deteccoes']) < 60
+    assert ent_list == [['London', 'GPE'], ['Maria', 'PER'], ['Recife', 'LOC'], ['Brasil', 'LOC']]
+    assert (lang_code, lang_code_short, lang_code_full) == ('pt', 'portuguese', 'pt_core_news_sm')
+
+    assert Func.entities("Maria mora no Brasil.", lang_code='pt')[0] == [['Maria', 'PER'], ['Brasil', 'LOC']]
+
+
+def test_junta_reproduz_o_corpus_na_ordem_original():
+    from main_pat import CorpusCompacto
+
+    documentos = [['sol', 'praia'], ['sun', 'beach', 'sol'], ['praia', 'calor'], ['beach'], []]
+    grupos = {'pt': [0, 2, 4], 'en': [1, 3]}
+    partes = [(CorpusCompacto.constroi([documentos[i] for i in indices]), indices) for indices in grupos.values()]
+
+    junto = CorpusCompacto.junta(partes)
+    esperado = CorpusCompacto.constroi(documentos)
+
+    assert junto.palavras == esperado.palavras
+    assert junto.tokens.tolist() == esperado.tokens.tolist()
+    assert junto.inicios.tolist() == esperado.inicios.tolist()
+    with pytest.raises(ValueError):
+        CorpusCompacto.junta([(partes[0][0], [0, 2, 5])])
+
+
+def test_compara_grupos_de_idiomas_diferentes(recursos_falsos, pasta_corpus, pasta_mista, tmp_path):
+    comparacao = Func.compara_grupos([pasta_corpus, pasta_mista], n_processos=1,
+                                     pasta_artefatos=str(tmp_path / 'artefatos'))
+
+    assert comparacao.grupos == ['corpus', 'misto']
+    assert [resultado.idiomas for resultado in comparacao.resultados] == [{'pt': [0, 1, 2]},
+                                                                          {'en': [0], 'pt': [1, 2]}]
+    assert comparacao.jaccard['nucleo_central'].shape == (2, 2)
@@ -0,0 +1,132 @@
+import asyncio
+
+import openai
+import pytest
+
+from main_pat import Func
+
+dorme = asyncio.sleep
+
+
+def resposta(texto):
+    return openai.util.convert_to_openai_object({'choices': [{'text': f" {texto} "}]})
+
+
+@pytest.fixture
+def esperas(monkeypatch):
+    """Registra as esperas entre as tentativas sem esperar de fato."""
+    registradas = []
+
+    async def espera(segundos):
+        registradas.append(segundos)
+
+    monkeypatch.setattr(asyncio, 'sleep', espera)
+    return registradas
+
+
+def resume(textos, **kwargs):
+    return Func.summarize_texts(textos, prompt_prefix="", prompt_suffix="", tokens_por_minuto=None,
+                                usar_cache=False, **kwargs)
+
+
+def test_repete_depois_de_erro_429(monkeypatch, esperas):
+    chamadas = []
+
+    async def acreate(**parametros):
+        chamadas.append(parametros['prompt'])
+        if len(chamadas) <= 2:
+            raise openai.error.RateLimitError("limite excedido", http_status=429)
+        return resposta("ok")
+
+    monkeypatch.setattr(openai.Completion, 'acreate', acreate)
+
+    assert resume(["texto"], espera_inicial=1.0)[0][0] == "ok"
+    assert chamadas == ["texto"] * 3
+    # Espera exponencial com variação aleatória: [1, 2) e depois [2, 4)
+    assert len(esperas) == 2
+    assert 1.0 <= esperas[0] < 2.0 and 2.0 <= esperas[1] < 4.0
+
+
+def test_respeita_retry_after(monkeypatch, esperas):
+    tentativas = iter([openai.error.RateLimitError("limite", http_status=429, headers={'retry-after': '7'})])
+
+    async def acreate(**parametros):
+        erro = next(tentativas, None)
+        if erro is not None:
+            raise erro
+        return resposta("ok")
+
+    monkeypatch.setattr(openai.Completion, 'acreate', acreate)
+
+    assert resume(["texto"])[0][0] == "ok"
+    assert esperas == [7.0]
+
+
+def test_desiste_depois_da_ultima_tentativa(monkeypatch, esperas):
+    chamadas = []
+
+    async def acreate(**parametros):
+        chamadas.append(parametros['prompt'])
+        raise openai.error.ServiceUnavailableError("indisponível", http_status=503)
+
+    monkeypatch.setattr(openai.Completion, 'acreate', acreate)
+
+    with pytest.raises(openai.error.ServiceUnavailableError):
+        resume(["texto"], tentativas=4)
+    assert len(chamadas) == 4
+    assert len(esperas) == 3
+
+
+@pytest.mark.parametrize("erro", [
+    openai.error.InvalidRequestError("prompt inválido", param="prompt", http_status=400),
+    openai.error.APIError("requisição inválida", http_status=400),
+    openai.error.AuthenticationError("chave inválida", http_status=401),
+])
+def test_erro_nao_transitorio_e_propagado_imediatamente(monkeypatch, esperas, erro):
+    chamadas = []
+
+    async def acreate(**parametros):
+        chamadas.append(parametros['prompt'])
+        raise erro
+
+    monkeypatch.setattr(openai.Completion, 'acreate', acreate)
+
+    with pytest.raises(type(erro)):
+        resume(["texto"])
+    assert len(chamadas) == 1
+    assert esperas == []
+
+
+def test_resultados_na_ordem_dos_textos(monkeypatch, esperas):
+    textos = [f"texto {i}" for i in range(8)]
+    falhou = set()
+
+    async def acreate(**parametros):
+        prompt = parametros['prompt']
+        # Os primeiros textos terminam por último, e os pares falham uma vez antes de responder
+        await dorme(0.005 * (len(textos) - textos.index(prompt)))
+        if textos.index(prompt) % 2 == 0 and prompt not in falhou:
+            falhou.add(prompt)
+            raise openai.error.RateLimitError("limite", http_status=429)
+        return resposta(prompt.upper())
+
+    monkeypatch.setattr(openai.Completion, 'acreate', acreate)
+
+    resultados = resume(textos, concorrencia=3)
+
+    assert [resumo for resumo, _ in resultados] == [texto.upper() for texto in textos]
+    assert len(esperas) == 4
+
+
+def test_retorna_excecoes_na_posicao_do_texto(monkeypatch, esperas):
+    async def acreate(**parametros):
+        if parametros['prompt'] == "ruim":
+            raise openai.error.InvalidRequestError("prompt inválido", param="prompt", http_status=400)
+        return resposta(parametros['prompt'])
+
+    monkeypatch.setattr(openai.Completion, 'acreate', acreate)
+
+    resultados = resume(["bom", "ruim", "ótimo"], retorna_excecoes=True)
+
+    assert resultados[0][0] == "bom" and resultados[2][0] == "ótimo"
+    assert isinstance(resultados[1], openai.error.InvalidRequestError)
@@ -0,0 +1,56 @@
+import functools
+
+import pytest
+
+from main_pat import CacheSQLite, Func
+
+
+def maiusculas(sentencas, source_language, target_language):
+    return [sentenca.upper() for sentenca in sentencas]
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch, tmp_path):
+    cache = CacheSQLite(str(tmp_path / 'traducoes.sqlite'))
+    monkeypatch.setattr(Func, '_cache_traducoes', cache)
+    return cache
+
+
+def test_backends_anonimos_exigem_nome():
+    for backend in (lambda sentencas, origem, destino: sentencas, functools.partial(maiusculas)):
+        with pytest.raises(ValueError):
+            Func.traduz_lote(["Olá."], 'en', backend=backend)
+        assert Func.traduz_lote(["Olá."], 'en', backend=backend, usar_cache=False) == \
+            ["OLÁ." if isinstance(backend, functools.partial) else "Olá."]
+
+
+def test_backends_com_nomes_diferentes_nao_compartilham_o_cache():
+    invertido = lambda sentencas, origem, destino: [sentenca[::-1] for sentenca in sentencas]  # noqa: E731
+    identidade = lambda sentencas, origem, destino: list(sentencas)  # noqa: E731
+
+    assert Func.traduz_lote(["Bom dia."], 'en', backend=invertido, nome_backend='invertido') == [".aid moB"]
+    assert Func.traduz_lote(["Bom dia."], 'en', backend=identidade, nome_backend='identidade') == ["Bom dia."]
+    assert Func.traduz_lote(["Bom dia."], 'en', backend=identidade, nome_backend='invertido') == [".aid moB"]
+
+
+def test_funcao_com_nome_qualificado_dispensa_o_nome(cache):
+    assert Func.traduz_lote(["Bom dia. Boa noite."], 'en', backend=maiusculas) == ["BOM DIA. BOA NOITE."]
+    assert Func.traduz_lote(["Boa noite."], 'en', backend=maiusculas) == ["BOA NOITE."]
+    assert cache.estatisticas()['acertos'] == 1
+
+
+def test_nome_funcao():
+    class Tradutor:
+        def traduz(self, sentencas, origem, destino):
+            return sentencas
+
+        def __call__(self, sentencas, origem, destino):
+            return sentencas
+
+    def local(sentencas, origem, destino):
+        return sentencas
+
+    assert Func._nome_funcao(maiusculas) == f'{__name__}.maiusculas'
+    assert Func._nome_funcao(Func._traduz_google) == 'main_pat.Func._traduz_google'
+    for funcao in (local, lambda: None, functools.partial(maiusculas), Tradutor(), Tradutor().traduz):
+        assert Func._nome_funcao(funcao) is None
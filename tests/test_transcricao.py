@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from main_pat import CacheSQLite, Func
+
+pytest.importorskip("pydub")
+pytestmark = pytest.mark.filterwarnings("ignore::RuntimeWarning")
+
+
+def grava_tom(caminho, milissegundos, frequencia):
+    from pydub.generators import Sine
+
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    Sine(frequencia).to_audio_segment(duration=milissegundos).export(caminho, format='wav')
+
+
+def reconhecedor(audio, language):
+    return f"{language}:{len(audio)}"
+
+
+def test_gravacoes_com_o_mesmo_nome_nao_se_sobrescrevem(tmp_path, monkeypatch):
+    monkeypatch.setattr(Func, '_cache_transcricoes', CacheSQLite(str(tmp_path / 'transcricoes.sqlite')))
+    arquivos = [str(tmp_path / 'a' / 'x.wav'), str(tmp_path / 'b' / 'x.wav'), str(tmp_path / 'b' / 'y.wav')]
+    for arquivo, milissegundos in zip(arquivos, (300, 600, 900)):
+        grava_tom(arquivo, milissegundos, 440)
+    pasta_corpus = tmp_path / 'corpus'
+
+    transcricoes = Func.transcreve_lote(arquivos, str(pasta_corpus), reconhecedor=reconhecedor)
+
+    nomes = Func._nomes_transcricoes(arquivos)
+    assert len(set(nomes.values())) == 3
+    assert nomes[arquivos[2]] == 'y.txt'
+    assert nomes[arquivos[0]].startswith('x-') and nomes[arquivos[1]].startswith('x-')
+    assert sorted(os.listdir(pasta_corpus)) == sorted(nomes.values())
+    for arquivo in arquivos:
+        assert (pasta_corpus / nomes[arquivo]).read_text(encoding='utf-8') == transcricoes[arquivo]
+    assert len(set(transcricoes.values())) == 3
+
+
+def test_nomes_sao_estaveis_e_ignoram_caminhos_repetidos(tmp_path):
+    arquivos = [str(tmp_path / 'a' / 'X.mp3'), str(tmp_path / 'b' / 'x.wav'), str(tmp_path / 'a' / 'X.mp3')]
+
+    nomes = Func._nomes_transcricoes(arquivos)
+
+    assert nomes == Func._nomes_transcricoes(list(reversed(arquivos)))
+    assert nomes[arquivos[0]] != nomes[arquivos[1]]
+    assert Func._nomes_transcricoes(arquivos[:1]) == {arquivos[0]: 'X.txt'}
+
+
+def test_gravacao_repetida_e_transcrita_uma_vez(tmp_path):
+    arquivo = str(tmp_path / 'x.wav')
+    grava_tom(arquivo, 2500, 440)
+    chamadas = []
+
+    def conta(audio, language):
+        chamadas.append(len(audio))
+        return reconhecedor(audio, language)
+
+    transcricoes = Func.transcreve_lote([arquivo, arquivo], str(tmp_path / 'corpus'), reconhecedor=conta,
+                                        max_workers=2, duracao_maxima=1.0, usar_cache=False)
+
+    assert list(transcricoes) == [arquivo]
+    assert len(chamadas) == len(Func.divide_audio(arquivo, 1.0, 500, -16.0)) > 1
+    assert os.listdir(tmp_path / 'corpus') == ['x.txt']